@@ -0,0 +1,79 @@
+"""Seeded synthetic dataset in the NDJSON import format."""
+import random
+from datetime import date, datetime, timedelta
+from typing import Any, Iterator
+
+from .fake_bedrock import CATEGORIES
+
+GOALS = (
+    ("Run a half marathon", "Train four times a week and finish a 21.1 km race."),
+    ("Read 24 books", "Two books a month, alternating fiction and non-fiction."),
+    ("Save an emergency fund", "Put aside a fixed amount every payday."),
+    ("Learn conversational Korean", "Daily vocabulary and a weekly tutor session."),
+    ("Meditate every morning", "Fifteen minutes before checking the phone."),
+    ("Ship a side project", "Build and launch a small web app."),
+    ("Cook at home more", "Five home-cooked dinners a week."),
+    ("Get promoted", "Lead a cross-team project and grow mentoring skills."),
+)
+ACTIVITIES = (
+    "ran", "read", "saved", "studied", "meditated", "cooked", "practised", "planned",
+    "reviewed", "wrote", "stretched", "journaled", "budgeted", "swam", "cycled", "coded",
+)
+OBJECTS = (
+    "chapters", "kilometres", "flashcards", "recipes", "minutes", "pages", "lessons",
+    "intervals", "receipts", "drafts", "tempo runs", "grammar drills", "pull requests",
+)
+MOODS = (
+    "felt great", "new best", "finished early", "was tired", "missed a day", "struggled a bit",
+    "easy session", "knee pain again", "proud of the streak", "fell behind", "on track",
+)
+SEARCH_TERMS = ACTIVITIES + ("knee", "streak", "tired", "recipes", "flashcards", "pages")
+SENTIMENTS = ("positive", "neutral", "negative")
+
+
+def note(rng: random.Random) -> str:
+    return (
+        f"{rng.choice(ACTIVITIES).capitalize()} {rng.randint(1, 40)} {rng.choice(OBJECTS)}, "
+        f"{rng.choice(MOODS)}."
+    )
+
+
+def records(resolutions: int, check_ins_per_resolution: int, seed: int = 0) -> Iterator[dict[str, Any]]:
+    """Yield resolutions, reminders and check-ins spread over the past year.
+
+    The same arguments always produce the same records; source ids run from 1,
+    which is also what a fresh database assigns on import.
+    """
+    rng = random.Random(seed)
+    today = date.today()
+    for source_id in range(1, resolutions + 1):
+        title, description = GOALS[(source_id - 1) % len(GOALS)]
+        created = datetime.combine(today - timedelta(days=365), datetime.min.time())
+        yield {
+            "type": "resolution",
+            "id": source_id,
+            "title": f"{title} #{source_id}",
+            "description": description,
+            "category": rng.choice(CATEGORIES),
+            "priority": rng.randint(1, 5),
+            "target_date": (today + timedelta(days=rng.randint(30, 365))).isoformat(),
+            "status": "active" if rng.random() < 0.85 else "completed",
+            "created_at": created.isoformat(),
+        }
+        yield {
+            "type": "reminder",
+            "resolution_id": source_id,
+            "frequency": rng.choice(("daily", "weekly", "monthly")),
+            "next_due": (today + timedelta(days=rng.randint(-3, 14))).isoformat(),
+        }
+        for day in sorted(rng.sample(range(365), min(check_ins_per_resolution, 365))):
+            at = created + timedelta(days=day, seconds=rng.randint(6 * 3600, 22 * 3600))
+            yield {
+                "type": "check_in",
+                "resolution_id": source_id,
+                "note": note(rng),
+                "sentiment": rng.choice(SENTIMENTS),
+                "sentiment_score": round(rng.uniform(0.5, 1.0), 2),
+                "ai_feedback": "Keep going! Every step counts.",
+                "created_at": at.isoformat(),
+            }
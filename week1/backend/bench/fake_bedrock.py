@@ -0,0 +1,104 @@
+"""Deterministic local stand-in for the Bedrock Runtime client.
+
+Replies are derived from a hash of the request, so the same prompt always gets
+the same latency, outcome and text no matter which thread serves it or in
+what order requests arrive.
+"""
+import hashlib
+import io
+import json
+import random
+import time
+from typing import Any, Iterator
+
+CATEGORIES = ("Health", "Finance", "Learning", "Career", "Personal")
+NEGATIVE_WORDS = ("missed", "skipped", "tired", "pain", "behind", "struggled")
+POSITIVE_WORDS = ("finished", "great", "new best", "easy", "proud", "streak")
+STREAM_CHUNKS = 8
+
+
+class FakeBedrockClient:
+    """Answers ``invoke_model`` and ``invoke_model_with_response_stream``.
+
+    Each call sleeps for ``latency_ms`` scaled by a jitter factor in
+    [0.5, 1.5], then fails with a ``ThrottlingException`` with probability
+    ``failure_rate``.
+    """
+
+    def __init__(self, latency_ms: float = 300.0, failure_rate: float = 0.0, seed: int = 0) -> None:
+        self.latency_ms = latency_ms
+        self.failure_rate = failure_rate
+        self.seed = seed
+
+    def _rng(self, body: str) -> random.Random:
+        digest = hashlib.sha256(f"{self.seed}:{body}".encode("utf-8")).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    def _plan(self, body: str) -> tuple[random.Random, float, bool]:
+        rng = self._rng(body)
+        latency = self.latency_ms * rng.uniform(0.5, 1.5) / 1000
+        return rng, latency, rng.random() < self.failure_rate
+
+    @staticmethod
+    def _throttled(operation: str) -> Exception:
+        # Imported on use so the stand-in does not pull botocore into startup timings.
+        from botocore.exceptions import ClientError
+
+        return ClientError(
+            {"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded (stand-in)"}},
+            operation,
+        )
+
+    @staticmethod
+    def _reply(request: dict[str, Any], rng: random.Random) -> str:
+        if "categorizes" in request["system"]:
+            return json.dumps({"category": rng.choice(CATEGORIES), "priority": rng.randint(1, 5)})
+
+        note = request["messages"][0]["content"].rsplit("New check-in note:", 1)[-1].lower()
+        if any(word in note for word in NEGATIVE_WORDS):
+            sentiment, feedback = "negative", "Setbacks happen. Pick one small step for tomorrow."
+        elif any(word in note for word in POSITIVE_WORDS):
+            sentiment, feedback = "positive", "Great work! Keep that momentum going."
+        else:
+            sentiment, feedback = "neutral", "Steady progress. Consistency is what counts."
+        return json.dumps({
+            "sentiment": sentiment,
+            "sentiment_score": round(rng.uniform(0.6, 0.99), 2),
+            "ai_feedback": feedback,
+        })
+
+    def invoke_model(self, modelId: str, body: str, **kwargs: Any) -> dict[str, Any]:
+        rng, latency, fail = self._plan(body)
+        time.sleep(latency)
+        if fail:
+            raise self._throttled("InvokeModel")
+        text = self._reply(json.loads(body), rng)
+        payload = {"content": [{"type": "text", "text": text}], "usage": _usage(body, text)}
+        return {"body": io.BytesIO(json.dumps(payload).encode("utf-8"))}
+
+    def invoke_model_with_response_stream(self, modelId: str, body: str, **kwargs: Any) -> dict[str, Any]:
+        rng, latency, fail = self._plan(body)
+        # Time to first token; the remaining half is spread over the chunks.
+        time.sleep(latency / 2)
+        if fail:
+            raise self._throttled("InvokeModelWithResponseStream")
+        text = self._reply(json.loads(body), rng)
+        return {"body": self._events(text, _usage(body, text), latency / 2)}
+
+    @staticmethod
+    def _events(text: str, usage: dict[str, int], duration: float) -> Iterator[dict[str, Any]]:
+        yield _event({"type": "message_start", "message": {"usage": {"input_tokens": usage["input_tokens"]}}})
+        size = max(1, -(-len(text) // STREAM_CHUNKS))
+        for start in range(0, len(text), size):
+            time.sleep(duration / STREAM_CHUNKS)
+            yield _event({"type": "content_block_delta", "delta": {"type": "text_delta", "text": text[start:start + size]}})
+        yield _event({"type": "message_delta", "usage": {"output_tokens": usage["output_tokens"]}})
+
+
+def _usage(body: str, text: str) -> dict[str, int]:
+    # Roughly four characters per token.
+    return {"input_tokens": len(body) // 4, "output_tokens": max(1, len(text) // 4)}
+
+
+def _event(payload: dict[str, Any]) -> dict[str, Any]:
+    return {"chunk": {"bytes": json.dumps(payload).encode("utf-8")}}
@@ -0,0 +1,417 @@
+"""Load and latency benchmark for the API.
+
+``run`` loads a seeded synthetic dataset into a fresh database, starts
+``backend.main:app`` in a subprocess with the Bedrock stand-in, and drives
+each workload mix at each concurrency level. Every (mix, concurrency) pair
+gets its own request sequence derived from the seed, so two runs issue the
+same requests. Results are written as a JSON baseline that ``compare`` diffs
+against a later run.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, Optional
+
+import httpx
+
+from . import datagen
+
+BASELINE_VERSION = 1
+PERCENTILES = (50, 95, 99)
+STARTUP_TIMEOUT_SECONDS = 60.0
+REQUEST_TIMEOUT_SECONDS = 120.0
+PACKAGE_ROOT = Path(__file__).resolve().parents[2]
+
+
+class Request(NamedTuple):
+    endpoint: str
+    method: str
+    path: str
+    params: Optional[dict[str, Any]] = None
+    json: Optional[dict[str, Any]] = None
+
+
+Operation = Callable[[random.Random, int], Request]
+
+
+def _rid(rng: random.Random, resolutions: int) -> int:
+    return rng.randint(1, resolutions)
+
+
+def list_resolutions(rng: random.Random, resolutions: int) -> Request:
+    return Request("GET /api/resolutions", "GET", "/api/resolutions")
+
+
+def get_resolution(rng: random.Random, resolutions: int) -> Request:
+    return Request("GET /api/resolutions/{id}", "GET", f"/api/resolutions/{_rid(rng, resolutions)}")
+
+
+def list_check_ins(rng: random.Random, resolutions: int) -> Request:
+    rid = _rid(rng, resolutions)
+    return Request("GET /api/resolutions/{id}/check-ins", "GET", f"/api/resolutions/{rid}/check-ins")
+
+
+def dashboard_summary(rng: random.Random, resolutions: int) -> Request:
+    return Request("GET /api/dashboard/summary", "GET", "/api/dashboard/summary")
+
+
+def due_reminders(rng: random.Random, resolutions: int) -> Request:
+    return Request("GET /api/reminders/due", "GET", "/api/reminders/due")
+
+
+def search(rng: random.Random, resolutions: int) -> Request:
+    return Request("GET /api/search", "GET", "/api/search", params={"q": rng.choice(datagen.SEARCH_TERMS)})
+
+
+def create_check_in(rng: random.Random, resolutions: int) -> Request:
+    rid = _rid(rng, resolutions)
+    return Request(
+        "POST /api/resolutions/{id}/check-ins", "POST", f"/api/resolutions/{rid}/check-ins",
+        json={"note": datagen.note(rng)},
+    )
+
+
+def stream_check_in(rng: random.Random, resolutions: int) -> Request:
+    rid = _rid(rng, resolutions)
+    return Request(
+        "POST /api/resolutions/{id}/check-ins/stream", "POST", f"/api/resolutions/{rid}/check-ins/stream",
+        json={"note": datagen.note(rng)},
+    )
+
+
+def create_resolution(rng: random.Random, resolutions: int) -> Request:
+    title, description = rng.choice(datagen.GOALS)
+    return Request(
+        "POST /api/resolutions", "POST", "/api/resolutions",
+        json={"title": f"{title} ({rng.randint(1, 10**6)})", "description": description},
+    )
+
+
+def update_resolution(rng: random.Random, resolutions: int) -> Request:
+    rid = _rid(rng, resolutions)
+    return Request(
+        "PUT /api/resolutions/{id}", "PUT", f"/api/resolutions/{rid}",
+        json={"target_date": f"2027-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"},
+    )
+
+
+# Relative weights of each operation per workload mix.
+MIXES: dict[str, dict[Operation, int]] = {
+    "read": {
+        list_resolutions: 30, get_resolution: 25, list_check_ins: 20,
+        dashboard_summary: 10, due_reminders: 10, search: 5,
+    },
+    "mixed": {
+        list_resolutions: 20, get_resolution: 20, list_check_ins: 15, dashboard_summary: 8,
+        due_reminders: 7, search: 10, create_check_in: 10, stream_check_in: 3,
+        create_resolution: 2, update_resolution: 5,
+    },
+    "write": {
+        create_check_in: 45, stream_check_in: 10, create_resolution: 15,
+        update_resolution: 20, get_resolution: 10,
+    },
+}
+
+
+def plan(mix: str, concurrency: int, count: int, resolutions: int, seed: int) -> list[Request]:
+    rng = random.Random(f"{seed}:{mix}:{concurrency}")
+    operations = list(MIXES[mix])
+    weights = list(MIXES[mix].values())
+    return [rng.choices(operations, weights)[0](rng, resolutions) for _ in range(count)]
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(samples: list[tuple[str, float, bool]], wall_seconds: float) -> dict[str, Any]:
+    by_endpoint: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    for endpoint, seconds, ok in samples:
+        by_endpoint[endpoint].append(seconds * 1000)
+        if not ok:
+            errors[endpoint] += 1
+
+    def _stats(latencies: list[float], error_count: int) -> dict[str, Any]:
+        latencies = sorted(latencies)
+        stats = {
+            "count": len(latencies),
+            "errors": error_count,
+            "throughput_rps": round(len(latencies) / wall_seconds, 2),
+            "mean_ms": round(sum(latencies) / len(latencies), 2),
+            "max_ms": round(latencies[-1], 2),
+        }
+        for pct in PERCENTILES:
+            stats[f"p{pct}_ms"] = round(percentile(latencies, pct), 2)
+        return stats
+
+    return {
+        "wall_seconds": round(wall_seconds, 3),
+        "total": _stats([ms for values in by_endpoint.values() for ms in values], sum(errors.values())),
+        "endpoints": {name: _stats(values, errors[name]) for name, values in sorted(by_endpoint.items())},
+    }
+
+
+async def _send(client: httpx.AsyncClient, request: Request) -> tuple[float, bool]:
+    started = time.perf_counter()
+    try:
+        response = await client.request(request.method, request.path, params=request.params, json=request.json)
+        ok = response.status_code < 400
+    except httpx.HTTPError:
+        ok = False
+    return time.perf_counter() - started, ok
+
+
+async def drive(base_url: str, requests: list[Request], concurrency: int, warmup: int = 0) -> dict[str, Any]:
+    """Send ``requests`` with ``concurrency`` workers; the first ``warmup`` are not measured."""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=REQUEST_TIMEOUT_SECONDS) as client:
+        for request in requests[:warmup]:
+            await _send(client, request)
+
+        pending = iter(requests[warmup:])
+        samples: list[tuple[str, float, bool]] = []
+
+        async def _worker() -> None:
+            for request in pending:
+                seconds, ok = await _send(client, request)
+                samples.append((request.endpoint, seconds, ok))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_worker() for _ in range(concurrency)))
+        return summarize(samples, time.perf_counter() - started)
+
+
+def load_dataset(db_path: Path, resolutions: int, check_ins: int, seed: int) -> dict[str, int]:
+    from .. import database as db_mod
+    from ..services.transfer_service import import_lines
+
+    original = db_mod.DB_PATH
+    db_mod.DB_PATH = db_path
+    db_mod.reset_engine()
+    try:
+        db_mod.init_db()
+        lines = (json.dumps(record) for record in datagen.records(resolutions, check_ins, seed))
+        return import_lines(lines, skip_ai=True, enqueue_jobs=False)
+    finally:
+        db_mod.reset_engine()
+        db_mod.DB_PATH = original
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_ready(base_url: str, server: subprocess.Popen) -> None:
+    deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"benchmark server exited with code {server.returncode}")
+        try:
+            if httpx.get(f"{base_url}/api/reminders/due", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("benchmark server did not start in time")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PACKAGE_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    config = {
+        "resolutions": args.resolutions,
+        "check_ins_per_resolution": args.check_ins,
+        "requests": args.requests,
+        "warmup": args.warmup,
+        "concurrency": args.concurrency,
+        "mixes": args.mixes,
+        "latency_ms": args.latency_ms,
+        "failure_rate": args.failure_rate,
+        "seed": args.seed,
+        "group_commit": args.group_commit,
+    }
+    results: dict[str, dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory(prefix="aidb-bench-") as tmp:
+        db_path = Path(tmp) / "bench.db"
+        loaded = load_dataset(db_path, args.resolutions, args.check_ins, args.seed)
+        print(f"loaded {loaded}", file=sys.stderr)
+
+        port = _free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = subprocess.Popen(
+            [
+                sys.executable, "-m", "backend.bench.server", "--db", str(db_path), "--port", str(port),
+                "--latency-ms", str(args.latency_ms), "--failure-rate", str(args.failure_rate),
+                "--seed", str(args.seed), *(["--group-commit"] if args.group_commit else []),
+            ],
+            cwd=PACKAGE_ROOT,
+        )
+        try:
+            _wait_until_ready(base_url, server)
+            for mix in args.mixes:
+                results[mix] = {}
+                for concurrency in args.concurrency:
+                    requests = plan(mix, concurrency, args.warmup + args.requests, args.resolutions, args.seed)
+                    level = asyncio.run(drive(base_url, requests, concurrency, args.warmup))
+                    results[mix][str(concurrency)] = level
+                    total = level["total"]
+                    print(
+                        f"{mix:>6} c={concurrency:<4} {total['throughput_rps']:>8.1f} req/s  "
+                        f"p50 {total['p50_ms']:.1f}ms  p95 {total['p95_ms']:.1f}ms  "
+                        f"p99 {total['p99_ms']:.1f}ms  errors {total['errors']}",
+                        file=sys.stderr,
+                    )
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    return {
+        "version": BASELINE_VERSION,
+        "created_at": datetime.utcnow().isoformat(),
+        "environment": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "config": config,
+        "results": results,
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], threshold: float) -> tuple[list[str], int]:
+    """Per-endpoint deltas for every (mix, concurrency) present in both runs.
+
+    A regression is a p95 or p99 that grew, or a throughput that fell, by more
+    than ``threshold`` (a fraction).
+    """
+    lines = []
+    regressions = 0
+    for mix, levels in current["results"].items():
+        for concurrency, level in levels.items():
+            base_level = baseline["results"].get(mix, {}).get(concurrency)
+            if base_level is None:
+                continue
+            lines.append(f"{mix} c={concurrency}")
+            for endpoint, stats in {"(total)": level["total"], **level["endpoints"]}.items():
+                base = base_level["total"] if endpoint == "(total)" else base_level["endpoints"].get(endpoint)
+                if base is None:
+                    continue
+                cells = []
+                flagged = False
+                for key, higher_is_worse in (("p50_ms", True), ("p95_ms", True), ("p99_ms", True), ("throughput_rps", False)):
+                    change = (stats[key] - base[key]) / base[key] if base[key] else 0.0
+                    worse = change > threshold if higher_is_worse else change < -threshold
+                    if worse and key != "p50_ms":
+                        flagged = True
+                    cells.append(f"{key.split('_')[0]} {base[key]:.1f}->{stats[key]:.1f} ({change:+.0%})")
+                regressions += flagged
+                lines.append(f"  {'!' if flagged else ' '} {endpoint:<45} " + "  ".join(cells))
+    return lines, regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.bench", description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run the benchmark and write a JSON baseline")
+    run_parser.add_argument("--out", default="-", help="baseline file (default: stdout)")
+    run_parser.add_argument("--resolutions", type=int, default=200)
+    run_parser.add_argument("--check-ins", type=int, default=100, help="check-ins per resolution (max 365)")
+    run_parser.add_argument("--requests", type=int, default=500, help="measured requests per mix and level")
+    run_parser.add_argument("--warmup", type=int, default=20)
+    run_parser.add_argument(
+        "--concurrency", type=lambda s: [int(c) for c in s.split(",")], default=[1, 8, 32],
+        help="comma-separated levels (default: 1,8,32)",
+    )
+    run_parser.add_argument(
+        "--mixes", type=lambda s: s.split(","), default=list(MIXES),
+        help=f"comma-separated workload mixes from {', '.join(MIXES)}",
+    )
+    run_parser.add_argument("--latency-ms", type=float, default=300.0, help="stand-in Bedrock latency")
+    run_parser.add_argument("--failure-rate", type=float, default=0.0, help="stand-in Bedrock failure rate")
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--group-commit", action="store_true", help="serve writes through the group-commit writer")
+
+    serialization_parser = subparsers.add_parser(
+        "serialization", help="rows/sec of read-endpoint JSON encoding, legacy vs fast path"
+    )
+    serialization_parser.add_argument("--resolutions", type=int, default=1000)
+    serialization_parser.add_argument("--check-ins", type=int, default=100, help="check-ins per resolution (max 365)")
+    serialization_parser.add_argument(
+        "--rows", type=lambda s: [int(n) for n in s.split(",")], default=[1000, 10000, 100000],
+        help="comma-separated result-set sizes (default: 1000,10000,100000)",
+    )
+    serialization_parser.add_argument("--repeat", type=int, default=3, help="runs per size; the best is kept")
+    serialization_parser.add_argument("--seed", type=int, default=0)
+
+    startup_parser = subparsers.add_parser("startup", help="import time per module and time to first request")
+    startup_parser.add_argument("--out", help="also write the report as JSON")
+    startup_parser.add_argument("--repeat", type=int, default=3, help="server starts per scenario")
+
+    compare_parser = subparsers.add_parser("compare", help="diff a run against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="allowed change (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        unknown = [mix for mix in args.mixes if mix not in MIXES]
+        if unknown:
+            parser.error(f"unknown mix: {', '.join(unknown)}")
+        report = json.dumps(run(args), indent=2) + "\n"
+        if args.out == "-":
+            sys.stdout.write(report)
+        else:
+            Path(args.out).write_text(report)
+        return 0
+
+    if args.command == "serialization":
+        from . import serialization
+
+        results = serialization.run(args.resolutions, args.check_ins, args.rows, args.repeat, args.seed)
+        print(serialization.format_results(results))
+        return 0
+
+    if args.command == "startup":
+        from . import startup
+
+        report = startup.run(args.repeat)
+        print(startup.format_report(report))
+        if args.out:
+            Path(args.out).write_text(json.dumps(report, indent=2) + "\n")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    lines, regressions = compare(baseline, current, args.threshold)
+    print("\n".join(lines))
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
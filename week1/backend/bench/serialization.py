@@ -0,0 +1,101 @@
+"""Rows/sec of the read endpoints' JSON encoding, before and after the fast path.
+
+``legacy`` is what the endpoints did before: ORM instances, ``_to_dict``, a
+Pydantic model per row, then FastAPI's ``response_model`` handling (dump,
+validate, serialize, ``json.dumps``). ``fast`` is ``backend.serialization``:
+a Core select of the response columns encoded with orjson. Both produce the
+same JSON document for the same rows.
+"""
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import orjson
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .. import database as db_mod
+from ..db_models import CheckIn, Resolution
+from ..models import CheckInResponse, ResolutionResponse
+from ..serialization import CHECK_IN_COLUMNS, CHECK_IN_KEYS, RESOLUTION_COLUMNS, RESOLUTION_KEYS, records
+from .runner import load_dataset
+
+TABLES = {
+    "resolutions": (Resolution, ResolutionResponse, RESOLUTION_COLUMNS, RESOLUTION_KEYS),
+    "check_ins": (CheckIn, CheckInResponse, CHECK_IN_COLUMNS, CHECK_IN_KEYS),
+}
+
+
+def legacy(session: Session, table: str, limit: int) -> bytes:
+    entity, model, _, _ = TABLES[table]
+    adapter = TypeAdapter(list[model])
+    rows = session.scalars(select(entity).order_by(entity.id).limit(limit))
+    items: list[BaseModel] = [model(**r._to_dict()) for r in rows]
+    value = adapter.validate_python([item.model_dump() for item in items])
+    content = adapter.dump_python(value, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def fast(session: Session, table: str, limit: int) -> bytes:
+    entity, _, columns, names = TABLES[table]
+    return orjson.dumps(records(names, session.execute(select(*columns).order_by(entity.id).limit(limit))))
+
+
+def _best(fn: Callable[[Session, str, int], bytes], table: str, limit: int, repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    rows = 0
+    for _ in range(repeat):
+        session = db_mod.get_session_factory()()
+        try:
+            start = time.perf_counter()
+            body = fn(session, table, limit)
+            best = min(best, time.perf_counter() - start)
+            rows = len(json.loads(body))
+        finally:
+            session.close()
+    return best, rows
+
+
+def measure(db_path: Path, sizes: list[int], repeat: int) -> list[dict[str, Any]]:
+    original = db_mod.DB_PATH
+    db_mod.DB_PATH = db_path
+    db_mod.reset_engine()
+    results = []
+    try:
+        for table in TABLES:
+            for limit in sizes:
+                legacy_seconds, rows = _best(legacy, table, limit, repeat)
+                fast_seconds, _ = _best(fast, table, limit, repeat)
+                if results and results[-1]["table"] == table and results[-1]["rows"] == rows:
+                    continue  # the table has fewer rows than this size
+                results.append({
+                    "table": table,
+                    "rows": rows,
+                    "legacy_rows_per_second": rows / legacy_seconds,
+                    "fast_rows_per_second": rows / fast_seconds,
+                    "speedup": legacy_seconds / fast_seconds,
+                })
+    finally:
+        db_mod.reset_engine()
+        db_mod.DB_PATH = original
+    return results
+
+
+def run(resolutions: int, check_ins: int, sizes: list[int], repeat: int, seed: int) -> list[dict[str, Any]]:
+    with tempfile.TemporaryDirectory(prefix="aidb-bench-") as tmp:
+        db_path = Path(tmp) / "bench.db"
+        load_dataset(db_path, resolutions, check_ins, seed)
+        return measure(db_path, sizes, repeat)
+
+
+def format_results(results: list[dict[str, Any]]) -> str:
+    lines = [f"{'table':<12} {'rows':>8} {'legacy rows/s':>14} {'fast rows/s':>14} {'speedup':>8}"]
+    for r in results:
+        lines.append(
+            f"{r['table']:<12} {r['rows']:>8} {r['legacy_rows_per_second']:>14,.0f} "
+            f"{r['fast_rows_per_second']:>14,.0f} {r['speedup']:>7.1f}x"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,40 @@
+"""Run ``backend.main:app`` against a given database with the Bedrock stand-in.
+
+Started as a subprocess by the benchmark runner, so the server never shares an
+interpreter (or a GIL) with the load generator.
+"""
+import argparse
+import logging
+from pathlib import Path
+from typing import Optional
+
+import uvicorn
+
+from .. import database as db_mod
+from ..main import app
+from ..services import ai_service, write_queue
+from .fake_bedrock import FakeBedrockClient
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve the API with a local Bedrock stand-in.")
+    parser.add_argument("--db", type=Path, required=True)
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--group-commit", action="store_true")
+    args = parser.parse_args(argv)
+
+    db_mod.DB_PATH = args.db
+    ai_service._client = FakeBedrockClient(args.latency_ms, args.failure_rate, args.seed)
+    write_queue.ENABLED = args.group_commit
+    # Injected failures fall back to default results; a traceback for each would
+    # only slow the server down.
+    logging.getLogger(ai_service.__name__).setLevel(logging.CRITICAL)
+
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
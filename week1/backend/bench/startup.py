@@ -0,0 +1,115 @@
+"""Cold-start report: import time per module and time to first request.
+
+Import times come from ``python -X importtime -c "import backend.main"`` in a
+fresh interpreter. Time to first request is measured from spawning the
+benchmark server to its first successful ``GET /api/reminders/due``, both
+against a new database (create, migrate, seed) and against one already at
+the current schema.
+"""
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from .runner import PACKAGE_ROOT, STARTUP_TIMEOUT_SECONDS, _free_port
+
+POLL_SECONDS = 0.005
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    """``(module, self_us, cumulative_us, depth)`` for each ``-X importtime`` line."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        self_us, cumulative_us = self_us.strip(), cumulative_us.strip()
+        if not self_us.isdigit():
+            continue  # the header line
+        module = name.strip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((module, int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+def import_times(module: str = "backend.main") -> dict[str, Any]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PACKAGE_ROOT, capture_output=True, text=True, check=True,
+    )
+    entries = parse_importtime(result.stderr)
+    packages: dict[str, int] = defaultdict(int)
+    for name, self_us, _, _ in entries:
+        packages[name.split(".")[0]] += self_us
+    return {
+        "total_ms": next(cumulative for name, _, cumulative, _ in entries if name == module) / 1000,
+        # Self time summed per top-level package: where import time actually goes.
+        "packages_ms": {
+            name: us / 1000 for name, us in sorted(packages.items(), key=lambda item: item[1], reverse=True)
+        },
+        # Cumulative time of each project module, including what it pulls in first.
+        "modules_ms": {
+            name: cumulative / 1000
+            for name, _, cumulative, _ in sorted(entries, key=lambda e: e[2], reverse=True)
+            if name.split(".")[0] == "backend"
+        },
+    }
+
+
+def time_to_first_request(db_path: Path) -> float:
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/api/reminders/due"
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "backend.bench.server", "--db", str(db_path), "--port", str(port), "--latency-ms", "0"],
+        cwd=PACKAGE_ROOT,
+    )
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            while time.perf_counter() - start < STARTUP_TIMEOUT_SECONDS:
+                if server.poll() is not None:
+                    raise RuntimeError(f"benchmark server exited with code {server.returncode}")
+                try:
+                    if client.get(url).status_code == 200:
+                        return time.perf_counter() - start
+                except httpx.HTTPError:
+                    pass
+                time.sleep(POLL_SECONDS)
+        raise RuntimeError("benchmark server did not start in time")
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def run(repeat: int) -> dict[str, Any]:
+    first_request: dict[str, list[float]] = {"new_database": [], "existing_database": []}
+    with tempfile.TemporaryDirectory(prefix="aidb-startup-") as tmp:
+        for i in range(repeat):
+            db_path = Path(tmp) / f"startup-{i}.db"
+            first_request["new_database"].append(time_to_first_request(db_path))
+            first_request["existing_database"].append(time_to_first_request(db_path))
+    return {
+        "imports": import_times(),
+        "first_request_ms": {
+            scenario: {"median": statistics.median(samples) * 1000, "min": min(samples) * 1000}
+            for scenario, samples in first_request.items()
+        },
+    }
+
+
+def format_report(report: dict[str, Any], top: int = 10) -> str:
+    imports = report["imports"]
+    lines = [f"import backend.main: {imports['total_ms']:.0f}ms", "  by package (self time):"]
+    lines += [f"    {name:<36} {ms:>8.1f}ms" for name, ms in list(imports["packages_ms"].items())[:top]]
+    lines.append("  project modules (cumulative):")
+    lines += [f"    {name:<36} {ms:>8.1f}ms" for name, ms in list(imports["modules_ms"].items())[:top]]
+    lines.append("time to first request:")
+    for scenario, stats in report["first_request_ms"].items():
+        lines.append(f"    {scenario:<36} {stats['median']:>8.0f}ms median  {stats['min']:.0f}ms min")
+    return "\n".join(lines)
@@ -1,43 +1,282 @@
+import asyncio
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Generator
+from typing import AsyncGenerator, Callable, Generator, Iterator, Optional
 
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
+from . import metrics
 from .db_models import Base
+from .migrations import SCHEMA_VERSION, get_schema_version, run_migrations
 
 DB_PATH = Path(__file__).resolve().parent.parent / "data" / "resolutions.db"
 
+# Each tenant (user) gets its own SQLite file, so writers in different tenants
+# never wait on the same lock. The default tenant keeps using ``DB_PATH``.
+DEFAULT_TENANT = "default"
+TENANT_HEADER = "X-Tenant-Id"
+TENANT_ID_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9_-]{0,63}")
+MAX_OPEN_TENANTS = 32
+TENANTS_DIR: Optional[Path] = None  # defaults to a ``tenants`` folder next to DB_PATH
+# Tenants a request may create on first use. Any other tenant needs an existing
+# file, made with ``python -m backend.tenants create``.
+ALLOWED_TENANTS: frozenset[str] = frozenset()
+
 _engine = None
 _SessionLocal = None
+_async_engine = None
+_AsyncSessionLocal = None
+
+_tenant: ContextVar[str] = ContextVar("tenant", default=DEFAULT_TENANT)
+
+# Called in a tenant's context the first time this process opens its database.
+tenant_open_hooks: list[Callable[[], None]] = []
+
+
+def _set_sqlite_pragma(dbapi_conn, connection_record):
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def _instrument(engine) -> None:
+    event.listen(engine, "connect", _set_sqlite_pragma)
+    event.listen(engine, "before_cursor_execute", metrics.before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", metrics.after_cursor_execute)
+
+
+def _create_engine(path: Path) -> Engine:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    _instrument(engine)
+    return engine
+
+
+def _create_async_engine(path: Path) -> AsyncEngine:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    _instrument(engine.sync_engine)
+    return engine
+
+
+def _migrate(engine: Engine) -> bool:
+    """Bring a database up to the current schema; False if it already was.
+
+    A file stamped with ``SCHEMA_VERSION`` has every table and migration, so a
+    single PRAGMA read replaces ``create_all``'s per-table inspection.
+    """
+    with engine.connect() as conn:
+        if get_schema_version(conn) == SCHEMA_VERSION:
+            return False
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    return True
+
+
+class UnknownTenant(LookupError):
+    """The tenant has no database and is not allowed to create one on first use."""
+
+
+def validate_tenant(tenant: str) -> str:
+    if not TENANT_ID_PATTERN.fullmatch(tenant):
+        raise ValueError(f"Invalid tenant id: {tenant!r}")
+    return tenant
+
+
+def tenants_dir() -> Path:
+    return TENANTS_DIR or DB_PATH.parent / "tenants"
+
+
+def tenant_path(tenant: str) -> Path:
+    if tenant == DEFAULT_TENANT:
+        return DB_PATH
+    return tenants_dir() / f"{validate_tenant(tenant)}.db"
+
+
+def current_tenant() -> str:
+    return _tenant.get()
+
+
+@contextmanager
+def use_tenant(tenant: str) -> Iterator[None]:
+    """Route every session opened in this context to ``tenant``'s database."""
+    token = _tenant.set(validate_tenant(tenant))
+    try:
+        yield
+    finally:
+        _tenant.reset(token)
+
+
+class _TenantDatabase:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.engine = _create_engine(path)
+        self.session_factory = sessionmaker(bind=self.engine)
+        self._async_engine: Optional[AsyncEngine] = None
+        self.async_session_factory: Optional[async_sessionmaker] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def async_factory(self) -> async_sessionmaker:
+        if self.async_session_factory is None:
+            self._async_engine = _create_async_engine(self.path)
+            self.async_session_factory = async_sessionmaker(bind=self._async_engine, expire_on_commit=False)
+            try:
+                self._loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self._loop = None
+        return self.async_session_factory
+
+    async def adispose(self) -> None:
+        self.engine.dispose()
+        if self._async_engine is not None:
+            await self._async_engine.dispose()
+
+    def dispose(self) -> None:
+        # Sessions still using an evicted engine keep their connection until they close.
+        self.engine.dispose()
+        if self._async_engine is None or self._loop is None or self._loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            _pending_disposals.add(task := self._loop.create_task(self._async_engine.dispose()))
+            task.add_done_callback(_pending_disposals.discard)
+        else:
+            asyncio.run_coroutine_threadsafe(self._async_engine.dispose(), self._loop)
+
+
+_pending_disposals: set[asyncio.Task] = set()
+
+
+class _TenantPool:
+    """LRU of open tenant databases; each is created and migrated on first use.
+
+    The pool lock only guards the LRU itself. Creating and migrating a file
+    happens under a lock of that tenant's own, so a slow first open holds up
+    nobody but other callers for the same tenant.
+    """
+
+    def __init__(self, max_open: int) -> None:
+        self.max_open = max_open
+        self._open: OrderedDict[str, _TenantDatabase] = OrderedDict()
+        self._opening: dict[str, threading.Lock] = {}
+        self._seen: set[str] = set()
+        self._lock = threading.Lock()
+
+    def _lookup(self, tenant: str) -> Optional[_TenantDatabase]:
+        database = self._open.get(tenant)
+        if database is not None:
+            self._open.move_to_end(tenant)
+        return database
+
+    def is_open(self, tenant: str) -> bool:
+        with self._lock:
+            return tenant in self._open
+
+    def get(self, tenant: str) -> _TenantDatabase:
+        """The open database for ``tenant``; raises ``UnknownTenant`` if it has none to open."""
+        with self._lock:
+            database = self._lookup(tenant)
+            if database is not None:
+                return database
+            opening = self._opening.setdefault(tenant, threading.Lock())
+
+        with opening:
+            with self._lock:
+                database = self._lookup(tenant)
+            if database is not None:
+                return database
+            try:
+                path = tenant_path(tenant)
+                if tenant not in ALLOWED_TENANTS and not path.exists():
+                    raise UnknownTenant(f"Unknown tenant: {tenant!r}")
+                database = _TenantDatabase(path)
+                _migrate(database.engine)
+            except BaseException:
+                with self._lock:
+                    self._opening.pop(tenant, None)
+                raise
+            with self._lock:
+                self._opening.pop(tenant, None)
+                self._open[tenant] = database
+                evicted = []
+                while len(self._open) > self.max_open:
+                    evicted.append(self._open.popitem(last=False)[1])
+                first_open = tenant not in self._seen
+                self._seen.add(tenant)
+
+        for old in evicted:
+            old.dispose()
+        if first_open:
+            with use_tenant(tenant):
+                for hook in tenant_open_hooks:
+                    hook()
+        return database
+
+    def open_tenants(self) -> list[str]:
+        with self._lock:
+            return list(self._open)
+
+    def close_all(self) -> list[_TenantDatabase]:
+        """Forget every open database and return them for disposal."""
+        with self._lock:
+            databases = list(self._open.values())
+            self._open.clear()
+            self._seen.clear()
+        return databases
+
+
+_tenants = _TenantPool(MAX_OPEN_TENANTS)
 
 
 def _get_engine():
     global _engine, _SessionLocal
+    tenant = _tenant.get()
+    if tenant != DEFAULT_TENANT:
+        return _tenants.get(tenant).engine
     if _engine is None:
-        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-        _engine = create_engine(
-            f"sqlite:///{DB_PATH}",
-            connect_args={"check_same_thread": False},
-        )
-
-        @event.listens_for(_engine, "connect")
-        def _set_sqlite_pragma(dbapi_conn, connection_record):
-            cursor = dbapi_conn.cursor()
-            cursor.execute("PRAGMA journal_mode=WAL")
-            cursor.execute("PRAGMA foreign_keys=ON")
-            cursor.close()
-
+        _engine = _create_engine(DB_PATH)
         _SessionLocal = sessionmaker(bind=_engine)
     return _engine
 
 
+def _get_async_engine() -> AsyncEngine:
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        _async_engine = _create_async_engine(DB_PATH)
+        # Objects stay usable after commit; handlers return them without reloading.
+        _AsyncSessionLocal = async_sessionmaker(bind=_async_engine, expire_on_commit=False)
+    return _async_engine
+
+
 def get_session_factory() -> sessionmaker:
+    tenant = _tenant.get()
+    if tenant != DEFAULT_TENANT:
+        return _tenants.get(tenant).session_factory
     _get_engine()
     return _SessionLocal
 
 
+def get_async_session_factory() -> async_sessionmaker:
+    tenant = _tenant.get()
+    if tenant != DEFAULT_TENANT:
+        return _tenants.get(tenant).async_factory()
+    _get_async_engine()
+    return _AsyncSessionLocal
+
+
 def get_db() -> Generator[Session, None, None]:
+    """Session on the current request's tenant database (see ``TenantMiddleware``)."""
     session = get_session_factory()()
     try:
         yield session
@@ -45,17 +284,49 @@ def get_db() -> Generator[Session, None, None]:
         session.close()
 
 
-def init_db() -> None:
-    engine = _get_engine()
-    Base.metadata.create_all(bind=engine)
+async def open_tenant(tenant: str) -> None:
+    """Open ``tenant``'s database off the event loop; its first open may run migrations."""
+    if tenant != DEFAULT_TENANT and not _tenants.is_open(tenant):
+        await asyncio.to_thread(_tenants.get, tenant)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with get_async_session_factory()() as session:
+        yield session
+
+
+def init_db() -> bool:
+    """Create or migrate the default database; True if anything had to change."""
+    return _migrate(_get_engine())
+
+
+def list_tenants() -> list[str]:
+    """Every tenant with a database file, the default tenant first."""
+    tenants = [DEFAULT_TENANT] if DB_PATH.exists() else []
+    if tenants_dir().is_dir():
+        tenants.extend(sorted(p.stem for p in tenants_dir().glob("*.db") if TENANT_ID_PATTERN.fullmatch(p.stem)))
+    return tenants
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine, _AsyncSessionLocal
+    for database in _tenants.close_all():
+        await database.adispose()
+    engine, _async_engine, _AsyncSessionLocal = _async_engine, None, None
+    if engine is not None:
+        await engine.dispose()
 
 
 def reset_engine() -> None:
     global _engine, _SessionLocal
+    for database in _tenants.close_all():
+        database.dispose()
     if _engine is not None:
         _engine.dispose()
     _engine = None
     _SessionLocal = None
+    if _async_engine is not None:
+        asyncio.run(dispose_async_engine())
 
 
 def get_connection():
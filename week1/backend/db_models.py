@@ -1,4 +1,8 @@
-from sqlalchemy import Column, Integer, Text, Float, ForeignKey
+import calendar
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Column, Integer, Text, Float, ForeignKey, Index
 from sqlalchemy.orm import DeclarativeBase, relationship
 
 
@@ -18,9 +22,14 @@ class Resolution(Base):
     status = Column(Text, nullable=False, default="active")
     created_at = Column(Text, nullable=False)
     updated_at = Column(Text, nullable=False)
+    # Set by a soft delete; the row and its children are purged in the background.
+    deleted_at = Column(Text)
 
-    check_ins = relationship("CheckIn", back_populates="resolution", cascade="all, delete-orphan")
-    reminder = relationship("Reminder", back_populates="resolution", uselist=False, cascade="all, delete-orphan")
+    # Children go with the parent through ON DELETE CASCADE, without being loaded.
+    check_ins = relationship("CheckIn", back_populates="resolution", cascade="all, delete-orphan", passive_deletes=True)
+    reminder = relationship(
+        "Reminder", back_populates="resolution", uselist=False, cascade="all, delete-orphan", passive_deletes=True
+    )
 
     def _to_dict(self) -> dict:
         return {
@@ -36,6 +45,24 @@ class Resolution(Base):
         }
 
 
+Index("ix_resolutions_status", Resolution.status)
+Index("ix_resolutions_priority_created", Resolution.priority, Resolution.created_at.desc())
+Index("ix_resolutions_status_category", Resolution.status, Resolution.category, Resolution.priority)
+Index("ix_resolutions_deleted", Resolution.deleted_at, sqlite_where=Resolution.deleted_at.is_not(None))
+
+
+def to_epoch(timestamp: Optional[str]) -> Optional[int]:
+    """Unix seconds of an ISO timestamp; naive ones are UTC, as SQLite's ``strftime('%s')`` reads them."""
+    try:
+        return calendar.timegm(datetime.fromisoformat(timestamp).utctimetuple())
+    except (TypeError, ValueError):
+        return None
+
+
+def _created_epoch(context) -> Optional[int]:
+    return to_epoch(context.get_current_parameters().get("created_at"))
+
+
 class CheckIn(Base):
     __tablename__ = "check_ins"
 
@@ -46,6 +73,8 @@ class CheckIn(Base):
     sentiment_score = Column(Float)
     ai_feedback = Column(Text)
     created_at = Column(Text, nullable=False)
+    # created_at as Unix seconds, for range filters and time buckets without parsing text.
+    created_epoch = Column(Integer, default=_created_epoch)
 
     resolution = relationship("Resolution", back_populates="check_ins")
 
@@ -61,6 +90,18 @@ class CheckIn(Base):
         }
 
 
+Index("ix_check_ins_resolution_created", CheckIn.resolution_id, CheckIn.created_at)
+Index("ix_check_ins_sentiment", CheckIn.sentiment, CheckIn.sentiment_score)
+Index(
+    "ix_check_ins_created_epoch",
+    CheckIn.created_epoch, CheckIn.resolution_id, CheckIn.sentiment, CheckIn.sentiment_score,
+)
+Index(
+    "ix_check_ins_resolution_epoch",
+    CheckIn.resolution_id, CheckIn.created_epoch, CheckIn.sentiment, CheckIn.sentiment_score,
+)
+
+
 class Reminder(Base):
     __tablename__ = "reminders"
 
@@ -80,3 +121,108 @@ class Reminder(Base):
             "next_due": self.next_due,
             "is_active": self.is_active,
         }
+
+
+Index("ix_reminders_active_next_due", Reminder.is_active, Reminder.next_due)
+
+
+class ResolutionTerm(Base):
+    __tablename__ = "resolution_terms"
+
+    term = Column(Integer, primary_key=True)
+    resolution_id = Column(Integer, ForeignKey("resolutions.id", ondelete="CASCADE"), primary_key=True)
+    weight = Column(Float, nullable=False)
+
+
+Index("ix_resolution_terms_resolution", ResolutionTerm.resolution_id)
+
+
+class AiJob(Base):
+    __tablename__ = "ai_jobs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    check_in_id = Column(Integer, ForeignKey("check_ins.id", ondelete="CASCADE"), nullable=False, unique=True)
+    status = Column(Text, nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text)
+    created_at = Column(Text, nullable=False)
+    updated_at = Column(Text, nullable=False)
+
+    def _to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "check_in_id": self.check_in_id,
+            "status": self.status,
+            "attempts": self.attempts,
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+Index("ix_ai_jobs_status", AiJob.status)
+
+
+class AiCacheEntry(Base):
+    __tablename__ = "ai_cache"
+
+    key = Column(Text, primary_key=True)
+    model_id = Column(Text, nullable=False)
+    response = Column(Text, nullable=False)
+    created_at = Column(Float, nullable=False, index=True)
+
+
+class DashboardStats(Base):
+    __tablename__ = "dashboard_stats"
+
+    id = Column(Integer, primary_key=True)
+    total_resolutions = Column(Integer, nullable=False, server_default="0")
+    active_resolutions = Column(Integer, nullable=False, server_default="0")
+    completed_resolutions = Column(Integer, nullable=False, server_default="0")
+    abandoned_resolutions = Column(Integer, nullable=False, server_default="0")
+    total_check_ins = Column(Integer, nullable=False, server_default="0")
+    sentiment_score_sum = Column(Float, nullable=False, server_default="0")
+    sentiment_score_count = Column(Integer, nullable=False, server_default="0")
+    sentiment_histogram = Column(Text, nullable=False, server_default="{}")
+
+
+class DataVersion(Base):
+    __tablename__ = "data_versions"
+
+    # 0 is the global counter; any other value is a resolution id.
+    scope = Column(Integer, primary_key=True, autoincrement=False)
+    version = Column(Integer, nullable=False, server_default="0")
+
+
+class ReanalysisRun(Base):
+    __tablename__ = "reanalysis_runs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    status = Column(Text, nullable=False, default="running")
+    model_id = Column(Text, nullable=False)
+    categorize = Column(Integer, nullable=False, default=0)
+    phase = Column(Text, nullable=False, default="check_ins")
+    # Last row written; check-ins are walked in (resolution_id, created_at, id) order.
+    cursor_resolution_id = Column(Integer)
+    cursor_created_at = Column(Text)
+    cursor_id = Column(Integer)
+    total = Column(Integer, nullable=False, default=0)
+    processed = Column(Integer, nullable=False, default=0)
+    changed = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    started_at = Column(Text, nullable=False)
+    updated_at = Column(Text, nullable=False)
+    finished_at = Column(Text)
+
+
+class ResolutionStats(Base):
+    __tablename__ = "resolution_stats"
+
+    resolution_id = Column(Integer, ForeignKey("resolutions.id", ondelete="CASCADE"), primary_key=True, autoincrement=False)
+    check_in_count = Column(Integer, nullable=False, server_default="0")
+    # Consecutive days with a check-in, ending on the day of last_check_in_at.
+    current_streak = Column(Integer, nullable=False, server_default="0")
+    longest_streak = Column(Integer, nullable=False, server_default="0")
+    last_check_in_at = Column(Text)
+    weekly_check_ins = Column(Text, nullable=False, server_default="{}")
+    rolling_sentiment = Column(Float)
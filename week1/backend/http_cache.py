@@ -0,0 +1,119 @@
+"""Strong ETags, ``If-None-Match`` and an in-process cache for versioned reads.
+
+A cached endpoint names the data-version counter it depends on (see
+``services.data_versions``); reading it is one primary-key lookup. The ETag
+is derived from the tenant, the database id, the request URL and the
+counter. A matching ``If-None-Match`` is answered with 304 before any of the
+endpoint's queries run, and a repeated read at the same version is served
+from memory.
+
+The counter is read before the endpoint's own queries. A write that commits
+in between can only make the stored body newer than its version, never
+older, and the next read sees the bumped counter and misses.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Awaitable, Callable, NamedTuple, Optional
+
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .database import TENANT_HEADER, current_tenant
+from .services.data_versions import GLOBAL_SCOPE, get_version
+
+MAX_ENTRIES = 512
+
+# Clients must revalidate, which is a cheap 304 while nothing has changed.
+CACHE_CONTROL = "no-cache"
+
+
+class _Entry(NamedTuple):
+    body: bytes
+    headers: dict[str, str]
+
+
+class VersionedResponseCache:
+    """LRU of response bodies keyed on (tenant, route, version)."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str, str], _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple[str, str, str]) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: tuple[str, str, str], entry: _Entry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_cache = VersionedResponseCache()
+
+
+def make_etag(*parts: object) -> str:
+    digest = hashlib.blake2b("\x1f".join(map(str, parts)).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison, as RFC 9110 requires for ``If-None-Match``."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+async def cached_json(
+    request: Request,
+    db: AsyncSession,
+    build: Callable[[], Awaitable[Response]],
+    scope: int = GLOBAL_SCOPE,
+    extra: tuple[object, ...] = (),
+) -> Response:
+    """Serve ``build()``'s JSON response through the version check and cache.
+
+    ``extra`` folds anything else the body depends on (e.g. today's date)
+    into the ETag.
+    """
+    database_id, version = await get_version(db, scope)
+    tenant = current_tenant()
+    route = f"{request.url.path}?{request.url.query}"
+    etag = make_etag(tenant, database_id, route, scope, version, *extra)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": TENANT_HEADER}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    key = (tenant, route, etag)
+    entry = _cache.get(key)
+    if entry is None:
+        response = await build()
+        if response.status_code != 200:
+            return response
+        entry = _Entry(bytes(response.body), {k: v for k, v in response.headers.items() if k.lower().startswith("x-")})
+        _cache.put(key, entry)
+    return Response(entry.body, media_type="application/json", headers={**entry.headers, **headers})
+
+
+def cache_stats() -> dict[str, int]:
+    return {"hits": _cache.hits, "misses": _cache.misses}
@@ -3,16 +3,36 @@ from typing import AsyncGenerator
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .database import init_db
+from .database import dispose_async_engine, init_db, tenant_open_hooks
+from .metrics import MetricsMiddleware
+from .tenants import TenantMiddleware
 from .seed import seed_if_empty
-from .routers import resolutions, check_ins, reminders, dashboard
+from .routers import resolutions, check_ins, check_in_batches, reminders, dashboard, metrics, search, transfer
+from .services import ai_service, deletion_service, enrichment_service, reminder_scheduler, write_queue
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    init_db()
-    seed_if_empty()
+    # A database already at the current schema was created, migrated and
+    # seeded by an earlier start; skip straight to serving.
+    if init_db():
+        seed_if_empty()
+    enrichment_service.recover_pending_jobs()
+    deletion_service.schedule_purge()
+    # Other tenants' leftover jobs and soft deletes are picked up when their database is first opened.
+    tenant_open_hooks.append(enrichment_service.recover_pending_jobs)
+    tenant_open_hooks.append(deletion_service.schedule_purge)
+    await reminder_scheduler.start()
+    if ai_service.WARM_UP_ON_STARTUP:
+        ai_service.warm_up()
     yield
+    await reminder_scheduler.stop()
+    tenant_open_hooks.remove(enrichment_service.recover_pending_jobs)
+    tenant_open_hooks.remove(deletion_service.schedule_purge)
+    enrichment_service.shutdown()
+    deletion_service.shutdown()
+    write_queue.shutdown()
+    await dispose_async_engine()
 
 
 app = FastAPI(title="Resolution Tracker", version="1.0.0", lifespan=lifespan)
@@ -24,8 +44,14 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(TenantMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(resolutions.router)
 app.include_router(check_ins.router)
+app.include_router(check_in_batches.router)
 app.include_router(reminders.router)
 app.include_router(dashboard.router)
+app.include_router(search.router)
+app.include_router(transfer.router)
+app.include_router(metrics.router)
@@ -0,0 +1,179 @@
+"""Prometheus metrics for HTTP routes, SQL statements and Bedrock calls.
+
+Everything registers on a private ``REGISTRY`` served by ``GET /metrics``.
+Label values are bounded: routes are path templates, never raw paths, and
+SQL statements are labelled by their leading keyword only. The route is only
+known once FastAPI has matched it, so the in-flight gauge is per method. Hot paths use
+pre-resolved label children so an observation costs a lock and an add.
+"""
+import time
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+REGISTRY = CollectorRegistry(auto_describe=True)
+
+DB_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+STATEMENT_COUNT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+BEDROCK_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0, 21.0, 30.0)
+SQL_OPERATIONS = ("SELECT", "INSERT", "UPDATE", "DELETE", "PRAGMA", "WITH", "CREATE", "OTHER")
+UNMATCHED_ROUTE = "unmatched"
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Time to complete a request, including streamed bodies.",
+    ["method", "route", "status"], registry=REGISTRY,
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "Requests currently being served.", ["method"], registry=REGISTRY,
+)
+HTTP_DB_STATEMENTS = Histogram(
+    "http_request_db_statements", "SQL statements executed per request.", ["method", "route"],
+    buckets=STATEMENT_COUNT_BUCKETS, registry=REGISTRY,
+)
+HTTP_DB_SECONDS = Histogram(
+    "http_request_db_seconds", "Time spent in SQL statements per request.", ["method", "route"],
+    buckets=DB_BUCKETS, registry=REGISTRY,
+)
+DB_STATEMENTS = Counter(
+    "db_statements", "SQL statements executed.", ["operation"], registry=REGISTRY,
+)
+DB_STATEMENT_SECONDS = Histogram(
+    "db_statement_duration_seconds", "SQL statement execution time.", ["operation"],
+    buckets=DB_BUCKETS, registry=REGISTRY,
+)
+BEDROCK_SECONDS = Histogram(
+    "bedrock_request_duration_seconds", "Bedrock call latency, to the last streamed chunk.", ["api"],
+    buckets=BEDROCK_BUCKETS, registry=REGISTRY,
+)
+BEDROCK_ERRORS = Counter(
+    "bedrock_errors", "Failed Bedrock calls by error code.", ["api", "error"], registry=REGISTRY,
+)
+BEDROCK_TOKENS = Counter(
+    "bedrock_tokens", "Tokens reported by Bedrock.", ["direction"], registry=REGISTRY,
+)
+BEDROCK_CIRCUIT_STATE = Gauge(
+    "bedrock_circuit_state", "Bedrock circuit breaker state: 0 closed, 1 half-open, 2 open.", registry=REGISTRY,
+)
+BEDROCK_CIRCUIT_TRANSITIONS = Counter(
+    "bedrock_circuit_transitions", "Bedrock circuit breaker state changes.", ["state"], registry=REGISTRY,
+)
+AI_FALLBACKS = Counter(
+    "ai_fallbacks", "AI results replaced by defaults after a failure.", ["task"], registry=REGISTRY,
+)
+SENTIMENT_DECISIONS = Counter(
+    "sentiment_decisions", "Sentiment analyses by where they were answered and why.", ["decision"],
+    registry=REGISTRY,
+)
+SENTIMENT_COMPARISONS = Counter(
+    "sentiment_label_comparisons", "Local classifier labels against Bedrock's, where both are known.",
+    ["local", "bedrock"], registry=REGISTRY,
+)
+
+_statements = {op: DB_STATEMENTS.labels(op) for op in SQL_OPERATIONS}
+_statement_seconds = {op: DB_STATEMENT_SECONDS.labels(op) for op in SQL_OPERATIONS}
+_input_tokens = BEDROCK_TOKENS.labels("input")
+_output_tokens = BEDROCK_TOKENS.labels("output")
+
+# [statement count, seconds] for the request being served; shared by reference
+# with the threads and greenlets the request runs SQL on.
+_request_db: ContextVar[Optional[list]] = ContextVar("request_db", default=None)
+
+
+def _operation(statement: str) -> str:
+    words = statement.lstrip()[:8].split(None, 1)
+    keyword = words[0].upper() if words else ""
+    return keyword if keyword in _statements else "OTHER"
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    context._metrics_started = time.perf_counter()
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - context._metrics_started
+    operation = _operation(statement)
+    _statements[operation].inc()
+    _statement_seconds[operation].observe(elapsed)
+    totals = _request_db.get()
+    if totals is not None:
+        totals[0] += 1
+        totals[1] += elapsed
+
+
+def observe_bedrock(api: str, seconds: float) -> None:
+    BEDROCK_SECONDS.labels(api).observe(seconds)
+
+
+def record_bedrock_error(api: str, exc: BaseException) -> None:
+    response = getattr(exc, "response", None)
+    error = response.get("Error", {}).get("Code") if isinstance(response, dict) else None
+    BEDROCK_ERRORS.labels(api, error or type(exc).__name__).inc()
+
+
+def record_tokens(usage: Optional[dict[str, Any]]) -> None:
+    if not usage:
+        return
+    if usage.get("input_tokens"):
+        _input_tokens.inc(usage["input_tokens"])
+    if usage.get("output_tokens"):
+        _output_tokens.inc(usage["output_tokens"])
+
+
+def record_fallback(task: str) -> None:
+    AI_FALLBACKS.labels(task).inc()
+
+
+def record_sentiment_decision(decision: str) -> None:
+    SENTIMENT_DECISIONS.labels(decision).inc()
+
+
+def record_sentiment_comparison(local: str, bedrock: str) -> None:
+    SENTIMENT_COMPARISONS.labels(local, bedrock).inc()
+
+
+CIRCUIT_STATES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+def record_circuit_state(state: str) -> None:
+    BEDROCK_CIRCUIT_STATE.set(CIRCUIT_STATES[state])
+    BEDROCK_CIRCUIT_TRANSITIONS.labels(state).inc()
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing each HTTP request under its route template."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = "500"
+
+        async def _send(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        in_flight = HTTP_IN_FLIGHT.labels(method)
+        totals = [0, 0.0]
+        token = _request_db.set(totals)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            # Routing writes the matched route into the shared scope.
+            matched = scope.get("route")
+            route = getattr(matched, "path", UNMATCHED_ROUTE)
+            HTTP_REQUEST_SECONDS.labels(method, route, status).observe(time.perf_counter() - started)
+            in_flight.dec()
+            _request_db.reset(token)
+            HTTP_DB_STATEMENTS.labels(method, route).observe(totals[0])
+            HTTP_DB_SECONDS.labels(method, route).observe(totals[1])
@@ -0,0 +1,127 @@
+"""Schema migrations for databases created before a model change.
+
+``Base.metadata.create_all`` only creates missing tables, so anything that
+alters an existing table (indexes, columns, triggers) is applied here. The
+applied version is stored in SQLite's ``PRAGMA user_version``. Every step must
+be idempotent because a fresh database already has the current tables.
+"""
+import logging
+from typing import Callable
+
+from sqlalchemy.engine import Connection, Engine
+
+from .db_models import ReanalysisRun
+from .services import dashboard_stats, data_versions, resolution_stats, search_service, similarity_service
+
+logger = logging.getLogger(__name__)
+
+
+def _add_hot_path_indexes(conn: Connection) -> None:
+    statements = [
+        "CREATE INDEX IF NOT EXISTS ix_check_ins_resolution_created ON check_ins (resolution_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_check_ins_sentiment ON check_ins (sentiment, sentiment_score)",
+        "CREATE INDEX IF NOT EXISTS ix_reminders_active_next_due ON reminders (is_active, next_due)",
+        "CREATE INDEX IF NOT EXISTS ix_resolutions_status ON resolutions (status)",
+        "CREATE INDEX IF NOT EXISTS ix_resolutions_priority_created ON resolutions (priority, created_at DESC)",
+        "CREATE INDEX IF NOT EXISTS ix_ai_jobs_status ON ai_jobs (status)",
+    ]
+    for statement in statements:
+        conn.exec_driver_sql(statement)
+
+
+def _add_dashboard_rollup(conn: Connection) -> None:
+    dashboard_stats.install_triggers(conn)
+    dashboard_stats.rebuild(conn)
+
+
+def _add_similarity_index(conn: Connection) -> None:
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_resolutions_status_category ON resolutions (status, category, priority)"
+    )
+    similarity_service.rebuild_index(conn)
+
+
+def _add_check_in_search(conn: Connection) -> None:
+    search_service.install(conn)
+    search_service.rebuild(conn)
+
+
+def _add_data_versions(conn: Connection) -> None:
+    data_versions.install_triggers(conn)
+    data_versions.rebuild(conn)
+
+
+def _add_reanalysis_runs(conn: Connection) -> None:
+    ReanalysisRun.__table__.create(conn, checkfirst=True)
+
+
+def _add_resolution_stats(conn: Connection) -> None:
+    resolution_stats.install_triggers(conn)
+    resolution_stats.rebuild(conn)
+
+
+def _add_check_in_epoch(conn: Connection) -> None:
+    columns = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(check_ins)")}
+    if "created_epoch" not in columns:
+        conn.exec_driver_sql("ALTER TABLE check_ins ADD COLUMN created_epoch INTEGER")
+    conn.exec_driver_sql(
+        "UPDATE check_ins SET created_epoch = CAST(strftime('%s', created_at) AS INTEGER) WHERE created_epoch IS NULL"
+    )
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_check_ins_created_epoch"
+        " ON check_ins (created_epoch, resolution_id, sentiment, sentiment_score)"
+    )
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_check_ins_resolution_epoch"
+        " ON check_ins (resolution_id, created_epoch, sentiment, sentiment_score)"
+    )
+
+
+def _add_soft_delete(conn: Connection) -> None:
+    columns = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(resolutions)")}
+    if "deleted_at" not in columns:
+        conn.exec_driver_sql("ALTER TABLE resolutions ADD COLUMN deleted_at TEXT")
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_resolutions_deleted ON resolutions (deleted_at) WHERE deleted_at IS NOT NULL"
+    )
+
+
+def _defer_resolution_stats(conn: Connection) -> None:
+    # The check-in triggers gained a WHEN clause; CREATE ... IF NOT EXISTS would keep the old ones.
+    for trigger in resolution_stats.CHECK_IN_TRIGGERS:
+        conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {trigger}")
+    resolution_stats.install_triggers(conn)
+
+
+MIGRATIONS: list[tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "hot path indexes", _add_hot_path_indexes),
+    (2, "dashboard rollup triggers", _add_dashboard_rollup),
+    (3, "resolution similarity index", _add_similarity_index),
+    (4, "check-in full-text search", _add_check_in_search),
+    (5, "data version counters", _add_data_versions),
+    (6, "re-analysis checkpoints", _add_reanalysis_runs),
+    (7, "per-resolution stats rollup", _add_resolution_stats),
+    (8, "check-in epoch column", _add_check_in_epoch),
+    (9, "resolution soft delete", _add_soft_delete),
+    (10, "deferrable resolution stats", _defer_resolution_stats),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: Connection) -> int:
+    return conn.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+def run_migrations(engine: Engine) -> list[int]:
+    applied = []
+    with engine.begin() as conn:
+        current = get_schema_version(conn)
+        for version, name, migrate in MIGRATIONS:
+            if version <= current:
+                continue
+            logger.info("Applying migration %s: %s", version, name)
+            migrate(conn)
+            conn.exec_driver_sql(f"PRAGMA user_version = {version}")
+            applied.append(version)
+    return applied
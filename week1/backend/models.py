@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 
 
@@ -29,8 +29,40 @@ class ResolutionResponse(BaseModel):
     updated_at: str
 
 
+class ResolutionStatsSummary(BaseModel):
+    check_in_count: int = 0
+    current_streak: int = 0
+    longest_streak: int = 0
+    last_check_in_at: Optional[str] = None
+    rolling_sentiment: Optional[float] = None
+    check_ins_this_week: int = 0
+
+
+class ResolutionStatsResponse(ResolutionStatsSummary):
+    resolution_id: int
+    weekly_check_ins: dict[str, int] = {}
+    weekly_adherence: float = 0.0
+
+
+class ResolutionListItem(ResolutionResponse):
+    # Only present with ``include_stats=true``.
+    stats: Optional[ResolutionStatsSummary] = None
+
+
+class ResolutionBatchDelete(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=1000)
+    # Hide the resolutions now and purge them in the background.
+    soft: bool = False
+
+
+class ResolutionBatchDeleteResponse(BaseModel):
+    deleted: list[int]
+    not_found: list[int]
+
+
 class ResolutionDetail(ResolutionResponse):
     check_ins: list["CheckInResponse"] = []
+    check_ins_next_cursor: Optional[str] = None
     reminder: Optional["ReminderResponse"] = None
 
 
@@ -50,6 +82,37 @@ class CheckInResponse(BaseModel):
     created_at: str
 
 
+class CheckInJobStatus(BaseModel):
+    job_id: Optional[int] = None
+    check_in_id: int
+    status: str
+    attempts: int = 0
+    error: Optional[str] = None
+    check_in: CheckInResponse
+
+
+class CheckInBatchItem(BaseModel):
+    resolution_id: int
+    note: str
+    created_at: Optional[str] = None
+
+
+class CheckInBatchCreate(BaseModel):
+    items: list[CheckInBatchItem] = Field(min_length=1, max_length=1000)
+
+
+class CheckInBatchResponse(BaseModel):
+    created: int
+    check_in_ids: list[int]
+
+
+class CheckInSearchResult(CheckInResponse):
+    resolution_title: str
+    note_highlight: str
+    ai_feedback_highlight: Optional[str] = None
+    rank: float
+
+
 # --- Reminders ---
 
 class ReminderUpdate(BaseModel):
@@ -83,3 +146,25 @@ class DashboardSummary(BaseModel):
     average_sentiment_score: Optional[float] = None
     overdue_reminders: int
     sentiment_breakdown: dict[str, int] = {}
+
+
+class SentimentBucket(BaseModel):
+    # First day of the bucket (a Monday for weeks).
+    bucket: str
+    # Only present with the matching ``group_by``.
+    resolution_id: Optional[int] = None
+    category: Optional[str] = None
+    check_ins: int
+    positive: int
+    neutral: int
+    negative: int
+    average_sentiment_score: Optional[float] = None
+
+
+# --- Export / import ---
+
+class ImportSummary(BaseModel):
+    resolutions: int
+    reminders: int
+    check_ins: int
+    ai_jobs: int
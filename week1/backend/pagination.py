@@ -0,0 +1,72 @@
+import base64
+import json
+from typing import Any, Optional, Union
+
+from fastapi import HTTPException
+from sqlalchemy import Row, and_, or_, select
+from sqlalchemy.orm import Session
+
+from .db_models import CheckIn
+from .serialization import CHECK_IN_COLUMNS
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values: Any) -> str:
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _matches(value: Any, kind: Union[type, tuple[type, ...]]) -> bool:
+    # JSON true/false decode to bool, which isinstance would accept as int.
+    return isinstance(value, kind) and not isinstance(value, bool)
+
+
+def decode_cursor(cursor: str, *kinds: Union[type, tuple[type, ...]]) -> list[Any]:
+    """Values of a cursor from ``encode_cursor``, one per entry of ``kinds``.
+
+    Each value must be of its kind (a type or tuple of types, ``type(None)``
+    for null), so a tampered cursor is a 400 rather than a bad comparison.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if (
+        not isinstance(values, list)
+        or len(values) != len(kinds)
+        or not all(_matches(value, kind) for value, kind in zip(values, kinds))
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def check_in_page(
+    db: Session,
+    resolution_id: int,
+    limit: int,
+    cursor: Optional[str] = None,
+) -> tuple[list[Row], Optional[str]]:
+    """Newest-first page of a resolution's check-ins, keyed on (created_at, id).
+
+    Rows hold ``CHECK_IN_COLUMNS``.
+    """
+    query = select(*CHECK_IN_COLUMNS).where(CheckIn.resolution_id == resolution_id)
+    if cursor:
+        created_at, check_in_id = decode_cursor(cursor, str, int)
+        query = query.where(
+            or_(
+                CheckIn.created_at < created_at,
+                and_(CheckIn.created_at == created_at, CheckIn.id < check_in_id),
+            )
+        )
+    rows = db.execute(query.order_by(CheckIn.created_at.desc(), CheckIn.id.desc()).limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return rows, next_cursor
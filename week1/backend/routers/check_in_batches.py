@@ -0,0 +1,91 @@
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from ..database import get_async_db
+from ..db_models import Resolution, CheckIn
+from ..models import CheckInBatchCreate, CheckInBatchResponse
+from ..services import reminder_scheduler, resolution_stats, write_queue
+from ..services.batch_service import analyze_many_async
+from ..services.reminder_service import advance_active_reminder
+
+router = APIRouter(prefix="/api", tags=["check-ins"])
+
+
+def _write_batch(db: Session, rows: list[dict], resolution_ids: list[int]) -> tuple[list[int], dict]:
+    # Back-dated rows would each recompute their resolution's streaks; do it once per resolution instead.
+    with resolution_stats.deferred(db) as touched:
+        ids = db.scalars(insert(CheckIn).returning(CheckIn.id, sort_by_parameter_order=True), rows).all()
+        touched.update(resolution_ids)
+    reminders = {rid: advance_active_reminder(db, rid) for rid in resolution_ids}
+    db.flush()
+    return list(ids), reminders
+
+
+@router.post("/check-ins:batch", response_model=CheckInBatchResponse, status_code=201)
+async def create_check_ins_batch(
+    body: CheckInBatchCreate,
+    db: AsyncSession = Depends(get_async_db),
+) -> CheckInBatchResponse:
+    resolution_ids = sorted({item.resolution_id for item in body.items})
+    found = await db.execute(
+        select(Resolution.id, Resolution.title, Resolution.description)
+        .where(Resolution.id.in_(resolution_ids), Resolution.deleted_at.is_(None))
+    )
+    resolutions = {r.id: r for r in found.all()}
+    missing = [rid for rid in resolution_ids if rid not in resolutions]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Resolutions not found: {missing}")
+
+    now = datetime.utcnow().isoformat()
+    created_at = []
+    for item in body.items:
+        if item.created_at is None:
+            created_at.append(now)
+            continue
+        try:
+            created_at.append(datetime.fromisoformat(item.created_at).isoformat())
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid created_at: {item.created_at}")
+
+    past_by_resolution = {}
+    for rid in resolution_ids:
+        past = (
+            await db.execute(
+                select(CheckIn.note, CheckIn.sentiment, CheckIn.created_at)
+                .where(CheckIn.resolution_id == rid)
+                .order_by(CheckIn.created_at.desc())
+                .limit(5)
+            )
+        ).all()
+        past_by_resolution[rid] = [{"note": r.note, "sentiment": r.sentiment, "created_at": r.created_at} for r in past]
+
+    # End the read transaction so no connection is held during the AI fan-out.
+    await db.rollback()
+
+    ai_results = await analyze_many_async([
+        {
+            "note": item.note,
+            "resolution_title": resolutions[item.resolution_id].title,
+            "resolution_description": resolutions[item.resolution_id].description,
+            "past_check_ins": past_by_resolution[item.resolution_id],
+        }
+        for item in body.items
+    ])
+
+    rows = [
+        {
+            "resolution_id": item.resolution_id,
+            "note": item.note,
+            "sentiment": ai_result["sentiment"],
+            "sentiment_score": ai_result["sentiment_score"],
+            "ai_feedback": ai_result["ai_feedback"],
+            "created_at": item_created_at,
+        }
+        for item, ai_result, item_created_at in zip(body.items, ai_results, created_at)
+    ]
+    ids, reminders = await write_queue.run(db, _write_batch, rows, resolution_ids)
+    for rid, reminder in reminders.items():
+        reminder_scheduler.reschedule(rid, reminder)
+    return CheckInBatchResponse(created=len(ids), check_in_ids=ids)
@@ -1,72 +1,233 @@
+import asyncio
+import json
+import time
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, Depends
+from typing import AsyncIterator, Optional, Union
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from ..database import get_db
-from ..db_models import Resolution, CheckIn, Reminder
-from ..models import CheckInCreate, CheckInResponse
-from ..services.ai_service import analyze_sentiment_and_feedback
-from ..services.reminder_service import advance_next_due
+from ..database import get_async_db, get_async_session_factory
+from ..db_models import Resolution, CheckIn, AiJob, Reminder
+from ..models import CheckInCreate, CheckInResponse, CheckInJobStatus
+from ..pagination import DEFAULT_LIMIT, MAX_LIMIT, NEXT_CURSOR_HEADER, check_in_page
+from ..serialization import CHECK_IN_KEYS, json_response, records
+from ..services import enrichment_service, reminder_scheduler, write_queue
+from ..services.ai_service import (
+    analyze_sentiment_and_feedback,
+    iterate_in_ai_executor,
+    run_in_ai_executor,
+    stream_sentiment_and_feedback,
+)
+from ..services.reminder_service import advance_active_reminder
 
 router = APIRouter(prefix="/api/resolutions/{resolution_id}/check-ins", tags=["check-ins"])
 
+MAX_WAIT_SECONDS = 30.0
+POLL_INTERVAL_SECONDS = 0.25
+
+
+def _job_status(check_in: CheckIn, job: Optional[AiJob]) -> CheckInJobStatus:
+    if job is None:
+        # Check-ins created synchronously never had a job.
+        return CheckInJobStatus(
+            check_in_id=check_in.id,
+            status=enrichment_service.JOB_DONE,
+            check_in=CheckInResponse(**check_in._to_dict()),
+        )
+    return CheckInJobStatus(
+        job_id=job.id,
+        check_in_id=check_in.id,
+        status=job.status,
+        attempts=job.attempts,
+        error=job.error,
+        check_in=CheckInResponse(**check_in._to_dict()),
+    )
+
+
+async def _load_job_status(resolution_id: int, check_in_id: int) -> Optional[CheckInJobStatus]:
+    async with get_async_session_factory()() as session:
+        check_in = (
+            await session.scalars(
+                select(CheckIn).where(CheckIn.id == check_in_id, CheckIn.resolution_id == resolution_id)
+            )
+        ).first()
+        if not check_in:
+            return None
+        job = (await session.scalars(select(AiJob).where(AiJob.check_in_id == check_in_id))).first()
+        return _job_status(check_in, job)
+
+
+async def _ai_context(db: AsyncSession, resolution: Resolution, note: str) -> dict:
+    past = (
+        await db.execute(
+            select(CheckIn.note, CheckIn.sentiment, CheckIn.created_at)
+            .where(CheckIn.resolution_id == resolution.id)
+            .order_by(CheckIn.created_at.desc())
+            .limit(5)
+        )
+    ).all()
+    context = {
+        "note": note,
+        "resolution_title": resolution.title,
+        "resolution_description": resolution.description,
+        "past_check_ins": [{"note": r.note, "sentiment": r.sentiment, "created_at": r.created_at} for r in past],
+    }
+    # Release the connection while waiting on the model.
+    await db.rollback()
+    return context
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _resolution_exists(db: AsyncSession, resolution_id: int) -> bool:
+    return (await db.scalar(
+        select(Resolution.id).where(Resolution.id == resolution_id, Resolution.deleted_at.is_(None))
+    )) is not None
+
 
 @router.get("", response_model=list[CheckInResponse])
-def list_check_ins(resolution_id: int, db: Session = Depends(get_db)) -> list[CheckInResponse]:
-    resolution = db.query(Resolution).filter(Resolution.id == resolution_id).first()
-    if not resolution:
+async def list_check_ins(
+    resolution_id: int,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    if not await _resolution_exists(db, resolution_id):
         raise HTTPException(status_code=404, detail="Resolution not found")
 
-    rows = (
-        db.query(CheckIn)
-        .filter(CheckIn.resolution_id == resolution_id)
-        .order_by(CheckIn.created_at.desc())
-        .all()
-    )
-    return [CheckInResponse(**r._to_dict()) for r in rows]
+    rows, next_cursor = await db.run_sync(check_in_page, resolution_id, limit, cursor)
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return json_response(records(CHECK_IN_KEYS, rows), headers)
 
 
-@router.post("", response_model=CheckInResponse, status_code=201)
-def create_check_in(resolution_id: int, body: CheckInCreate, db: Session = Depends(get_db)) -> CheckInResponse:
-    resolution = db.query(Resolution).filter(Resolution.id == resolution_id).first()
-    if not resolution:
+@router.post("", response_model=Union[CheckInResponse, CheckInJobStatus], status_code=201)
+async def create_check_in(
+    resolution_id: int,
+    body: CheckInCreate,
+    response: Response,
+    defer: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+) -> Union[CheckInResponse, CheckInJobStatus]:
+    resolution = await db.get(Resolution, resolution_id)
+    if not resolution or resolution.deleted_at:
         raise HTTPException(status_code=404, detail="Resolution not found")
 
-    past = (
-        db.query(CheckIn.note, CheckIn.sentiment, CheckIn.created_at)
-        .filter(CheckIn.resolution_id == resolution_id)
-        .order_by(CheckIn.created_at.desc())
-        .limit(5)
-        .all()
-    )
-    past_list = [{"note": r.note, "sentiment": r.sentiment, "created_at": r.created_at} for r in past]
+    if defer:
+        return await _create_deferred_check_in(resolution_id, body, response, db)
 
-    ai_result = analyze_sentiment_and_feedback(
-        note=body.note,
-        resolution_title=resolution.title,
-        resolution_description=resolution.description,
-        past_check_ins=past_list,
-    )
+    ai_context = await _ai_context(db, resolution, body.note)
+    # Someone is waiting on this answer, so the feedback is always written by the model.
+    ai_result = await run_in_ai_executor(analyze_sentiment_and_feedback, **ai_context, require_feedback=True)
 
-    now = datetime.utcnow().isoformat()
+    check_in = await _save_check_in(db, resolution_id, body.note, ai_result)
+    return CheckInResponse(**check_in._to_dict())
+
+
+def _write_check_in(db: Session, resolution_id: int, note: str, ai_result: dict) -> tuple[CheckIn, Optional[Reminder]]:
     check_in = CheckIn(
         resolution_id=resolution_id,
-        note=body.note,
+        note=note,
         sentiment=ai_result["sentiment"],
         sentiment_score=ai_result["sentiment_score"],
         ai_feedback=ai_result["ai_feedback"],
-        created_at=now,
+        created_at=datetime.utcnow().isoformat(),
     )
     db.add(check_in)
+    reminder = advance_active_reminder(db, resolution_id)
+    db.flush()
+    return check_in, reminder
+
+
+async def _save_check_in(db: AsyncSession, resolution_id: int, note: str, ai_result: dict) -> CheckIn:
+    check_in, reminder = await write_queue.run(db, _write_check_in, resolution_id, note, ai_result)
+    reminder_scheduler.reschedule(resolution_id, reminder)
+    return check_in
+
+
+@router.post("/stream")
+async def create_check_in_stream(
+    resolution_id: int,
+    body: CheckInCreate,
+    db: AsyncSession = Depends(get_async_db),
+) -> StreamingResponse:
+    resolution = await db.get(Resolution, resolution_id)
+    if not resolution or resolution.deleted_at:
+        raise HTTPException(status_code=404, detail="Resolution not found")
+    ai_context = await _ai_context(db, resolution, body.note)
 
-    reminder = (
-        db.query(Reminder)
-        .filter(Reminder.resolution_id == resolution_id, Reminder.is_active == 1)
-        .first()
+    async def _events() -> AsyncIterator[str]:
+        ai_result = None
+        async for event in iterate_in_ai_executor(stream_sentiment_and_feedback, **ai_context, require_feedback=True):
+            if event["type"] == "delta":
+                yield _sse("feedback", {"text": event["text"]})
+            else:
+                ai_result = event["result"]
+
+        # The request-scoped session may already be closed once streaming starts.
+        async with get_async_session_factory()() as session:
+            check_in = await _save_check_in(session, resolution_id, body.note, ai_result)
+        yield _sse("check_in", CheckInResponse(**check_in._to_dict()).model_dump())
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    if reminder:
-        new_due = advance_next_due(reminder.next_due, reminder.frequency)
-        reminder.next_due = new_due
 
-    db.commit()
-    db.refresh(check_in)
-    return CheckInResponse(**check_in._to_dict())
+
+def _write_deferred_check_in(db: Session, resolution_id: int, note: str) -> tuple[CheckIn, AiJob, Optional[Reminder]]:
+    now = datetime.utcnow().isoformat()
+    check_in = CheckIn(resolution_id=resolution_id, note=note, created_at=now)
+    db.add(check_in)
+    db.flush()
+
+    job = AiJob(
+        check_in_id=check_in.id,
+        status=enrichment_service.JOB_PENDING,
+        attempts=0,
+        created_at=now,
+        updated_at=now,
+    )
+    db.add(job)
+    reminder = advance_active_reminder(db, resolution_id)
+    db.flush()
+    return check_in, job, reminder
+
+
+async def _create_deferred_check_in(
+    resolution_id: int,
+    body: CheckInCreate,
+    response: Response,
+    db: AsyncSession,
+) -> CheckInJobStatus:
+    check_in, job, reminder = await write_queue.run(db, _write_deferred_check_in, resolution_id, body.note)
+    reminder_scheduler.reschedule(resolution_id, reminder)
+
+    status = _job_status(check_in, job)
+    enrichment_service.enqueue(job.id)
+
+    response.status_code = 202
+    response.headers["Location"] = f"/api/resolutions/{resolution_id}/check-ins/{check_in.id}/status"
+    return status
+
+
+@router.get("/{check_in_id}/status", response_model=CheckInJobStatus)
+async def get_check_in_status(
+    resolution_id: int,
+    check_in_id: int,
+    wait: float = Query(0.0, ge=0.0, le=MAX_WAIT_SECONDS),
+) -> CheckInJobStatus:
+    # Sessions are opened per poll so a long-poll never pins a connection.
+    deadline = time.monotonic() + wait
+    while True:
+        status = await _load_job_status(resolution_id, check_in_id)
+        if status is None:
+            raise HTTPException(status_code=404, detail="Check-in not found")
+        finished = status.status in (enrichment_service.JOB_DONE, enrichment_service.JOB_FAILED)
+        if finished or time.monotonic() >= deadline:
+            return status
+        await asyncio.sleep(POLL_INTERVAL_SECONDS)
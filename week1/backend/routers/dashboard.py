@@ -1,50 +1,88 @@
+import json
 from datetime import date
-from fastapi import APIRouter, Depends
-from sqlalchemy import func
-from sqlalchemy.orm import Session
-from ..database import get_db
-from ..db_models import Resolution, CheckIn, Reminder
-from ..models import DashboardSummary
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_async_db
+from ..http_cache import cached_json
+from ..db_models import Resolution, Reminder, DashboardStats
+from ..models import DashboardSummary, SentimentBucket
+from ..serialization import json_response
+from ..services import dashboard_stats
+from ..services.data_versions import GLOBAL_SCOPE
+from ..services.sentiment_analytics import sentiment_series
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
 
 @router.get("/summary", response_model=DashboardSummary)
-def get_dashboard_summary(db: Session = Depends(get_db)) -> DashboardSummary:
-    total = db.query(func.count(Resolution.id)).scalar()
-    active = db.query(func.count(Resolution.id)).filter(Resolution.status == "active").scalar()
-    completed = db.query(func.count(Resolution.id)).filter(Resolution.status == "completed").scalar()
-    abandoned = db.query(func.count(Resolution.id)).filter(Resolution.status == "abandoned").scalar()
-
-    total_check_ins = db.query(func.count(CheckIn.id)).scalar()
-
-    avg_sentiment = db.query(func.avg(CheckIn.sentiment_score)).filter(CheckIn.sentiment_score.isnot(None)).scalar()
-    if avg_sentiment is not None:
-        avg_sentiment = round(avg_sentiment, 2)
-
-    sentiment_rows = (
-        db.query(CheckIn.sentiment, func.count(CheckIn.id))
-        .filter(CheckIn.sentiment.isnot(None))
-        .group_by(CheckIn.sentiment)
-        .all()
-    )
-    sentiment_breakdown = {row[0]: row[1] for row in sentiment_rows}
-
+async def get_dashboard_summary(request: Request, db: AsyncSession = Depends(get_async_db)) -> Response:
+    # Overdue counts change with the date as well as with the data.
     today = date.today().isoformat()
-    overdue = (
-        db.query(func.count(Reminder.id))
+    return await cached_json(request, db, lambda: _dashboard_summary(today, db), extra=(today,))
+
+
+async def _dashboard_summary(today: str, db: AsyncSession) -> Response:
+    stats = await db.get(DashboardStats, dashboard_stats.STATS_ID)
+
+    avg_sentiment = None
+    if stats and stats.sentiment_score_count:
+        avg_sentiment = round(stats.sentiment_score_sum / stats.sentiment_score_count, 2)
+
+    # Overdue depends on today's date, so it cannot be rolled up; it is an indexed count.
+    overdue = await db.scalar(
+        select(func.count(Reminder.id))
         .join(Resolution, Reminder.resolution_id == Resolution.id)
-        .filter(Reminder.is_active == 1, Reminder.next_due <= today, Resolution.status == "active")
-        .scalar()
+        .where(
+            Reminder.is_active == 1,
+            Reminder.next_due <= today,
+            Resolution.status == "active",
+            Resolution.deleted_at.is_(None),
+        )
     )
 
-    return DashboardSummary(
-        total_resolutions=total,
-        active_resolutions=active,
-        completed_resolutions=completed,
-        abandoned_resolutions=abandoned,
-        total_check_ins=total_check_ins,
+    summary = DashboardSummary(
+        total_resolutions=stats.total_resolutions if stats else 0,
+        active_resolutions=stats.active_resolutions if stats else 0,
+        completed_resolutions=stats.completed_resolutions if stats else 0,
+        abandoned_resolutions=stats.abandoned_resolutions if stats else 0,
+        total_check_ins=stats.total_check_ins if stats else 0,
         average_sentiment_score=avg_sentiment,
         overdue_reminders=overdue,
-        sentiment_breakdown=sentiment_breakdown,
+        sentiment_breakdown=json.loads(stats.sentiment_histogram) if stats else {},
     )
+    return json_response(summary.model_dump())
+
+
+def _parse_date(value: Optional[str], name: str) -> Optional[date]:
+    if value is None:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name}: {value}")
+
+
+@router.get("/sentiment", response_model=list[SentimentBucket])
+async def get_sentiment_over_time(
+    request: Request,
+    bucket: Literal["day", "week", "month"] = "week",
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    resolution_id: Optional[int] = None,
+    category: Optional[str] = None,
+    group_by: Optional[Literal["resolution", "category"]] = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    start = _parse_date(date_from, "date_from")
+    end = _parse_date(date_to, "date_to")
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="date_from is after date_to")
+
+    async def build() -> Response:
+        return json_response(await db.run_sync(
+            sentiment_series, bucket, start, end, resolution_id=resolution_id, category=category, group_by=group_by
+        ))
+
+    return await cached_json(request, db, build, scope=resolution_id if resolution_id is not None else GLOBAL_SCOPE)
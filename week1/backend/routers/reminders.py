@@ -1,45 +1,83 @@
+import asyncio
+import json
 from datetime import date
-from fastapi import APIRouter, HTTPException, Depends
+from typing import AsyncIterator, Optional
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from ..database import get_db
+from ..database import get_async_db
 from ..db_models import Resolution, Reminder
 from ..models import ReminderUpdate, ReminderResponse, DueReminder
+from ..serialization import DUE_REMINDER_COLUMNS, DUE_REMINDER_KEYS, json_response, records
+from ..services import reminder_scheduler, write_queue
 from ..services.reminder_service import advance_next_due
 
 router = APIRouter(tags=["reminders"])
 
+HEARTBEAT_SECONDS = 15.0
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 
 @router.get("/api/reminders/due", response_model=list[DueReminder])
-def get_due_reminders(db: Session = Depends(get_db)) -> list[DueReminder]:
+async def get_due_reminders(db: AsyncSession = Depends(get_async_db)) -> Response:
+    if reminder_scheduler.is_running():
+        return json_response(reminder_scheduler.due())
+
+    # Without the lifespan scheduler (scripts, tests) fall back to scanning.
     today = date.today().isoformat()
     rows = (
-        db.query(Reminder, Resolution.title)
-        .join(Resolution, Reminder.resolution_id == Resolution.id)
-        .filter(Reminder.is_active == 1, Reminder.next_due <= today, Resolution.status == "active")
-        .order_by(Reminder.next_due.asc())
-        .all()
-    )
-    return [
-        DueReminder(
-            resolution_id=r.Reminder.resolution_id,
-            resolution_title=r.title,
-            frequency=r.Reminder.frequency,
-            next_due=r.Reminder.next_due,
+        await db.execute(
+            select(*DUE_REMINDER_COLUMNS)
+            .join(Resolution, Reminder.resolution_id == Resolution.id)
+            .where(
+                Reminder.is_active == 1,
+                Reminder.next_due <= today,
+                Resolution.status == "active",
+                Resolution.deleted_at.is_(None),
+            )
+            .order_by(Reminder.next_due.asc())
         )
-        for r in rows
-    ]
+    ).all()
+    return json_response(records(DUE_REMINDER_KEYS, rows))
 
 
-@router.put("/api/resolutions/{resolution_id}/reminder", response_model=ReminderResponse)
-def update_reminder(resolution_id: int, body: ReminderUpdate, db: Session = Depends(get_db)) -> ReminderResponse:
-    if body.frequency not in ("daily", "weekly", "biweekly", "monthly"):
-        raise HTTPException(status_code=400, detail="Invalid frequency")
+@router.get("/api/reminders/events")
+async def stream_reminder_events(request: Request) -> StreamingResponse:
+    if not reminder_scheduler.is_running():
+        raise HTTPException(status_code=503, detail="Reminder scheduler is not running")
+    queue = reminder_scheduler.subscribe()
 
-    resolution = db.query(Resolution).filter(Resolution.id == resolution_id).first()
-    if not resolution:
-        raise HTTPException(status_code=404, detail="Resolution not found")
+    async def _events() -> AsyncIterator[str]:
+        try:
+            yield _sse("snapshot", reminder_scheduler.due())
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                yield _sse(event["event"], event["data"])
+        finally:
+            reminder_scheduler.unsubscribe(queue)
 
-    reminder = db.query(Reminder).filter(Reminder.resolution_id == resolution_id).first()
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _write_reminder(db: Session, resolution_id: int, body: ReminderUpdate) -> Optional[tuple[Resolution, Reminder]]:
+    resolution = db.get(Resolution, resolution_id)
+    if not resolution or resolution.deleted_at:
+        return None
+
+    reminder = db.scalars(select(Reminder).where(Reminder.resolution_id == resolution_id)).first()
 
     if reminder:
         new_due = advance_next_due(reminder.next_due, body.frequency)
@@ -55,7 +93,22 @@ def update_reminder(resolution_id: int, body: ReminderUpdate, db: Session = Depe
             is_active=int(body.is_active),
         )
         db.add(reminder)
+    db.flush()
+    return resolution, reminder
 
-    db.commit()
-    db.refresh(reminder)
+
+@router.put("/api/resolutions/{resolution_id}/reminder", response_model=ReminderResponse)
+async def update_reminder(
+    resolution_id: int,
+    body: ReminderUpdate,
+    db: AsyncSession = Depends(get_async_db),
+) -> ReminderResponse:
+    if body.frequency not in ("daily", "weekly", "biweekly", "monthly"):
+        raise HTTPException(status_code=400, detail="Invalid frequency")
+
+    result = await write_queue.run(db, _write_reminder, resolution_id, body)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Resolution not found")
+    resolution, reminder = result
+    reminder_scheduler.track(resolution_id, resolution.title, resolution.status, reminder)
     return ReminderResponse(**reminder._to_dict())
@@ -1,36 +1,113 @@
 from datetime import datetime, date, timedelta
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session, selectinload
-from ..database import get_db
-from ..db_models import Resolution, Reminder
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+import orjson
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from ..database import get_async_db
+from ..http_cache import cached_json
+from ..db_models import Resolution, Reminder, ResolutionStats
 from ..models import (
+    ResolutionBatchDelete,
+    ResolutionBatchDeleteResponse,
     ResolutionCreate,
     ResolutionUpdate,
     ResolutionResponse,
     ResolutionDetail,
-    CheckInResponse,
-    ReminderResponse,
+    ResolutionListItem,
+    ResolutionStatsResponse,
 )
-from ..services.ai_service import categorize_and_prioritize
+from ..pagination import (
+    DEFAULT_LIMIT,
+    MAX_LIMIT,
+    NEXT_CURSOR_HEADER,
+    check_in_page,
+    decode_cursor,
+    encode_cursor,
+)
+from ..serialization import (
+    CHECK_IN_KEYS,
+    REMINDER_COLUMNS,
+    REMINDER_KEYS,
+    RESOLUTION_COLUMNS,
+    RESOLUTION_KEYS,
+    json_response,
+    keys,
+    record,
+    records,
+)
+from ..services import deletion_service, reminder_scheduler, resolution_stats, write_queue
+from ..services.ai_service import categorize_and_prioritize, run_in_ai_executor
+from ..services.similarity_service import category_stats, find_similar, index_resolution
 
 router = APIRouter(prefix="/api/resolutions", tags=["resolutions"])
 
+STATS_SUMMARY_KEYS = keys(resolution_stats.summary_columns(date.today()))
 
-@router.get("", response_model=list[ResolutionResponse])
-def list_resolutions(db: Session = Depends(get_db)) -> list[ResolutionResponse]:
-    rows = db.query(Resolution).order_by(Resolution.priority.asc(), Resolution.created_at.desc()).all()
-    return [ResolutionResponse(**r._to_dict()) for r in rows]
+DETAIL_CHECK_INS_LIMIT = 20
 
 
-@router.post("", response_model=ResolutionResponse, status_code=201)
-def create_resolution(body: ResolutionCreate, db: Session = Depends(get_db)) -> ResolutionResponse:
-    now = datetime.utcnow().isoformat()
+def _after_resolution(priority: Optional[int], created_at: str, resolution_id: int):
+    # Keyset predicate for ORDER BY priority ASC (NULLs first), created_at DESC, id ASC.
+    same_priority = Resolution.priority.is_(None) if priority is None else Resolution.priority == priority
+    later_priority = Resolution.priority.isnot(None) if priority is None else Resolution.priority > priority
+    return or_(
+        later_priority,
+        and_(
+            same_priority,
+            or_(
+                Resolution.created_at < created_at,
+                and_(Resolution.created_at == created_at, Resolution.id > resolution_id),
+            ),
+        ),
+    )
+
 
-    existing = db.query(Resolution.title, Resolution.category, Resolution.priority).all()
-    existing_list = [{"title": r.title, "category": r.category, "priority": r.priority} for r in existing]
+async def _list_resolutions(limit: int, cursor: Optional[str], stats_as_of: Optional[date], db: AsyncSession) -> Response:
+    query = select(*RESOLUTION_COLUMNS).where(Resolution.deleted_at.is_(None))
+    if stats_as_of is not None:
+        # One join, not a lookup per row.
+        stats_columns = resolution_stats.summary_columns(stats_as_of)
+        query = query.add_columns(*stats_columns).outerjoin(ResolutionStats, ResolutionStats.resolution_id == Resolution.id)
+    if cursor:
+        query = query.where(_after_resolution(*decode_cursor(cursor, (int, type(None)), str, int)))
+    query = query.order_by(Resolution.priority.asc(), Resolution.created_at.desc(), Resolution.id.asc())
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    headers = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        headers = {NEXT_CURSOR_HEADER: encode_cursor(last.priority, last.created_at, last.id)}
+    if stats_as_of is None:
+        return json_response(records(RESOLUTION_KEYS, rows), headers)
 
-    ai_result = categorize_and_prioritize(body.title, body.description, existing_list)
+    width = len(RESOLUTION_KEYS)
+    items = []
+    for row in rows:
+        item = record(RESOLUTION_KEYS, row)
+        item["stats"] = record(STATS_SUMMARY_KEYS, row[width:]) if row.check_in_count is not None else None
+        items.append(item)
+    return json_response(items, headers)
 
+
+@router.get("", response_model=list[ResolutionListItem])
+async def list_resolutions(
+    request: Request,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
+    include_stats: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    if not include_stats:
+        return await cached_json(request, db, lambda: _list_resolutions(limit, cursor, None, db))
+    # Streaks lapse with the date as well as with the data.
+    today = datetime.utcnow().date()
+    return await cached_json(request, db, lambda: _list_resolutions(limit, cursor, today, db), extra=(today,))
+
+
+def _write_resolution(db: Session, body: ResolutionCreate, ai_result: dict) -> tuple[Resolution, Reminder]:
+    now = datetime.utcnow().isoformat()
     resolution = Resolution(
         title=body.title,
         description=body.description,
@@ -43,62 +120,151 @@ def create_resolution(body: ResolutionCreate, db: Session = Depends(get_db)) ->
     )
     db.add(resolution)
     db.flush()
+    index_resolution(db, resolution.id, resolution.title, resolution.description)
 
-    next_due = (date.today() + timedelta(weeks=1)).isoformat()
     reminder = Reminder(
         resolution_id=resolution.id,
         frequency="weekly",
-        next_due=next_due,
+        next_due=(date.today() + timedelta(weeks=1)).isoformat(),
         is_active=1,
     )
     db.add(reminder)
-    db.commit()
-    db.refresh(resolution)
+    db.flush()
+    return resolution, reminder
+
+
+@router.post("", response_model=ResolutionResponse, status_code=201)
+async def create_resolution(body: ResolutionCreate, db: AsyncSession = Depends(get_async_db)) -> ResolutionResponse:
+    similar = await db.run_sync(find_similar, body.title, body.description)
+    stats = await db.run_sync(category_stats)
+    # Release the connection while waiting on the model.
+    await db.rollback()
+
+    ai_result = await run_in_ai_executor(categorize_and_prioritize, body.title, body.description, similar, stats)
+
+    resolution, reminder = await write_queue.run(db, _write_resolution, body, ai_result)
+    reminder_scheduler.track(resolution.id, resolution.title, resolution.status, reminder)
 
     return ResolutionResponse(**resolution._to_dict())
 
 
-@router.get("/{resolution_id}", response_model=ResolutionDetail)
-def get_resolution(resolution_id: int, db: Session = Depends(get_db)) -> ResolutionDetail:
-    resolution = (
-        db.query(Resolution)
-        .options(selectinload(Resolution.check_ins), selectinload(Resolution.reminder))
-        .filter(Resolution.id == resolution_id)
-        .first()
-    )
+async def _get_resolution(resolution_id: int, check_ins_limit: int, db: AsyncSession) -> Response:
+    resolution = (await db.execute(
+        select(*RESOLUTION_COLUMNS).where(Resolution.id == resolution_id, Resolution.deleted_at.is_(None))
+    )).first()
     if not resolution:
         raise HTTPException(status_code=404, detail="Resolution not found")
+    reminder = (await db.execute(select(*REMINDER_COLUMNS).where(Reminder.resolution_id == resolution_id))).first()
+
+    # Only the newest page is embedded; older ones come from the check-ins list endpoint.
+    check_ins, next_cursor = await db.run_sync(check_in_page, resolution_id, check_ins_limit)
+    detail = record(RESOLUTION_KEYS, resolution)
+    detail["check_ins"] = records(CHECK_IN_KEYS, check_ins)
+    detail["check_ins_next_cursor"] = next_cursor
+    detail["reminder"] = record(REMINDER_KEYS, reminder) if reminder else None
+    return json_response(detail)
+
 
-    return ResolutionDetail(
-        **resolution._to_dict(),
-        check_ins=[CheckInResponse(**c._to_dict()) for c in sorted(resolution.check_ins, key=lambda x: x.created_at, reverse=True)],
-        reminder=ReminderResponse(**resolution.reminder._to_dict()) if resolution.reminder else None,
+@router.get("/{resolution_id}", response_model=ResolutionDetail)
+async def get_resolution(
+    request: Request,
+    resolution_id: int,
+    check_ins_limit: int = Query(DETAIL_CHECK_INS_LIMIT, ge=1, le=MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    return await cached_json(
+        request, db, lambda: _get_resolution(resolution_id, check_ins_limit, db), scope=resolution_id
     )
 
 
-@router.put("/{resolution_id}", response_model=ResolutionResponse)
-def update_resolution(resolution_id: int, body: ResolutionUpdate, db: Session = Depends(get_db)) -> ResolutionResponse:
-    resolution = db.query(Resolution).filter(Resolution.id == resolution_id).first()
-    if not resolution:
+async def _get_resolution_stats(resolution_id: int, today: date, db: AsyncSession) -> Response:
+    row = (await db.execute(
+        select(
+            Resolution.created_at.label("resolution_created_at"),
+            ResolutionStats.weekly_check_ins,
+            *resolution_stats.summary_columns(today),
+        )
+        .outerjoin(ResolutionStats, ResolutionStats.resolution_id == Resolution.id)
+        .where(Resolution.id == resolution_id, Resolution.deleted_at.is_(None))
+    )).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Resolution not found")
+    stats = ResolutionStatsResponse(resolution_id=resolution_id).model_dump()
+    if row.check_in_count is not None:
+        stats.update(record(STATS_SUMMARY_KEYS, row[2:]))
+        stats["weekly_check_ins"] = orjson.loads(row.weekly_check_ins)
+        stats["weekly_adherence"] = resolution_stats.weekly_adherence(
+            stats["weekly_check_ins"], row.resolution_created_at, today
+        )
+    return json_response(stats)
 
-    updates = body.model_dump(exclude_unset=True)
-    if not updates:
-        raise HTTPException(status_code=400, detail="No fields to update")
+
+@router.get("/{resolution_id}/stats", response_model=ResolutionStatsResponse)
+async def get_resolution_stats(
+    request: Request, resolution_id: int, db: AsyncSession = Depends(get_async_db)
+) -> Response:
+    today = datetime.utcnow().date()
+    return await cached_json(
+        request, db, lambda: _get_resolution_stats(resolution_id, today, db), scope=resolution_id, extra=(today,)
+    )
+
+
+def _write_update_resolution(
+    db: Session, resolution_id: int, updates: dict
+) -> Optional[tuple[Resolution, Optional[Reminder]]]:
+    resolution = db.get(Resolution, resolution_id)
+    if not resolution or resolution.deleted_at:
+        return None
 
     for key, value in updates.items():
         setattr(resolution, key, value)
     resolution.updated_at = datetime.utcnow().isoformat()
+    if "title" in updates or "description" in updates:
+        index_resolution(db, resolution.id, resolution.title, resolution.description)
+    db.flush()
+
+    reminder = db.scalars(select(Reminder).where(Reminder.resolution_id == resolution_id)).first()
+    return resolution, reminder
+
 
-    db.commit()
-    db.refresh(resolution)
+@router.put("/{resolution_id}", response_model=ResolutionResponse)
+async def update_resolution(
+    resolution_id: int,
+    body: ResolutionUpdate,
+    db: AsyncSession = Depends(get_async_db),
+) -> ResolutionResponse:
+    updates = body.model_dump(exclude_unset=True)
+    if not updates:
+        raise HTTPException(status_code=400, detail="No fields to update")
+
+    result = await write_queue.run(db, _write_update_resolution, resolution_id, updates)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Resolution not found")
+    resolution, reminder = result
+    if "title" in updates or "status" in updates:
+        reminder_scheduler.track(resolution.id, resolution.title, resolution.status, reminder)
     return ResolutionResponse(**resolution._to_dict())
 
 
+async def _delete(db: AsyncSession, resolution_ids: list[int], soft: bool) -> list[int]:
+    deleted = await write_queue.run(db, deletion_service.delete_resolutions, resolution_ids, soft)
+    for resolution_id in deleted:
+        reminder_scheduler.discard(resolution_id)
+    if soft and deleted:
+        deletion_service.schedule_purge()
+    return deleted
+
+
+@router.post(":batch-delete", response_model=ResolutionBatchDeleteResponse)
+async def delete_resolutions(
+    body: ResolutionBatchDelete, db: AsyncSession = Depends(get_async_db)
+) -> ResolutionBatchDeleteResponse:
+    deleted = await _delete(db, body.ids, body.soft)
+    not_found = sorted(set(body.ids) - set(deleted))
+    return ResolutionBatchDeleteResponse(deleted=deleted, not_found=not_found)
+
+
 @router.delete("/{resolution_id}", status_code=204)
-def delete_resolution(resolution_id: int, db: Session = Depends(get_db)) -> None:
-    resolution = db.query(Resolution).filter(Resolution.id == resolution_id).first()
-    if not resolution:
+async def delete_resolution(resolution_id: int, soft: bool = False, db: AsyncSession = Depends(get_async_db)) -> None:
+    if not await _delete(db, [resolution_id], soft):
         raise HTTPException(status_code=404, detail="Resolution not found")
-    db.delete(resolution)
-    db.commit()
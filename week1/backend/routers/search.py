@@ -0,0 +1,49 @@
+from datetime import date, timedelta
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_async_db
+from ..models import CheckInSearchResult
+from ..pagination import DEFAULT_LIMIT, MAX_LIMIT, NEXT_CURSOR_HEADER
+from ..services.search_service import search
+
+router = APIRouter(prefix="/api", tags=["search"])
+
+
+def _parse_date(value: Optional[str], name: str) -> Optional[date]:
+    if value is None:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name}: {value}")
+
+
+@router.get("/search", response_model=list[CheckInSearchResult])
+async def search_check_ins(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    resolution_id: Optional[int] = None,
+    sentiment: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> list[CheckInSearchResult]:
+    start = _parse_date(date_from, "date_from")
+    end = _parse_date(date_to, "date_to")
+    # created_at is an ISO timestamp, so the inclusive end date becomes an exclusive next-day bound.
+    rows, next_cursor = await db.run_sync(
+        search,
+        q,
+        limit,
+        cursor,
+        resolution_id=resolution_id,
+        sentiment=sentiment,
+        created_from=start.isoformat() if start else None,
+        created_to=(end + timedelta(days=1)).isoformat() if end else None,
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return [CheckInSearchResult(**r) for r in rows]
@@ -0,0 +1,70 @@
+import asyncio
+from typing import Any, AsyncIterator
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from ..database import _get_engine, get_async_session_factory
+from ..models import ImportSummary
+from ..services import reminder_scheduler
+from ..services.transfer_service import (
+    IMPORT_CHUNK_SIZE,
+    ImportFormatError,
+    Importer,
+    abort_message,
+    export_lines_async,
+    parse_line,
+)
+
+router = APIRouter(prefix="/api", tags=["transfer"])
+
+
+@router.get("/export")
+async def export_data() -> StreamingResponse:
+    async def _body() -> AsyncIterator[bytes]:
+        # The session lives as long as the stream, so every table comes from one snapshot.
+        async with get_async_session_factory()() as session:
+            async for block in export_lines_async(session):
+                yield block
+
+    return StreamingResponse(
+        _body(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="export.ndjson"'},
+    )
+
+
+async def _request_lines(request: Request) -> AsyncIterator[bytes]:
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+@router.post("/import", response_model=ImportSummary)
+async def import_data(request: Request, skip_ai: bool = False) -> ImportSummary:
+    importer = Importer(_get_engine().begin, skip_ai=skip_ai)
+    chunk: list[dict[str, Any]] = []
+    line_no = 0
+    try:
+        async for line in _request_lines(request):
+            line_no += 1
+            record = parse_line(line, line_no)
+            if record is None:
+                continue
+            chunk.append(record)
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                await asyncio.to_thread(importer.load_chunk, chunk)
+                chunk = []
+        if chunk:
+            await asyncio.to_thread(importer.load_chunk, chunk)
+    except (ImportFormatError, IntegrityError) as exc:
+        raise HTTPException(status_code=400, detail=abort_message(exc, line_no, importer.counts))
+    finally:
+        if reminder_scheduler.is_running():
+            await asyncio.to_thread(reminder_scheduler.load)
+
+    return ImportSummary(**importer.counts)
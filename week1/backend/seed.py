@@ -1,6 +1,8 @@
+import json
 from datetime import datetime, date, timedelta
 from .database import get_session_factory
-from .db_models import Resolution, Reminder
+from .db_models import Resolution
+from .services.transfer_service import import_lines
 
 SEED_RESOLUTIONS = [
     {
@@ -43,35 +45,17 @@ SEED_RESOLUTIONS = [
 
 def seed_if_empty() -> None:
     session = get_session_factory()()
-    count = session.query(Resolution).count()
-    if count > 0:
+    try:
+        if session.query(Resolution.id).first() is not None:
+            return
+    finally:
         session.close()
-        return
 
     now = datetime.utcnow().isoformat()
     next_due = (date.today() + timedelta(weeks=1)).isoformat()
 
-    for r in SEED_RESOLUTIONS:
-        resolution = Resolution(
-            title=r["title"],
-            description=r["description"],
-            category=r["category"],
-            priority=r["priority"],
-            target_date=r["target_date"],
-            status="active",
-            created_at=now,
-            updated_at=now,
-        )
-        session.add(resolution)
-        session.flush()
-
-        reminder = Reminder(
-            resolution_id=resolution.id,
-            frequency="weekly",
-            next_due=next_due,
-            is_active=1,
-        )
-        session.add(reminder)
-
-    session.commit()
-    session.close()
+    records = []
+    for source_id, r in enumerate(SEED_RESOLUTIONS, start=1):
+        records.append({"type": "resolution", "id": source_id, **r, "status": "active", "created_at": now})
+        records.append({"type": "reminder", "resolution_id": source_id, "frequency": "weekly", "next_due": next_due})
+    import_lines((json.dumps(record) for record in records), skip_ai=True)
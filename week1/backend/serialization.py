@@ -0,0 +1,72 @@
+"""Fast JSON path for the hot read endpoints.
+
+The list, detail and due-reminder endpoints select exactly the response
+columns with Core queries and encode the row tuples straight to bytes with
+orjson. That skips ORM instances, ``_to_dict`` and the Pydantic model plus
+``response_model`` round trip. The routes keep ``response_model`` for the
+OpenAPI schema; returning a ``Response`` bypasses its validation. Because of
+that, each column list here must produce exactly its model's fields.
+"""
+from typing import Any, Iterable, Optional, Sequence
+
+import orjson
+from fastapi import Response
+from sqlalchemy import Boolean, type_coerce
+
+from .db_models import CheckIn, Reminder, Resolution
+
+RESOLUTION_COLUMNS = (
+    Resolution.id,
+    Resolution.title,
+    Resolution.description,
+    Resolution.category,
+    Resolution.priority,
+    Resolution.target_date,
+    Resolution.status,
+    Resolution.created_at,
+    Resolution.updated_at,
+)
+CHECK_IN_COLUMNS = (
+    CheckIn.id,
+    CheckIn.resolution_id,
+    CheckIn.note,
+    CheckIn.sentiment,
+    CheckIn.sentiment_score,
+    CheckIn.ai_feedback,
+    CheckIn.created_at,
+)
+REMINDER_COLUMNS = (
+    Reminder.id,
+    Reminder.resolution_id,
+    Reminder.frequency,
+    Reminder.next_due,
+    type_coerce(Reminder.is_active, Boolean).label("is_active"),
+)
+DUE_REMINDER_COLUMNS = (
+    Reminder.resolution_id,
+    Resolution.title.label("resolution_title"),
+    Reminder.frequency,
+    Reminder.next_due,
+)
+
+
+def keys(columns: Sequence[Any]) -> tuple[str, ...]:
+    return tuple(column.key for column in columns)
+
+
+RESOLUTION_KEYS = keys(RESOLUTION_COLUMNS)
+CHECK_IN_KEYS = keys(CHECK_IN_COLUMNS)
+REMINDER_KEYS = keys(REMINDER_COLUMNS)
+DUE_REMINDER_KEYS = keys(DUE_REMINDER_COLUMNS)
+
+
+def record(names: tuple[str, ...], row: Sequence[Any]) -> dict[str, Any]:
+    return dict(zip(names, row))
+
+
+def records(names: tuple[str, ...], rows: Iterable[Sequence[Any]]) -> list[dict[str, Any]]:
+    return [dict(zip(names, row)) for row in rows]
+
+
+def json_response(content: Any, headers: Optional[dict[str, str]] = None) -> Response:
+    return Response(orjson.dumps(content), media_type="application/json", headers=headers)
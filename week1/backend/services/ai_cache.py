@@ -0,0 +1,159 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy import delete, select
+
+from ..database import current_tenant, get_session_factory
+from ..db_models import AiCacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(model_id: str, system: str, user: str) -> str:
+    digest = hashlib.sha256()
+    for part in (model_id, system, user):
+        encoded = part.encode("utf-8")
+        # Length-prefix each part so ("ab", "c") and ("a", "bc") never collide.
+        digest.update(len(encoded).to_bytes(8, "big"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """In-memory LRU with TTL in front of the ``ai_cache`` table.
+
+    The table is trimmed back to ``disk_max_entries`` once every
+    ``disk_trim_every`` writes per tenant rather than on each one, so it can run
+    that many rows over the bound in between.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 7 * 24 * 3600,
+        disk_max_entries: int = 50_000,
+        disk_trim_every: int = 500,
+        persist: bool = True,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_max_entries = disk_max_entries
+        self.disk_trim_every = disk_trim_every
+        self.persist = persist
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._disk_puts: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "disk_evictions": 0,
+        }
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                if now - stored_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return value
+                del self._entries[key]
+                self._counters["expirations"] += 1
+
+        if self.persist:
+            entry = self._disk_get(key, now)
+            if entry is not None:
+                value, stored_at = entry
+                with self._lock:
+                    self._counters["disk_hits"] += 1
+                    self._remember(key, value, stored_at)
+                return value
+
+        with self._lock:
+            self._counters["misses"] += 1
+        return None
+
+    def put(self, key: str, model_id: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+        if self.persist:
+            self._disk_put(key, model_id, value, now)
+
+    def clear(self, memory_only: bool = False) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.persist and not memory_only:
+            session = get_session_factory()()
+            try:
+                session.execute(delete(AiCacheEntry))
+                session.commit()
+            finally:
+                session.close()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {**self._counters, "memory_entries": len(self._entries)}
+
+    def _remember(self, key: str, value: str, stored_at: float) -> None:
+        self._entries[key] = (value, stored_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _disk_get(self, key: str, now: float) -> Optional[tuple[str, float]]:
+        session = get_session_factory()()
+        try:
+            row = session.execute(
+                select(AiCacheEntry.response, AiCacheEntry.created_at).where(AiCacheEntry.key == key)
+            ).first()
+            if row is None:
+                return None
+            if now - row.created_at > self.ttl_seconds:
+                session.execute(delete(AiCacheEntry).where(AiCacheEntry.key == key))
+                session.commit()
+                with self._lock:
+                    self._counters["expirations"] += 1
+                return None
+            return row.response, row.created_at
+        except Exception:
+            logger.exception("AI cache read failed")
+            return None
+        finally:
+            session.close()
+
+    def _due_for_trim(self, tenant: str) -> bool:
+        with self._lock:
+            puts = self._disk_puts.get(tenant, 0) + 1
+            self._disk_puts[tenant] = 0 if puts >= self.disk_trim_every else puts
+        return puts >= self.disk_trim_every
+
+    def _disk_put(self, key: str, model_id: str, value: str, now: float) -> None:
+        session = get_session_factory()()
+        try:
+            session.merge(AiCacheEntry(key=key, model_id=model_id, response=value, created_at=now))
+            evicted = 0
+            if self._due_for_trim(current_tenant()):
+                overflow = (
+                    select(AiCacheEntry.key).order_by(AiCacheEntry.created_at.desc()).offset(self.disk_max_entries)
+                )
+                evicted = session.execute(delete(AiCacheEntry).where(AiCacheEntry.key.in_(overflow))).rowcount
+            session.commit()
+            if evicted:
+                with self._lock:
+                    self._counters["disk_evictions"] += evicted
+        except Exception:
+            session.rollback()
+            logger.exception("AI cache write failed")
+        finally:
+            session.close()
@@ -1,50 +1,358 @@
+import asyncio
+import contextvars
+import functools
 import json
 import logging
-import boto3
-from typing import Any
+import random
+import re
+import threading
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterator, Optional, TypeVar
+
+from .. import metrics
+from . import sentiment_classifier
+from .ai_cache import ResponseCache, cache_key
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
 
 logger = logging.getLogger(__name__)
 
 MODEL_ID = "us.anthropic.claude-haiku-4-5-20251001-v1:0"
 REGION = "us-east-1"
 
+CACHE_MAX_ENTRIES = 1024
+CACHE_TTL_SECONDS = 7 * 24 * 3600
+CACHE_DISK_MAX_ENTRIES = 50_000
+
+# Bedrock calls run here rather than on Starlette's request threadpool, so slow
+# model calls never starve ordinary requests of worker threads.
+AI_MAX_CONCURRENCY = 32
+
+# Fail fast rather than waiting out botocore's 60s read timeout and legacy
+# retries. Adaptive mode also rate-limits the client when Bedrock throttles.
+CONNECT_TIMEOUT_SECONDS = 2
+READ_TIMEOUT_SECONDS = 15
+MAX_ATTEMPTS = 2
+
+# After this many consecutive failed calls, serve defaults without calling
+# Bedrock until a probe succeeds; the first probe goes out after the timeout.
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_SECONDS = 30.0
+
+# Build the Bedrock client in the background once the app has started, so the
+# first AI request does not pay for importing boto3.
+WARM_UP_ON_STARTUP = True
+
+# Notes are labelled by the local classifier first. Bedrock is only asked when
+# the classifier is less confident than this, or when the caller needs
+# generated feedback rather than a stock message. Single check-ins (plain,
+# streamed and deferred) and re-analysis always ask for generated feedback;
+# batch check-ins follow REQUIRE_GENERATED_FEEDBACK. Above 1.0, every note
+# goes to Bedrock.
+LOCAL_SENTIMENT_THRESHOLD = 0.75
+REQUIRE_GENERATED_FEEDBACK = False
+# Share of confident local labels that are still sent to Bedrock, so agreement
+# keeps being measured where the classifier is trusted.
+SENTIMENT_SHADOW_RATE = 0.0
+
+T = TypeVar("T")
+
 _client = None
+# The default boto3 session is not safe for concurrent client creation.
+_client_lock = threading.Lock()
+_ai_executor = ThreadPoolExecutor(max_workers=AI_MAX_CONCURRENCY, thread_name_prefix="bedrock")
+_cache = ResponseCache(
+    max_entries=CACHE_MAX_ENTRIES,
+    ttl_seconds=CACHE_TTL_SECONDS,
+    disk_max_entries=CACHE_DISK_MAX_ENTRIES,
+)
+
+
+def _on_circuit_transition(state: str) -> None:
+    if state == "open":
+        logger.warning("Bedrock circuit open; serving default AI results for %ss", BREAKER_RESET_SECONDS)
+    else:
+        logger.info("Bedrock circuit %s", state)
+    metrics.record_circuit_state(state)
+
+
+_breaker = CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS, on_transition=_on_circuit_transition)
 
 
 def _get_client() -> Any:
     global _client
-    if _client is None:
-        _client = boto3.client("bedrock-runtime", region_name=REGION)
+    if _client is not None:
+        return _client
+    # boto3 is imported here, not at module level: it is a large share of
+    # import time and most processes (CLIs, tests, cold workers) never call Bedrock.
+    import boto3
+    from botocore.config import Config
+
+    with _client_lock:
+        if _client is None:
+            config = Config(
+                connect_timeout=CONNECT_TIMEOUT_SECONDS,
+                read_timeout=READ_TIMEOUT_SECONDS,
+                max_pool_connections=AI_MAX_CONCURRENCY,
+                retries={"mode": "adaptive", "total_max_attempts": MAX_ATTEMPTS},
+            )
+            _client = boto3.client("bedrock-runtime", region_name=REGION, config=config)
     return _client
 
 
-def _invoke(system: str, user: str) -> str:
-    client = _get_client()
-    body = json.dumps({
+def warm_up() -> "Future[Any]":
+    """Import boto3 and build the client on the AI executor, off the startup path."""
+    return _ai_executor.submit(_get_client)
+
+
+async def run_in_ai_executor(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Await a blocking AI call without occupying the event loop or a request thread."""
+    loop = asyncio.get_running_loop()
+    # Carry context variables (the request's tenant) over to the worker thread.
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_ai_executor, functools.partial(context.run, fn, *args, **kwargs))
+
+
+async def iterate_in_ai_executor(fn: Callable[..., Iterator[T]], *args: Any, **kwargs: Any) -> AsyncIterator[T]:
+    """Consume a blocking generator on the AI executor, yielding its items on the event loop."""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    stop = threading.Event()
+    done = object()
+
+    def _put(item: Any) -> None:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            stop.set()  # the loop has gone away
+
+    def _pump() -> None:
+        try:
+            for item in fn(*args, **kwargs):
+                if stop.is_set():
+                    break
+                _put((item, None))
+        except Exception as exc:
+            _put((None, exc))
+        finally:
+            _put(done)
+
+    loop.run_in_executor(_ai_executor, contextvars.copy_context().run, _pump)
+    try:
+        while (entry := await queue.get()) is not done:
+            item, exc = entry
+            if exc is not None:
+                raise exc
+            yield item
+    finally:
+        stop.set()
+
+
+def cache_stats() -> dict[str, int]:
+    return _cache.stats()
+
+
+def breaker_stats() -> dict[str, Any]:
+    return _breaker.stats()
+
+
+def sentiment_stats() -> dict[str, Any]:
+    """Where sentiment was answered, and how often the local label matched Bedrock's."""
+    decisions = {decision: 0 for decision in SENTIMENT_DECISIONS}
+    agreed = compared = 0
+    for sample in metrics.SENTIMENT_DECISIONS.collect()[0].samples:
+        if sample.name.endswith("_total"):
+            decisions[sample.labels["decision"]] = int(sample.value)
+    for sample in metrics.SENTIMENT_COMPARISONS.collect()[0].samples:
+        if sample.name.endswith("_total"):
+            compared += int(sample.value)
+            if sample.labels["local"] == sample.labels["bedrock"]:
+                agreed += int(sample.value)
+    total = sum(decisions.values())
+    return {
+        "decisions": decisions,
+        "calls_saved": decisions[LOCAL] / total if total else 0.0,
+        "compared": compared,
+        "agreement": agreed / compared if compared else None,
+    }
+
+
+def _log_fallback(message: str, exc: Exception, task: str) -> None:
+    if isinstance(exc, CircuitOpenError):
+        # Expected while Bedrock is down; the trip itself was already logged.
+        logger.debug("%s: %s", message, exc)
+    else:
+        logger.exception(message)
+    metrics.record_fallback(task)
+
+
+def _request_body(system: str, user: str) -> str:
+    return json.dumps({
         "anthropic_version": "bedrock-2023-05-31",
         "max_tokens": 1024,
         "system": system,
         "messages": [{"role": "user", "content": user}],
     })
-    response = client.invoke_model(
-        modelId=MODEL_ID,
-        contentType="application/json",
-        accept="application/json",
-        body=body,
-    )
-    result = json.loads(response["body"].read())
-    return result["content"][0]["text"]
+
+
+def _cache_if_parseable(key: str, text: str) -> None:
+    # Only cache replies the callers can parse, so a malformed one is retried.
+    try:
+        json.loads(text.strip())
+    except ValueError:
+        return
+    _cache.put(key, MODEL_ID, text)
+
+
+def _invoke(system: str, user: str) -> str:
+    key = cache_key(MODEL_ID, system, user)
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
+
+    client = _get_client()
+    with _breaker.guard():
+        started = time.perf_counter()
+        try:
+            response = client.invoke_model(
+                modelId=MODEL_ID,
+                contentType="application/json",
+                accept="application/json",
+                body=_request_body(system, user),
+            )
+            result = json.loads(response["body"].read())
+        except Exception as exc:
+            metrics.record_bedrock_error("invoke_model", exc)
+            raise
+        finally:
+            metrics.observe_bedrock("invoke_model", time.perf_counter() - started)
+    metrics.record_tokens(result.get("usage"))
+    text = result["content"][0]["text"]
+    _cache_if_parseable(key, text)
+    return text
+
+
+def _invoke_stream(system: str, user: str) -> Iterator[str]:
+    """Yield text deltas from Bedrock's response stream (or one cached reply)."""
+    key = cache_key(MODEL_ID, system, user)
+    cached = _cache.get(key)
+    if cached is not None:
+        yield cached
+        return
+
+    api = "invoke_model_with_response_stream"
+    parts = []
+    with _breaker.guard():
+        started = time.perf_counter()
+        try:
+            response = _get_client().invoke_model_with_response_stream(
+                modelId=MODEL_ID,
+                contentType="application/json",
+                accept="application/json",
+                body=_request_body(system, user),
+            )
+            for event in response["body"]:
+                chunk = event.get("chunk")
+                if not chunk:
+                    continue
+                payload = json.loads(chunk["bytes"])
+                kind = payload.get("type")
+                if kind == "content_block_delta":
+                    text = payload["delta"].get("text", "")
+                    if text:
+                        parts.append(text)
+                        yield text
+                elif kind == "message_start":
+                    metrics.record_tokens(payload.get("message", {}).get("usage"))
+                elif kind == "message_delta":
+                    metrics.record_tokens(payload.get("usage"))
+        except Exception as exc:
+            metrics.record_bedrock_error(api, exc)
+            raise
+        finally:
+            metrics.observe_bedrock(api, time.perf_counter() - started)
+    _cache_if_parseable(key, "".join(parts))
+
+
+class JsonStringFieldStream:
+    """Incrementally decode one string field of a JSON object as it streams in."""
+
+    def __init__(self, field: str) -> None:
+        self._marker = re.compile(r'"%s"\s*:\s*"' % re.escape(field))
+        self._head = ""
+        self._escape = ""
+        self.started = False
+        self.finished = False
+
+    def feed(self, chunk: str) -> str:
+        if self.finished:
+            return ""
+        if not self.started:
+            self._head += chunk
+            match = self._marker.search(self._head)
+            if not match:
+                return ""
+            self.started = True
+            chunk, self._head = self._head[match.end():], ""
+
+        out = []
+        for ch in chunk:
+            if self._escape:
+                self._escape += ch
+                if not self._escape_complete():
+                    continue
+                out.append(json.loads(f'"{self._escape}"'))
+                self._escape = ""
+            elif ch == "\\":
+                self._escape = ch
+            elif ch == '"':
+                self.finished = True
+                break
+            else:
+                out.append(ch)
+        return "".join(out)
+
+    def _escape_complete(self) -> bool:
+        if len(self._escape) < 2 or self._escape[1] != "u":
+            return len(self._escape) >= 2
+        if len(self._escape) < 6:
+            return False
+        # A high surrogate needs its low half before it can be decoded.
+        if 0xD800 <= int(self._escape[2:6], 16) <= 0xDBFF:
+            return len(self._escape) >= 12
+        return True
+
+
+class Fallback(dict):
+    """A default result served because the model call failed.
+
+    It reads like any other result; ``is_fallback`` tells them apart, since a
+    real answer may well carry the same values.
+    """
+
+
+_DEFAULT_CATEGORY = {"category": "Personal", "priority": 3}
 
 
 def categorize_and_prioritize(
     title: str,
     description: str,
     existing_resolutions: list[dict[str, Any]],
+    category_stats: Optional[list[dict[str, Any]]] = None,
 ) -> dict[str, Any]:
     existing_summary = ""
     if existing_resolutions:
         items = [f"- {r['title']} (category: {r.get('category', 'unset')}, priority: {r.get('priority', 'unset')})" for r in existing_resolutions]
-        existing_summary = "Existing resolutions:\n" + "\n".join(items)
+        existing_summary = "Most similar existing resolutions:\n" + "\n".join(items)
+
+    stats_summary = ""
+    if category_stats:
+        items = [
+            f"- {s['category'] or 'unset'}: {s['count']} active (priority {s['min_priority']}-{s['max_priority']}, avg {s['avg_priority']})"
+            for s in category_stats
+        ]
+        stats_summary = "Active resolutions by category:\n" + "\n".join(items)
 
     system = (
         "You are an assistant that categorizes and prioritizes personal resolutions. "
@@ -56,6 +364,7 @@ def categorize_and_prioritize(
     user = (
         f"New resolution:\nTitle: {title}\nDescription: {description}\n\n"
         f"{existing_summary}\n\n"
+        f"{stats_summary}\n\n"
         'Respond with: {"category": "...", "priority": N}'
     )
 
@@ -66,17 +375,95 @@ def categorize_and_prioritize(
             "category": parsed.get("category", "Personal"),
             "priority": int(parsed.get("priority", 3)),
         }
-    except Exception:
-        logger.exception("AI categorize failed, using defaults")
-        return {"category": "Personal", "priority": 3}
+    except Exception as exc:
+        _log_fallback("AI categorize failed, using defaults", exc, "categorize")
+        return Fallback(_DEFAULT_CATEGORY)
 
 
-def analyze_sentiment_and_feedback(
+_DEFAULT_SENTIMENT = {
+    "sentiment": "neutral",
+    "sentiment_score": 0.5,
+    "ai_feedback": "Keep going! Every step counts.",
+}
+
+
+# Stock feedback for notes answered by the local classifier.
+_LOCAL_FEEDBACK = {
+    sentiment_classifier.POSITIVE: (
+        "Great work! Keep that momentum going.",
+        "Nice progress, you're building a real habit.",
+        "That's a solid step forward. Keep it up!",
+    ),
+    sentiment_classifier.NEUTRAL: (
+        "Keep going! Every step counts.",
+        "Steady effort adds up. Keep showing up.",
+    ),
+    sentiment_classifier.NEGATIVE: (
+        "Tough days happen. Be kind to yourself and pick it back up tomorrow.",
+        "A setback isn't failure. Try a smaller step next time to rebuild momentum.",
+        "Every streak has gaps. What matters is the next check-in.",
+    ),
+}
+
+# Values of the ``sentiment_decisions`` metric.
+LOCAL = "local"
+LOW_CONFIDENCE = "low_confidence"
+FEEDBACK_REQUIRED = "feedback_required"
+SHADOW = "shadow"
+SENTIMENT_DECISIONS = (LOCAL, LOW_CONFIDENCE, FEEDBACK_REQUIRED, SHADOW)
+
+
+def _sentiment_decision(label: sentiment_classifier.Label, require_feedback: Optional[bool]) -> str:
+    if REQUIRE_GENERATED_FEEDBACK if require_feedback is None else require_feedback:
+        return FEEDBACK_REQUIRED
+    if label.confidence < LOCAL_SENTIMENT_THRESHOLD:
+        return LOW_CONFIDENCE
+    if SENTIMENT_SHADOW_RATE and random.random() < SENTIMENT_SHADOW_RATE:
+        return SHADOW
+    return LOCAL
+
+
+def _local_sentiment(note: str, label: sentiment_classifier.Label) -> dict[str, Any]:
+    messages = _LOCAL_FEEDBACK[label.sentiment]
+    return {
+        "sentiment": label.sentiment,
+        "sentiment_score": round(label.confidence, 2),
+        "ai_feedback": messages[zlib.crc32(note.encode()) % len(messages)],
+    }
+
+
+def _record_comparison(label: sentiment_classifier.Label, result: dict[str, Any]) -> None:
+    bedrock = result["sentiment"] if result["sentiment"] in _LOCAL_FEEDBACK else "other"
+    metrics.record_sentiment_comparison(label.sentiment, bedrock)
+
+
+def triage_sentiment(notes: list[str], require_feedback: Optional[bool] = None) -> list[Optional[dict[str, Any]]]:
+    """Answer what the local classifier can for a batch of notes, in one pass.
+
+    Returns the local result for each confidently labelled note and ``None``
+    for the rest, which should go through ``analyze_sentiment_and_feedback``.
+    """
+    results: list[Optional[dict[str, Any]]] = []
+    for note, label in zip(notes, sentiment_classifier.classify_many(notes)):
+        if _sentiment_decision(label, require_feedback) == LOCAL:
+            metrics.record_sentiment_decision(LOCAL)
+            results.append(_local_sentiment(note, label))
+        else:
+            results.append(None)
+    return results
+
+
+def is_fallback(result: dict[str, Any]) -> bool:
+    """Whether ``result`` is the default served after a failed call rather than a model answer."""
+    return isinstance(result, Fallback)
+
+
+def _sentiment_prompt(
     note: str,
     resolution_title: str,
     resolution_description: str,
     past_check_ins: list[dict[str, Any]],
-) -> dict[str, Any]:
+) -> tuple[str, str]:
     past_summary = ""
     if past_check_ins:
         items = [f"- [{c.get('created_at', '')}] {c['note']} (sentiment: {c.get('sentiment', 'unknown')})" for c in past_check_ins[-5:]]
@@ -96,19 +483,86 @@ def analyze_sentiment_and_feedback(
         f"New check-in note: {note}\n\n"
         "Analyze the sentiment and provide feedback."
     )
+    return system, user
+
+
+def _parse_sentiment(raw: str) -> dict[str, Any]:
+    parsed = json.loads(raw.strip())
+    return {
+        "sentiment": parsed.get("sentiment", "neutral"),
+        "sentiment_score": float(parsed.get("sentiment_score", 0.5)),
+        "ai_feedback": parsed.get("ai_feedback", "Keep going!"),
+    }
 
+
+def analyze_sentiment_and_feedback(
+    note: str,
+    resolution_title: str,
+    resolution_description: str,
+    past_check_ins: list[dict[str, Any]],
+    require_feedback: Optional[bool] = None,
+) -> dict[str, Any]:
+    """Label a check-in note and write feedback for it.
+
+    The local classifier answers when it is confident and generated feedback
+    is not required (``require_feedback`` defaults to
+    ``REQUIRE_GENERATED_FEEDBACK``); otherwise Bedrock does.
+    """
+    label = sentiment_classifier.classify(note)
+    decision = _sentiment_decision(label, require_feedback)
+    metrics.record_sentiment_decision(decision)
+    if decision == LOCAL:
+        return _local_sentiment(note, label)
+
+    system, user = _sentiment_prompt(note, resolution_title, resolution_description, past_check_ins)
     try:
         raw = _invoke(system, user)
-        parsed = json.loads(raw.strip())
-        return {
-            "sentiment": parsed.get("sentiment", "neutral"),
-            "sentiment_score": float(parsed.get("sentiment_score", 0.5)),
-            "ai_feedback": parsed.get("ai_feedback", "Keep going!"),
-        }
-    except Exception:
-        logger.exception("AI sentiment analysis failed, using defaults")
-        return {
-            "sentiment": "neutral",
-            "sentiment_score": 0.5,
-            "ai_feedback": "Keep going! Every step counts.",
-        }
+        result = _parse_sentiment(raw)
+    except Exception as exc:
+        _log_fallback("AI sentiment analysis failed, using defaults", exc, "sentiment")
+        return Fallback(_DEFAULT_SENTIMENT)
+    _record_comparison(label, result)
+    return result
+
+
+def stream_sentiment_and_feedback(
+    note: str,
+    resolution_title: str,
+    resolution_description: str,
+    past_check_ins: list[dict[str, Any]],
+    require_feedback: Optional[bool] = None,
+) -> Iterator[dict[str, Any]]:
+    """Streaming variant of ``analyze_sentiment_and_feedback``.
+
+    Yields ``{"type": "delta", "text": ...}`` for each piece of ``ai_feedback``
+    as it arrives, then a single ``{"type": "result", "result": {...}}``.
+    A local result arrives as one delta.
+    """
+    label = sentiment_classifier.classify(note)
+    decision = _sentiment_decision(label, require_feedback)
+    metrics.record_sentiment_decision(decision)
+    if decision == LOCAL:
+        result = _local_sentiment(note, label)
+        yield {"type": "delta", "text": result["ai_feedback"]}
+        yield {"type": "result", "result": result}
+        return
+
+    system, user = _sentiment_prompt(note, resolution_title, resolution_description, past_check_ins)
+    feedback = JsonStringFieldStream("ai_feedback")
+    parts = []
+
+    try:
+        for text in _invoke_stream(system, user):
+            parts.append(text)
+            delta = feedback.feed(text)
+            if delta:
+                yield {"type": "delta", "text": delta}
+        result = _parse_sentiment("".join(parts))
+        _record_comparison(label, result)
+    except Exception as exc:
+        _log_fallback("AI sentiment stream failed, using defaults", exc, "sentiment_stream")
+        result = Fallback(_DEFAULT_SENTIMENT)
+
+    if not feedback.started:
+        yield {"type": "delta", "text": result["ai_feedback"]}
+    yield {"type": "result", "result": result}
@@ -0,0 +1,94 @@
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from .ai_service import analyze_sentiment_and_feedback, categorize_and_prioritize, run_in_ai_executor, triage_sentiment
+from .rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+MAX_CONCURRENCY = 8
+REQUESTS_PER_SECOND = 10.0
+BURST = 10.0
+
+_limiter = TokenBucket(rate=REQUESTS_PER_SECOND, capacity=BURST)
+
+
+def analyze_many(
+    items: list[dict[str, Any]],
+    concurrency: int = MAX_CONCURRENCY,
+    limiter: Optional[TokenBucket] = None,
+    require_feedback: Optional[bool] = None,
+) -> list[dict[str, Any]]:
+    """Run sentiment analysis for each item in a bounded pool, preserving input order.
+
+    Each item carries the keyword arguments of ``analyze_sentiment_and_feedback``.
+    Notes the local classifier is confident about are answered up front and
+    use neither a pool slot nor a rate-limit token, unless ``require_feedback``
+    sends every note to the model.
+    """
+    results, pending = _triage(items, require_feedback)
+    analyze = functools.partial(analyze_sentiment_and_feedback, require_feedback=require_feedback)
+    analyzed = _map_limited(analyze, [items[i] for i in pending], concurrency, limiter or _limiter)
+    return _merge(results, pending, analyzed)
+
+
+def categorize_many(
+    items: list[dict[str, Any]],
+    concurrency: int = MAX_CONCURRENCY,
+    limiter: Optional[TokenBucket] = None,
+) -> list[dict[str, Any]]:
+    """Like ``analyze_many`` for the keyword arguments of ``categorize_and_prioritize``."""
+    return _map_limited(categorize_and_prioritize, items, concurrency, limiter or _limiter)
+
+
+def _triage(
+    items: list[dict[str, Any]], require_feedback: Optional[bool] = None
+) -> tuple[list[Optional[dict[str, Any]]], list[int]]:
+    results = triage_sentiment([item["note"] for item in items], require_feedback)
+    return results, [i for i, result in enumerate(results) if result is None]
+
+
+def _merge(
+    results: list[Optional[dict[str, Any]]], pending: list[int], analyzed: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    for i, result in zip(pending, analyzed):
+        results[i] = result
+    return results
+
+
+def _map_limited(
+    fn: Callable[..., dict[str, Any]],
+    items: list[dict[str, Any]],
+    concurrency: int,
+    limiter: TokenBucket,
+) -> list[dict[str, Any]]:
+    def _call(item: dict[str, Any]) -> dict[str, Any]:
+        limiter.acquire()
+        return fn(**item)
+
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(items))), thread_name_prefix="ai-batch") as pool:
+        return list(pool.map(_call, items))
+
+
+async def analyze_many_async(
+    items: list[dict[str, Any]],
+    concurrency: int = MAX_CONCURRENCY,
+    limiter: Optional[TokenBucket] = None,
+) -> list[dict[str, Any]]:
+    """Async counterpart of ``analyze_many`` for use from request handlers."""
+    limiter = limiter or _limiter
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _analyze(item: dict[str, Any]) -> dict[str, Any]:
+        async with semaphore:
+            await limiter.acquire_async()
+            return await run_in_ai_executor(analyze_sentiment_and_feedback, **item)
+
+    results, pending = _triage(items)
+    analyzed = await asyncio.gather(*(_analyze(items[i]) for i in pending))
+    return _merge(results, pending, list(analyzed))
@@ -0,0 +1,159 @@
+"""Single-row ``dashboard_stats`` rollup maintained by SQLite triggers.
+
+The triggers run inside the writing statement's transaction, so every write
+path (ORM, bulk inserts, cascades) keeps the rollup exact without the routers
+having to remember it.
+"""
+import argparse
+import json
+import sys
+from typing import Any, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+STATS_ID = 1
+
+
+def _status_delta(row: str, sign: str) -> str:
+    return (
+        f"total_resolutions = total_resolutions {sign} 1, "
+        f"active_resolutions = active_resolutions {sign} ({row}.status = 'active'), "
+        f"completed_resolutions = completed_resolutions {sign} ({row}.status = 'completed'), "
+        f"abandoned_resolutions = abandoned_resolutions {sign} ({row}.status = 'abandoned')"
+    )
+
+
+def _score_delta(row: str, sign: str) -> str:
+    return (
+        f"sentiment_score_sum = sentiment_score_sum {sign} coalesce({row}.sentiment_score, 0), "
+        f"sentiment_score_count = sentiment_score_count {sign} ({row}.sentiment_score IS NOT NULL)"
+    )
+
+
+def _histogram_increment(row: str) -> str:
+    path = f"'$.\"' || {row}.sentiment || '\"'"
+    return (
+        f"UPDATE dashboard_stats SET sentiment_histogram = json_set(sentiment_histogram, {path}, "
+        f"coalesce(json_extract(sentiment_histogram, {path}), 0) + 1) "
+        f"WHERE id = {STATS_ID} AND {row}.sentiment IS NOT NULL;"
+    )
+
+
+def _histogram_decrement(row: str) -> str:
+    path = f"'$.\"' || {row}.sentiment || '\"'"
+    return (
+        f"UPDATE dashboard_stats SET sentiment_histogram = CASE "
+        f"WHEN coalesce(json_extract(sentiment_histogram, {path}), 0) <= 1 THEN json_remove(sentiment_histogram, {path}) "
+        f"ELSE json_set(sentiment_histogram, {path}, json_extract(sentiment_histogram, {path}) - 1) END "
+        f"WHERE id = {STATS_ID} AND {row}.sentiment IS NOT NULL;"
+    )
+
+
+TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS trg_dashboard_resolution_insert AFTER INSERT ON resolutions BEGIN
+        UPDATE dashboard_stats SET {_status_delta("NEW", "+")} WHERE id = {STATS_ID};
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_dashboard_resolution_delete AFTER DELETE ON resolutions BEGIN
+        UPDATE dashboard_stats SET {_status_delta("OLD", "-")} WHERE id = {STATS_ID};
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_dashboard_resolution_status AFTER UPDATE OF status ON resolutions
+    WHEN OLD.status IS NOT NEW.status BEGIN
+        UPDATE dashboard_stats SET {_status_delta("OLD", "-")} WHERE id = {STATS_ID};
+        UPDATE dashboard_stats SET {_status_delta("NEW", "+")} WHERE id = {STATS_ID};
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_dashboard_check_in_insert AFTER INSERT ON check_ins BEGIN
+        UPDATE dashboard_stats SET total_check_ins = total_check_ins + 1, {_score_delta("NEW", "+")} WHERE id = {STATS_ID};
+        {_histogram_increment("NEW")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_dashboard_check_in_delete AFTER DELETE ON check_ins BEGIN
+        UPDATE dashboard_stats SET total_check_ins = total_check_ins - 1, {_score_delta("OLD", "-")} WHERE id = {STATS_ID};
+        {_histogram_decrement("OLD")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_dashboard_check_in_sentiment AFTER UPDATE OF sentiment, sentiment_score ON check_ins BEGIN
+        UPDATE dashboard_stats SET {_score_delta("OLD", "-")} WHERE id = {STATS_ID};
+        UPDATE dashboard_stats SET {_score_delta("NEW", "+")} WHERE id = {STATS_ID};
+        {_histogram_decrement("OLD")}
+        {_histogram_increment("NEW")}
+    END""",
+]
+
+_AGGREGATES = f"""
+    SELECT
+        (SELECT count(*) FROM resolutions) AS total_resolutions,
+        (SELECT count(*) FROM resolutions WHERE status = 'active') AS active_resolutions,
+        (SELECT count(*) FROM resolutions WHERE status = 'completed') AS completed_resolutions,
+        (SELECT count(*) FROM resolutions WHERE status = 'abandoned') AS abandoned_resolutions,
+        (SELECT count(*) FROM check_ins) AS total_check_ins,
+        (SELECT coalesce(sum(sentiment_score), 0) FROM check_ins) AS sentiment_score_sum,
+        (SELECT count(sentiment_score) FROM check_ins) AS sentiment_score_count,
+        (SELECT coalesce(json_group_object(sentiment, n), '{{}}') FROM (
+            SELECT sentiment, count(*) AS n FROM check_ins WHERE sentiment IS NOT NULL GROUP BY sentiment
+        )) AS sentiment_histogram
+"""
+
+_COLUMNS = [
+    "total_resolutions",
+    "active_resolutions",
+    "completed_resolutions",
+    "abandoned_resolutions",
+    "total_check_ins",
+    "sentiment_score_sum",
+    "sentiment_score_count",
+    "sentiment_histogram",
+]
+
+
+def install_triggers(conn: Connection) -> None:
+    for statement in TRIGGERS:
+        conn.exec_driver_sql(statement)
+
+
+def rebuild(conn: Connection) -> None:
+    """Recompute the rollup from the base tables."""
+    conn.execute(text(f"INSERT OR IGNORE INTO dashboard_stats (id) VALUES ({STATS_ID})"))
+    assignments = ", ".join(f"{c} = agg.{c}" for c in _COLUMNS)
+    conn.execute(text(f"UPDATE dashboard_stats SET {assignments} FROM ({_AGGREGATES}) AS agg WHERE dashboard_stats.id = {STATS_ID}"))
+
+
+def _normalize(values: dict[str, Any]) -> dict[str, Any]:
+    values = dict(values)
+    values["sentiment_histogram"] = json.loads(values["sentiment_histogram"] or "{}")
+    values["sentiment_score_sum"] = round(values["sentiment_score_sum"] or 0.0, 6)
+    return values
+
+
+def check(conn: Connection) -> dict[str, tuple[Any, Any]]:
+    """Return ``{column: (stored, expected)}`` for every column that has drifted."""
+    stored = conn.execute(text(f"SELECT {', '.join(_COLUMNS)} FROM dashboard_stats WHERE id = {STATS_ID}")).mappings().first()
+    expected = _normalize(conn.execute(text(_AGGREGATES)).mappings().one())
+    if stored is None:
+        return {c: (None, expected[c]) for c in _COLUMNS}
+    stored = _normalize(stored)
+    return {c: (stored[c], expected[c]) for c in _COLUMNS if stored[c] != expected[c]}
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from ..database import DEFAULT_TENANT, _get_engine, init_db, use_tenant, validate_tenant
+
+    parser = argparse.ArgumentParser(description="Maintain the dashboard_stats rollup.")
+    parser.add_argument("--tenant", type=validate_tenant, default=DEFAULT_TENANT, help="tenant database to use (default: %(default)s)")
+    parser.add_argument("command", choices=["rebuild", "check"])
+    args = parser.parse_args(argv)
+
+    with use_tenant(args.tenant):
+        init_db()
+        with _get_engine().begin() as conn:
+            if args.command == "rebuild":
+                rebuild(conn)
+            drift = check(conn)
+    for column, (stored, expected) in drift.items():
+        print(f"{column}: stored={stored} expected={expected}")
+    if drift:
+        return 1
+    print("dashboard_stats is consistent")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""Monotonic data-version counters maintained by SQLite triggers.
+
+``data_versions`` holds one global counter (``GLOBAL_SCOPE``) and one counter
+per resolution id. Any insert, update or delete on ``resolutions``,
+``check_ins`` or ``reminders`` bumps the global counter and the counter of the
+resolution it belongs to. The bump happens inside the writing statement's
+transaction, so a reader never sees new data with an old version. Counters
+are never reset, not even when their resolution is deleted, so a reused id
+cannot bring back an old version.
+
+``DATABASE_ID_SCOPE`` holds a random number chosen when the table is created.
+Caches combine it with the counters, so a database file that is replaced or
+recreated never reuses a cached response from its predecessor.
+"""
+from sqlalchemy import select
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..db_models import DataVersion
+
+GLOBAL_SCOPE = 0
+DATABASE_ID_SCOPE = -1
+
+
+def _bump(scope: str) -> str:
+    return (
+        f"INSERT INTO data_versions (scope, version) VALUES ({scope}, 1) "
+        "ON CONFLICT (scope) DO UPDATE SET version = version + 1;"
+    )
+
+
+def _triggers() -> list[str]:
+    statements = []
+    for table, key in (("resolutions", "id"), ("check_ins", "resolution_id"), ("reminders", "resolution_id")):
+        for event, rows in (("INSERT", ("NEW",)), ("DELETE", ("OLD",)), ("UPDATE", ("OLD", "NEW"))):
+            bumps = [_bump(str(GLOBAL_SCOPE)), _bump(f"{rows[0]}.{key}")]
+            if len(rows) == 2:
+                # Only differs if a row moves to another resolution.
+                bumps.append(
+                    f"INSERT INTO data_versions (scope, version) SELECT NEW.{key}, 1 WHERE NEW.{key} IS NOT OLD.{key} "
+                    "ON CONFLICT (scope) DO UPDATE SET version = version + 1;"
+                )
+            body = "\n        ".join(bumps)
+            statements.append(
+                f"""CREATE TRIGGER IF NOT EXISTS trg_data_version_{table}_{event.lower()} AFTER {event} ON {table} BEGIN
+        {body}
+    END"""
+            )
+    return statements
+
+
+TRIGGERS = _triggers()
+
+
+def install_triggers(conn: Connection) -> None:
+    for statement in TRIGGERS:
+        conn.exec_driver_sql(statement)
+
+
+def rebuild(conn: Connection) -> None:
+    """Assign the database id and start existing resolutions (and the global scope) at version 1."""
+    conn.exec_driver_sql(
+        f"INSERT OR IGNORE INTO data_versions (scope, version) VALUES ({DATABASE_ID_SCOPE}, abs(random() >> 1))"
+    )
+    conn.exec_driver_sql(f"INSERT OR IGNORE INTO data_versions (scope, version) VALUES ({GLOBAL_SCOPE}, 1)")
+    conn.exec_driver_sql("INSERT OR IGNORE INTO data_versions (scope, version) SELECT id, 1 FROM resolutions")
+
+
+async def get_version(db: AsyncSession, scope: int = GLOBAL_SCOPE) -> tuple[int, int]:
+    """``(database id, version)`` of ``scope``; a scope never written yet is at version 0."""
+    rows = dict((await db.execute(
+        select(DataVersion.scope, DataVersion.version).where(DataVersion.scope.in_((DATABASE_ID_SCOPE, scope)))
+    )).all())
+    return rows.get(DATABASE_ID_SCOPE, 0), rows.get(scope, 0)
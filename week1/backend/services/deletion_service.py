@@ -0,0 +1,94 @@
+"""Deleting resolutions, either outright or by soft delete plus a background purge.
+
+Every child table (check-ins, the reminder, AI jobs, similarity terms, stats)
+references ``resolutions`` with ``ON DELETE CASCADE`` and ``foreign_keys`` is
+on. A hard delete is therefore one ``DELETE`` on ``resolutions``: SQLite
+removes the children without SQLAlchemy loading them, and the rollup
+triggers still see every removed row. That statement still visits each
+check-in, so a resolution with a long history holds the write lock for a
+while.
+
+A soft delete only stamps ``deleted_at``, which is one UPDATE however many
+check-ins there are. ``purge`` then hard-deletes soft-deleted resolutions on
+a background thread, one per transaction. From the stamp on, the resolution
+endpoints treat the row as gone. Global aggregates (dashboard, search,
+analytics, export) include it until the purge has run, normally a moment
+after the response.
+"""
+import contextvars
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from ..database import get_session_factory
+from ..db_models import Resolution
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            # One purge at a time; SQLite has a single writer anyway.
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="resolution-purge")
+        return _executor
+
+
+def delete_resolutions(db: Session, resolution_ids: list[int], soft: bool = False) -> list[int]:
+    """Delete the live resolutions among ``resolution_ids`` and return their ids."""
+    live = (Resolution.id.in_(resolution_ids), Resolution.deleted_at.is_(None))
+    if soft:
+        statement = update(Resolution).where(*live).values(deleted_at=datetime.utcnow().isoformat())
+    else:
+        statement = delete(Resolution).where(*live)
+    statement = statement.returning(Resolution.id).execution_options(synchronize_session=False)
+    return sorted(db.scalars(statement).all())
+
+
+def purge() -> int:
+    """Hard-delete every soft-deleted resolution, one transaction each."""
+    purged = 0
+    session = get_session_factory()()
+    try:
+        while True:
+            resolution_id = session.scalar(select(Resolution.id).where(Resolution.deleted_at.is_not(None)).limit(1))
+            if resolution_id is None:
+                return purged
+            session.execute(delete(Resolution).where(Resolution.id == resolution_id))
+            session.commit()
+            purged += 1
+    finally:
+        session.close()
+
+
+def _run_purge() -> None:
+    try:
+        purged = purge()
+    except Exception:
+        logger.exception("Purging soft-deleted resolutions failed")
+        return
+    if purged:
+        logger.info("Purged %s soft-deleted resolutions", purged)
+
+
+def schedule_purge() -> None:
+    # The purge runs against the database of the tenant that scheduled it.
+    _get_executor().submit(contextvars.copy_context().run, _run_purge)
+
+
+def shutdown(wait: bool = True) -> None:
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        # Soft-deleted rows left behind are purged on next start.
+        executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,171 @@
+import contextvars
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Optional
+
+from ..database import get_session_factory
+from ..db_models import AiJob, CheckIn, Resolution
+from .ai_service import analyze_sentiment_and_feedback, is_fallback
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = 4
+MAX_ATTEMPTS = 3
+# Doubled after each failed attempt, so a struggling model is not hammered.
+RETRY_DELAY_SECONDS = 2.0
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+_executor: Optional[ThreadPoolExecutor] = None
+_retries: set[threading.Timer] = set()
+_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="ai-enrichment")
+        return _executor
+
+
+def enqueue(job_id: int) -> None:
+    # The job runs against the database of the tenant that queued it.
+    _get_executor().submit(contextvars.copy_context().run, _run_job, job_id)
+
+
+def _retry_later(job_id: int, attempts: int) -> None:
+    def _fire() -> None:
+        with _lock:
+            _retries.discard(timer)
+        enqueue(job_id)
+
+    # The timer thread starts with an empty context, so the tenant is carried over.
+    timer = threading.Timer(RETRY_DELAY_SECONDS * 2 ** (attempts - 1), contextvars.copy_context().run, (_fire,))
+    timer.daemon = True
+    with _lock:
+        _retries.add(timer)
+    timer.start()
+
+
+def recover_pending_jobs() -> int:
+    """Re-queue jobs left pending or running by a previous process."""
+    session = get_session_factory()()
+    try:
+        rows = session.query(AiJob.id).filter(AiJob.status.in_((JOB_PENDING, JOB_RUNNING))).all()
+    finally:
+        session.close()
+    for row in rows:
+        enqueue(row.id)
+    return len(rows)
+
+
+def shutdown(wait: bool = True) -> None:
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+        retries = list(_retries)
+        _retries.clear()
+    for timer in retries:
+        timer.cancel()
+    if executor is not None:
+        # Queued jobs stay pending in the database and are recovered on next start.
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def _claim_job(job_id: int) -> Optional[dict[str, Any]]:
+    session = get_session_factory()()
+    try:
+        job = session.get(AiJob, job_id)
+        if job is None or job.status in (JOB_DONE, JOB_FAILED):
+            return None
+        check_in = session.get(CheckIn, job.check_in_id)
+        resolution = session.get(Resolution, check_in.resolution_id) if check_in else None
+        if check_in is None or resolution is None or resolution.deleted_at:
+            return None
+
+        past = (
+            session.query(CheckIn.note, CheckIn.sentiment, CheckIn.created_at)
+            .filter(CheckIn.resolution_id == check_in.resolution_id, CheckIn.id != check_in.id)
+            .filter(CheckIn.created_at <= check_in.created_at)
+            .order_by(CheckIn.created_at.desc())
+            .limit(5)
+            .all()
+        )
+
+        job.status = JOB_RUNNING
+        job.attempts += 1
+        job.updated_at = datetime.utcnow().isoformat()
+        session.commit()
+
+        return {
+            "check_in_id": check_in.id,
+            "attempts": job.attempts,
+            "note": check_in.note,
+            "resolution_title": resolution.title,
+            "resolution_description": resolution.description,
+            "past_check_ins": [{"note": r.note, "sentiment": r.sentiment, "created_at": r.created_at} for r in past],
+        }
+    finally:
+        session.close()
+
+
+def _finish_job(job_id: int, ai_result: Optional[dict[str, Any]], error: Optional[str], retry: bool) -> None:
+    session = get_session_factory()()
+    try:
+        job = session.get(AiJob, job_id)
+        if job is None:
+            return
+        job.updated_at = datetime.utcnow().isoformat()
+        if ai_result is not None:
+            check_in = session.get(CheckIn, job.check_in_id)
+            if check_in is not None:
+                check_in.sentiment = ai_result["sentiment"]
+                check_in.sentiment_score = ai_result["sentiment_score"]
+                check_in.ai_feedback = ai_result["ai_feedback"]
+            job.status = JOB_DONE
+            job.error = None
+        else:
+            job.status = JOB_PENDING if retry else JOB_FAILED
+            job.error = error
+        session.commit()
+    finally:
+        session.close()
+
+
+def _run_job(job_id: int) -> None:
+    try:
+        context = _claim_job(job_id)
+    except Exception:
+        logger.exception("Could not claim AI job %s", job_id)
+        return
+    if context is None:
+        return
+
+    # No session is held open while waiting on the model.
+    try:
+        ai_result = analyze_sentiment_and_feedback(
+            note=context["note"],
+            resolution_title=context["resolution_title"],
+            resolution_description=context["resolution_description"],
+            past_check_ins=context["past_check_ins"],
+            # The deferred form of an interactive check-in; its feedback is read by a person.
+            require_feedback=True,
+        )
+        # A failed call comes back as the neutral default rather than raising.
+        if is_fallback(ai_result):
+            raise RuntimeError("AI analysis unavailable")
+    except Exception as exc:
+        logger.exception("AI job %s failed (attempt %s)", job_id, context["attempts"])
+        retry = context["attempts"] < MAX_ATTEMPTS
+        _finish_job(job_id, None, str(exc), retry)
+        if retry:
+            _retry_later(job_id, context["attempts"])
+        return
+
+    _finish_job(job_id, ai_result, None, False)
@@ -0,0 +1,387 @@
+"""Resumable re-analysis of historical check-ins, and optionally resolutions.
+
+Run after changing ``ai_service.MODEL_ID`` or a prompt::
+
+    python -m backend.services.reanalysis_service start [--categorize]
+
+Check-ins are walked in (resolution_id, created_at, id) order, ``CHUNK_SIZE``
+at a time. Each chunk goes through ``batch_service.analyze_many`` with the
+job's own rate limiter and a bounded pool, bypassing the local sentiment
+tier so every note gets the model's label and feedback. Its results are
+written with one bulk UPDATE in the same short transaction that advances the
+run's checkpoint in ``reanalysis_runs``. A crash loses at most the chunk in flight,
+and ``start`` picks the unfinished run up from its checkpoint. A note's
+context is the five check-ins before it with their stored labels, the same as
+the API would have used, so no chunk waits on another. Resolutions likewise
+get their most similar neighbours and the category counts, as on create.
+
+A fallback default is never written: the row keeps its previous analysis
+and counts as failed. If the Bedrock circuit opens, the chunk in flight is
+dropped and the run stops as ``interrupted``. One runner at a time per
+database.
+"""
+import argparse
+import logging
+import sys
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Any, Callable, NamedTuple, Optional
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from ..database import get_session_factory
+from ..db_models import CheckIn, ReanalysisRun, Resolution
+from . import ai_service
+from .batch_service import analyze_many, categorize_many
+from .circuit_breaker import OPEN
+from .rate_limiter import TokenBucket
+from .similarity_service import category_stats, find_similar
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 100
+MAX_CONCURRENCY = 4
+# Kept below the API's own budget so live requests keep their share of Bedrock.
+REQUESTS_PER_SECOND = 5.0
+PAST_CHECK_INS = 5
+
+RUN_RUNNING = "running"
+RUN_INTERRUPTED = "interrupted"
+RUN_COMPLETED = "completed"
+RUN_ABANDONED = "abandoned"
+
+PHASE_CHECK_INS = "check_ins"
+PHASE_RESOLUTIONS = "resolutions"
+
+
+class Progress(NamedTuple):
+    run_id: int
+    phase: str
+    processed: int
+    total: int
+    rows_per_second: float
+    eta_seconds: Optional[float]
+
+
+class _CircuitOpen(Exception):
+    pass
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
+
+
+def start_run(categorize: bool = False, restart: bool = False) -> int:
+    """Return the unfinished run to resume, or create one.
+
+    ``restart`` abandons any unfinished run and starts over.
+    """
+    with get_session_factory()() as db:
+        unfinished = db.scalars(
+            select(ReanalysisRun)
+            .where(ReanalysisRun.status.in_((RUN_RUNNING, RUN_INTERRUPTED)))
+            .order_by(ReanalysisRun.id.desc())
+        ).all()
+        if unfinished and not restart:
+            return unfinished[0].id
+        for run in unfinished:
+            run.status = RUN_ABANDONED
+            run.updated_at = _now()
+
+        total = db.scalar(select(func.count(CheckIn.id)))
+        if categorize:
+            total += db.scalar(select(func.count(Resolution.id)))
+        now = _now()
+        run = ReanalysisRun(
+            status=RUN_RUNNING,
+            model_id=ai_service.MODEL_ID,
+            categorize=int(categorize),
+            phase=PHASE_CHECK_INS,
+            total=total,
+            processed=0,
+            changed=0,
+            failed=0,
+            started_at=now,
+            updated_at=now,
+        )
+        db.add(run)
+        db.commit()
+        return run.id
+
+
+def resume(
+    run_id: int,
+    chunk_size: int = CHUNK_SIZE,
+    concurrency: int = MAX_CONCURRENCY,
+    limiter: Optional[TokenBucket] = None,
+    on_progress: Optional[Callable[[Progress], None]] = None,
+) -> dict[str, Any]:
+    """Process run ``run_id`` from its checkpoint until it completes or is interrupted."""
+    limiter = limiter or TokenBucket(rate=REQUESTS_PER_SECOND, capacity=REQUESTS_PER_SECOND)
+    session_factory = get_session_factory()
+    with session_factory() as db:
+        run = db.get(ReanalysisRun, run_id)
+        if run is None:
+            raise ValueError(f"No re-analysis run {run_id}")
+        if run.status in (RUN_COMPLETED, RUN_ABANDONED):
+            return _describe(run)
+        run.status = RUN_RUNNING
+        run.updated_at = _now()
+        db.commit()
+        started_with = run.processed
+
+    started = time.monotonic()
+    while True:
+        with session_factory() as db:
+            run = db.get(ReanalysisRun, run_id)
+            try:
+                if run.phase == PHASE_CHECK_INS:
+                    done = _check_in_chunk(db, run, chunk_size, concurrency, limiter)
+                else:
+                    done = _resolution_chunk(db, run, chunk_size, concurrency, limiter)
+            except _CircuitOpen:
+                db.rollback()
+                run = db.get(ReanalysisRun, run_id)
+                run.status = RUN_INTERRUPTED
+                run.updated_at = _now()
+                db.commit()
+                logger.warning("Bedrock circuit open; re-analysis run %s interrupted at %s rows", run_id, run.processed)
+                return _describe(run)
+
+            if done:
+                if run.phase == PHASE_CHECK_INS and run.categorize:
+                    run.phase = PHASE_RESOLUTIONS
+                    run.cursor_id = None
+                else:
+                    run.status = RUN_COMPLETED
+                    run.finished_at = _now()
+            run.updated_at = _now()
+            db.commit()
+
+            if on_progress is not None:
+                on_progress(_progress(run, run.processed - started_with, time.monotonic() - started))
+            if run.status == RUN_COMPLETED:
+                return _describe(run)
+
+
+def _progress(run: ReanalysisRun, processed_here: int, elapsed: float) -> Progress:
+    rate = processed_here / elapsed if elapsed > 0 else 0.0
+    remaining = max(run.total - run.processed, 0)
+    eta = remaining / rate if rate else None
+    return Progress(run.id, run.phase, run.processed, run.total, rate, eta)
+
+
+def _describe(run: ReanalysisRun) -> dict[str, Any]:
+    return {
+        "id": run.id,
+        "status": run.status,
+        "phase": run.phase,
+        "model_id": run.model_id,
+        "total": run.total,
+        "processed": run.processed,
+        "changed": run.changed,
+        "failed": run.failed,
+        "started_at": run.started_at,
+        "finished_at": run.finished_at,
+    }
+
+
+def _check_fallbacks(results: list[dict[str, Any]]) -> list[bool]:
+    fallbacks = [ai_service.is_fallback(result) for result in results]
+    if any(fallbacks) and ai_service.breaker_stats()["state"] == OPEN:
+        raise _CircuitOpen()
+    return fallbacks
+
+
+def _check_in_chunk(
+    db: Session, run: ReanalysisRun, chunk_size: int, concurrency: int, limiter: TokenBucket
+) -> bool:
+    query = (
+        select(
+            CheckIn.id, CheckIn.resolution_id, CheckIn.note, CheckIn.sentiment, CheckIn.created_at,
+            Resolution.title, Resolution.description,
+        )
+        .join(Resolution, CheckIn.resolution_id == Resolution.id)
+        .order_by(CheckIn.resolution_id, CheckIn.created_at, CheckIn.id)
+        .limit(chunk_size)
+    )
+    if run.cursor_id is not None:
+        query = query.where(_after(run.cursor_resolution_id, run.cursor_created_at, run.cursor_id))
+    rows = db.execute(query).all()
+    if not rows:
+        return True
+
+    # Seed the first resolution's history with the rows before the checkpoint.
+    first = rows[0]
+    earlier = db.execute(
+        select(CheckIn.note, CheckIn.sentiment, CheckIn.created_at)
+        .where(CheckIn.resolution_id == first.resolution_id, _before(first.created_at, first.id))
+        .order_by(CheckIn.created_at.desc(), CheckIn.id.desc())
+        .limit(PAST_CHECK_INS)
+    ).all()
+    history: dict[int, deque] = defaultdict(lambda: deque(maxlen=PAST_CHECK_INS))
+    history[first.resolution_id].extend(reversed(earlier))
+
+    items = []
+    for row in rows:
+        past = history[row.resolution_id]
+        items.append({
+            "note": row.note,
+            "resolution_title": row.title,
+            "resolution_description": row.description,
+            "past_check_ins": [{"note": p.note, "sentiment": p.sentiment, "created_at": p.created_at} for p in reversed(past)],
+        })
+        past.append(row)
+    # Release the read transaction while waiting on the model.
+    db.rollback()
+
+    # The point of a re-run is the model's answer; a local label would replace stored feedback with stock text.
+    results = analyze_many(items, concurrency=concurrency, limiter=limiter, require_feedback=True)
+    fallbacks = _check_fallbacks(results)
+    updates = [
+        {"id": row.id, **result}
+        for row, result, fallback in zip(rows, results, fallbacks)
+        if not fallback
+    ]
+    if updates:
+        db.execute(update(CheckIn), updates)
+
+    last = rows[-1]
+    run.cursor_resolution_id, run.cursor_created_at, run.cursor_id = last.resolution_id, last.created_at, last.id
+    run.processed += len(rows)
+    run.failed += sum(fallbacks)
+    run.changed += sum(
+        1 for row, result, fallback in zip(rows, results, fallbacks)
+        if not fallback and result["sentiment"] != row.sentiment
+    )
+    return len(rows) < chunk_size
+
+
+def _after(resolution_id: int, created_at: str, check_in_id: int):
+    return or_(
+        CheckIn.resolution_id > resolution_id,
+        and_(CheckIn.resolution_id == resolution_id, CheckIn.created_at > created_at),
+        and_(CheckIn.resolution_id == resolution_id, CheckIn.created_at == created_at, CheckIn.id > check_in_id),
+    )
+
+
+def _before(created_at: str, check_in_id: int):
+    return or_(CheckIn.created_at < created_at, and_(CheckIn.created_at == created_at, CheckIn.id < check_in_id))
+
+
+def _resolution_chunk(
+    db: Session, run: ReanalysisRun, chunk_size: int, concurrency: int, limiter: TokenBucket
+) -> bool:
+    query = (
+        select(Resolution.id, Resolution.title, Resolution.description, Resolution.category, Resolution.priority)
+        .order_by(Resolution.id)
+        .limit(chunk_size)
+    )
+    if run.cursor_id is not None:
+        query = query.where(Resolution.id > run.cursor_id)
+    rows = db.execute(query).all()
+    if not rows:
+        return True
+    # The same context the create endpoint gives the model, minus the resolution itself.
+    stats = category_stats(db)
+    items = [
+        {
+            "title": r.title,
+            "description": r.description,
+            "existing_resolutions": find_similar(db, r.title, r.description, exclude_id=r.id),
+            "category_stats": stats,
+        }
+        for r in rows
+    ]
+    db.rollback()
+
+    results = categorize_many(items, concurrency=concurrency, limiter=limiter)
+    fallbacks = _check_fallbacks(results)
+    now = _now()
+    updates = [
+        {"id": row.id, "category": result["category"], "priority": result["priority"], "updated_at": now}
+        for row, result, fallback in zip(rows, results, fallbacks)
+        if not fallback
+    ]
+    if updates:
+        db.execute(update(Resolution), updates)
+
+    run.cursor_id = rows[-1].id
+    run.processed += len(rows)
+    run.failed += sum(fallbacks)
+    run.changed += sum(
+        1 for row, result, fallback in zip(rows, results, fallbacks)
+        if not fallback and (result["category"], result["priority"]) != (row.category, row.priority)
+    )
+    return len(rows) < chunk_size
+
+
+def list_runs(limit: int = 10) -> list[dict[str, Any]]:
+    with get_session_factory()() as db:
+        runs = db.scalars(select(ReanalysisRun).order_by(ReanalysisRun.id.desc()).limit(limit)).all()
+        return [_describe(run) for run in runs]
+
+
+def _format_eta(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "?"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+def _print_progress(progress: Progress) -> None:
+    print(
+        f"run {progress.run_id} {progress.phase}: {progress.processed}/{progress.total} rows, "
+        f"{progress.rows_per_second:.1f} rows/s, ETA {_format_eta(progress.eta_seconds)}",
+        file=sys.stderr,
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from ..database import DEFAULT_TENANT, use_tenant, validate_tenant
+
+    parser = argparse.ArgumentParser(description="Re-run AI analysis over stored check-ins and resolutions.")
+    parser.add_argument("--tenant", type=validate_tenant, default=DEFAULT_TENANT, help="tenant database to use (default: %(default)s)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    start_parser = subparsers.add_parser("start", help="start a run, or resume the unfinished one")
+    start_parser.add_argument("--categorize", action="store_true", help="also re-categorize resolutions")
+    start_parser.add_argument("--restart", action="store_true", help="abandon any unfinished run and start over")
+    start_parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    start_parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENCY)
+    start_parser.add_argument("--rate", type=float, default=REQUESTS_PER_SECOND, help="Bedrock calls per second")
+    subparsers.add_parser("status", help="list recent runs")
+    args = parser.parse_args(argv)
+
+    with use_tenant(args.tenant):
+        return _run(args)
+
+
+def _run(args: argparse.Namespace) -> int:
+    from ..database import init_db
+
+    init_db()
+    if args.command == "status":
+        for run in list_runs():
+            print(
+                f"{run['id']}\t{run['status']}\t{run['phase']}\t{run['processed']}/{run['total']}\t"
+                f"changed={run['changed']}\tfailed={run['failed']}\t{run['model_id']}"
+            )
+        return 0
+
+    run_id = start_run(categorize=args.categorize, restart=args.restart)
+    result = resume(
+        run_id,
+        chunk_size=args.chunk_size,
+        concurrency=args.concurrency,
+        limiter=TokenBucket(rate=args.rate, capacity=args.rate),
+        on_progress=_print_progress,
+    )
+    print(", ".join(f"{key}={result[key]}" for key in ("id", "status", "processed", "changed", "failed")))
+    return 0 if result["status"] == RUN_COMPLETED else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
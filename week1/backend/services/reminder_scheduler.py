@@ -0,0 +1,244 @@
+import asyncio
+import heapq
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Optional
+
+from ..database import DEFAULT_TENANT, current_tenant, get_session_factory
+from ..db_models import Reminder, Resolution
+
+logger = logging.getLogger(__name__)
+
+TICK_SECONDS = 60.0
+SUBSCRIBER_QUEUE_SIZE = 100
+
+EVENT_DUE = "due"
+EVENT_CLEARED = "cleared"
+
+
+@dataclass
+class _Entry:
+    resolution_id: int
+    resolution_title: str
+    frequency: str
+    next_due: str
+
+    def _to_dict(self) -> dict[str, Any]:
+        return {
+            "resolution_id": self.resolution_id,
+            "resolution_title": self.resolution_title,
+            "frequency": self.frequency,
+            "next_due": self.next_due,
+        }
+
+
+class ReminderSchedule:
+    """Min-heap of upcoming reminders plus the set that is already due.
+
+    Heap items are ``(next_due, resolution_id)``; superseded items are skipped
+    lazily when they reach the top.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[int, _Entry] = {}
+        self._heap: list[tuple[str, int]] = []
+        self._due: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def upsert(self, entry: _Entry, today: str) -> list[tuple[str, _Entry]]:
+        """Insert or replace a reminder and return the events the change caused."""
+        was_due = entry.resolution_id in self._due
+        self._entries[entry.resolution_id] = entry
+        if entry.next_due <= today:
+            self._due.add(entry.resolution_id)
+            return [(EVENT_DUE, entry)]
+        self._due.discard(entry.resolution_id)
+        heapq.heappush(self._heap, (entry.next_due, entry.resolution_id))
+        return [(EVENT_CLEARED, entry)] if was_due else []
+
+    def reschedule(self, resolution_id: int, frequency: str, next_due: str, today: str) -> list[tuple[str, _Entry]]:
+        """Update the due date of a scheduled reminder; unscheduled ones stay out."""
+        entry = self._entries.get(resolution_id)
+        if entry is None:
+            return []
+        return self.upsert(_Entry(resolution_id, entry.resolution_title, frequency, next_due), today)
+
+    def discard(self, resolution_id: int) -> list[tuple[str, _Entry]]:
+        entry = self._entries.pop(resolution_id, None)
+        if entry is not None and resolution_id in self._due:
+            self._due.discard(resolution_id)
+            return [(EVENT_CLEARED, entry)]
+        return []
+
+    def advance(self, today: str) -> list[tuple[str, _Entry]]:
+        """Move every reminder due on or before ``today`` from the heap into the due set."""
+        events = []
+        while self._heap and self._heap[0][0] <= today:
+            next_due, resolution_id = heapq.heappop(self._heap)
+            entry = self._entries.get(resolution_id)
+            if entry is None or entry.next_due != next_due or resolution_id in self._due:
+                continue
+            self._due.add(resolution_id)
+            events.append((EVENT_DUE, entry))
+        return events
+
+    def due(self) -> list[_Entry]:
+        return sorted((self._entries[rid] for rid in self._due), key=lambda e: (e.next_due, e.resolution_id))
+
+
+_schedule: Optional[ReminderSchedule] = None
+_lock = threading.Lock()
+_subscribers: dict[asyncio.Queue, asyncio.AbstractEventLoop] = {}
+_task: Optional[asyncio.Task] = None
+
+
+def _today() -> str:
+    return date.today().isoformat()
+
+
+def is_running() -> bool:
+    """Whether due reminders for the current tenant are served from memory.
+
+    Only the default tenant is scheduled in memory; other tenants fall back to
+    querying their own database.
+    """
+    return _schedule is not None and current_tenant() == DEFAULT_TENANT
+
+
+def load() -> int:
+    """Build the schedule from active reminders on active resolutions."""
+    global _schedule
+    session = get_session_factory()()
+    try:
+        rows = (
+            session.query(Reminder.resolution_id, Reminder.frequency, Reminder.next_due, Resolution.title)
+            .join(Resolution, Reminder.resolution_id == Resolution.id)
+            .filter(Reminder.is_active == 1, Resolution.status == "active", Resolution.deleted_at.is_(None))
+            .all()
+        )
+    finally:
+        session.close()
+
+    schedule = ReminderSchedule()
+    today = _today()
+    for row in rows:
+        schedule.upsert(_Entry(row.resolution_id, row.title, row.frequency, row.next_due), today)
+    with _lock:
+        _schedule = schedule
+    return len(rows)
+
+
+def unload() -> None:
+    global _schedule
+    with _lock:
+        _schedule = None
+
+
+async def start() -> None:
+    global _task
+    count = load()
+    logger.info("Reminder scheduler loaded %d reminders", count)
+    _task = asyncio.create_task(_run())
+
+
+async def stop() -> None:
+    global _task
+    task, _task = _task, None
+    if task is not None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    unload()
+
+
+async def _run() -> None:
+    # Reminders become due at day boundaries; a short tick keeps the wake-up
+    # simple and robust to clock changes while costing O(1) when nothing is due.
+    while True:
+        tick()
+        await asyncio.sleep(TICK_SECONDS)
+
+
+def tick(today: Optional[str] = None) -> int:
+    with _lock:
+        if _schedule is None:
+            return 0
+        events = _schedule.advance(today or _today())
+    _publish(events)
+    return len(events)
+
+
+def track(resolution_id: int, title: str, status: str, reminder: Optional[Reminder]) -> None:
+    """Apply a committed reminder or resolution change to the schedule."""
+    if reminder is None or not reminder.is_active or status != "active":
+        discard(resolution_id)
+        return
+    entry = _Entry(resolution_id, title, reminder.frequency, reminder.next_due)
+    with _lock:
+        if not is_running():
+            return
+        events = _schedule.upsert(entry, _today())
+    _publish(events)
+
+
+def reschedule(resolution_id: int, reminder: Optional[Reminder]) -> None:
+    """Move an already scheduled reminder after a check-in advanced it."""
+    if reminder is None:
+        return
+    with _lock:
+        if not is_running():
+            return
+        events = _schedule.reschedule(resolution_id, reminder.frequency, reminder.next_due, _today())
+    _publish(events)
+
+
+def discard(resolution_id: int) -> None:
+    with _lock:
+        if not is_running():
+            return
+        events = _schedule.discard(resolution_id)
+    _publish(events)
+
+
+def due() -> list[dict[str, Any]]:
+    with _lock:
+        if _schedule is None:
+            return []
+        return [e._to_dict() for e in _schedule.due()]
+
+
+def subscribe() -> asyncio.Queue:
+    queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+    with _lock:
+        _subscribers[queue] = asyncio.get_running_loop()
+    return queue
+
+
+def unsubscribe(queue: asyncio.Queue) -> None:
+    with _lock:
+        _subscribers.pop(queue, None)
+
+
+def _offer(queue: asyncio.Queue, event: dict[str, Any]) -> None:
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        logger.warning("Dropping reminder event for a slow subscriber")
+
+
+def _publish(events: list[tuple[str, _Entry]]) -> None:
+    if not events:
+        return
+    with _lock:
+        subscribers = list(_subscribers.items())
+    for name, entry in events:
+        event = {"event": name, "data": entry._to_dict()}
+        for queue, loop in subscribers:
+            # Changes may be applied from worker threads as well as the event loop.
+            loop.call_soon_threadsafe(_offer, queue, event)
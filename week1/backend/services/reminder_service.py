@@ -1,4 +1,7 @@
 from datetime import date, timedelta
+from typing import Optional
+from sqlalchemy.orm import Session
+from ..db_models import Reminder
 
 
 def advance_next_due(current_due: str, frequency: str) -> str:
@@ -14,3 +17,14 @@ def advance_next_due(current_due: str, frequency: str) -> str:
     }
     delta = deltas.get(frequency, timedelta(weeks=1))
     return (base + delta).isoformat()
+
+
+def advance_active_reminder(db: Session, resolution_id: int) -> Optional[Reminder]:
+    reminder = (
+        db.query(Reminder)
+        .filter(Reminder.resolution_id == resolution_id, Reminder.is_active == 1)
+        .first()
+    )
+    if reminder:
+        reminder.next_due = advance_next_due(reminder.next_due, reminder.frequency)
+    return reminder
@@ -0,0 +1,282 @@
+"""Per-resolution ``resolution_stats`` rollup maintained by SQLite triggers.
+
+Each resolution has one row with its check-in count, current and longest
+daily streak, check-ins per ISO week (a JSON object keyed ``YYYY-Www``), the
+average sentiment score of its last ``ROLLING_WINDOW`` scored check-ins and
+its latest check-in time. Days and weeks are taken from ``created_at``, which
+is UTC.
+
+A check-in that is not older than the resolution's latest one, which is every
+check-in ``create_check_in`` writes, updates the row in constant time: counters
+and the week bucket are bumped, the streak extends or restarts from
+``last_check_in_at``, and the rolling average reads at most
+``ROLLING_WINDOW`` rows off the ``(resolution_id, created_at)`` index.
+Back-dated inserts, deletes and moved check-ins recompute the streaks of the
+one resolution they touch. When a resolution is deleted its check-ins go by
+``ON DELETE CASCADE`` after the resolution row, so the delete trigger skips
+them and the stats row cascades away too. ``current_streak`` is stored as of
+the latest check-in; readers drop it to 0 once a full day has passed without
+one.
+
+Bulk writers (batch check-ins, imports) write inside ``deferred``: the
+check-in triggers stand down while a row sits in ``resolution_stats_paused``,
+and each touched resolution is recomputed once when the block ends. That row
+only ever exists inside the writer's own transaction, so no other connection
+sees it.
+"""
+import argparse
+import json
+import sys
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Any, Iterator, Optional, Union
+
+from sqlalchemy import case, func, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from ..db_models import ResolutionStats
+
+ROLLING_WINDOW = 7
+
+_ROW = "resolution_stats.resolution_id"
+
+
+def _iso_week(value: str) -> str:
+    # SQLite before 3.46 has no %G/%V; the ISO week is the week of that week's Thursday.
+    thursday = f"date({value}, '-' || ((strftime('%w', {value}) + 6) % 7) || ' days', '+3 days')"
+    return f"strftime('%Y', {thursday}) || '-W' || printf('%02d', (strftime('%j', {thursday}) - 1) / 7 + 1)"
+
+
+def iso_week(day: date) -> str:
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _week_path(row: str) -> str:
+    return f"'$.\"' || {_iso_week(f'{row}.created_at')} || '\"'"
+
+
+# Consecutive-day runs of one resolution, as (length, grp) with grp increasing over time.
+_DAY_RUNS = f"""
+    SELECT count(*) AS length, grp FROM (
+        SELECT julianday(day) - row_number() OVER (ORDER BY day) AS grp FROM (
+            SELECT DISTINCT date(created_at) AS day FROM check_ins WHERE resolution_id = {_ROW}
+        )
+    ) GROUP BY grp"""
+
+# Column -> expression recomputing it from check_ins for the row being updated.
+_EXPRESSIONS = {
+    "check_in_count": f"(SELECT count(*) FROM check_ins WHERE resolution_id = {_ROW})",
+    "current_streak": f"coalesce((SELECT length FROM ({_DAY_RUNS}) ORDER BY grp DESC LIMIT 1), 0)",
+    "longest_streak": f"coalesce((SELECT max(length) FROM ({_DAY_RUNS})), 0)",
+    "last_check_in_at": f"(SELECT max(created_at) FROM check_ins WHERE resolution_id = {_ROW})",
+    "weekly_check_ins": f"""(SELECT coalesce(json_group_object(week, n), '{{}}') FROM (
+        SELECT {_iso_week('created_at')} AS week, count(*) AS n FROM check_ins
+        WHERE resolution_id = {_ROW} GROUP BY week))""",
+    "rolling_sentiment": f"""(SELECT avg(sentiment_score) FROM (
+        SELECT sentiment_score FROM check_ins WHERE resolution_id = {_ROW} AND sentiment_score IS NOT NULL
+        ORDER BY created_at DESC, id DESC LIMIT {ROLLING_WINDOW}))""",
+}
+_COLUMNS = list(_EXPRESSIONS)
+
+
+def _recompute(columns: list[str], where: str) -> str:
+    assignments = ", ".join(f"{c} = {_EXPRESSIONS[c]}" for c in columns)
+    return f"UPDATE resolution_stats SET {assignments} WHERE {where};"
+
+
+def _next_streak(row: str) -> str:
+    return (
+        f"CASE WHEN last_check_in_at IS NULL THEN 1 "
+        f"WHEN date({row}.created_at) = date(last_check_in_at) THEN current_streak "
+        f"WHEN julianday(date({row}.created_at)) - julianday(date(last_check_in_at)) = 1 THEN current_streak + 1 "
+        f"ELSE 1 END"
+    )
+
+
+_STREAKS = ["current_streak", "longest_streak"]
+
+CREATE_PAUSE_TABLE = "CREATE TABLE IF NOT EXISTS resolution_stats_paused (paused INTEGER)"
+_ACTIVE = "NOT EXISTS (SELECT 1 FROM resolution_stats_paused)"
+
+# Names of the triggers that stand down inside ``deferred``.
+CHECK_IN_TRIGGERS = (
+    "trg_resolution_stats_check_in_insert",
+    "trg_resolution_stats_check_in_delete",
+    "trg_resolution_stats_check_in_score",
+    "trg_resolution_stats_check_in_moved",
+)
+
+TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS trg_resolution_stats_resolution_insert AFTER INSERT ON resolutions BEGIN
+        INSERT OR IGNORE INTO resolution_stats (resolution_id) VALUES (NEW.id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_resolution_stats_check_in_insert AFTER INSERT ON check_ins
+    WHEN {_ACTIVE} BEGIN
+        INSERT OR IGNORE INTO resolution_stats (resolution_id) VALUES (NEW.resolution_id);
+        UPDATE resolution_stats SET
+            check_in_count = check_in_count + 1,
+            weekly_check_ins = json_set(weekly_check_ins, {_week_path("NEW")},
+                coalesce(json_extract(weekly_check_ins, {_week_path("NEW")}), 0) + 1),
+            rolling_sentiment = CASE WHEN NEW.sentiment_score IS NULL THEN rolling_sentiment
+                ELSE {_EXPRESSIONS["rolling_sentiment"]} END
+        WHERE resolution_id = NEW.resolution_id;
+        UPDATE resolution_stats SET
+            current_streak = {_next_streak("NEW")},
+            longest_streak = max(longest_streak, {_next_streak("NEW")}),
+            last_check_in_at = max(coalesce(last_check_in_at, ''), NEW.created_at)
+        WHERE resolution_id = NEW.resolution_id
+            AND (last_check_in_at IS NULL OR date(NEW.created_at) >= date(last_check_in_at));
+        {_recompute(_STREAKS, "resolution_id = NEW.resolution_id AND date(NEW.created_at) < date(last_check_in_at)")}
+    END""",
+    # Skipped once the resolution or its row is gone, i.e. when the delete cascades from the resolution.
+    f"""CREATE TRIGGER IF NOT EXISTS trg_resolution_stats_check_in_delete AFTER DELETE ON check_ins
+    WHEN {_ACTIVE}
+        AND EXISTS (SELECT 1 FROM resolution_stats WHERE resolution_id = OLD.resolution_id)
+        AND EXISTS (SELECT 1 FROM resolutions WHERE id = OLD.resolution_id) BEGIN
+        UPDATE resolution_stats SET
+            check_in_count = check_in_count - 1,
+            weekly_check_ins = CASE
+                WHEN coalesce(json_extract(weekly_check_ins, {_week_path("OLD")}), 0) <= 1
+                    THEN json_remove(weekly_check_ins, {_week_path("OLD")})
+                ELSE json_set(weekly_check_ins, {_week_path("OLD")}, json_extract(weekly_check_ins, {_week_path("OLD")}) - 1) END
+        WHERE resolution_id = OLD.resolution_id;
+        {_recompute(["last_check_in_at", "rolling_sentiment"], "resolution_id = OLD.resolution_id")}
+        {_recompute(_STREAKS, '''resolution_id = OLD.resolution_id AND NOT EXISTS (
+            SELECT 1 FROM check_ins WHERE resolution_id = OLD.resolution_id
+            AND created_at >= date(OLD.created_at) AND created_at < date(OLD.created_at, '+1 day'))''')}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_resolution_stats_check_in_score AFTER UPDATE OF sentiment_score ON check_ins
+    WHEN {_ACTIVE} BEGIN
+        {_recompute(["rolling_sentiment"], "resolution_id = NEW.resolution_id")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_resolution_stats_check_in_moved AFTER UPDATE OF resolution_id, created_at ON check_ins
+    WHEN {_ACTIVE} AND (OLD.resolution_id IS NOT NEW.resolution_id OR OLD.created_at IS NOT NEW.created_at) BEGIN
+        INSERT OR IGNORE INTO resolution_stats (resolution_id) VALUES (NEW.resolution_id);
+        {_recompute(_COLUMNS, "resolution_id IN (OLD.resolution_id, NEW.resolution_id)")}
+    END""",
+]
+
+
+def install_triggers(conn: Connection) -> None:
+    conn.exec_driver_sql(CREATE_PAUSE_TABLE)
+    for statement in TRIGGERS:
+        conn.exec_driver_sql(statement)
+
+
+def rebuild(conn: Connection) -> None:
+    """Recompute every resolution's row from the base tables."""
+    conn.exec_driver_sql("INSERT OR IGNORE INTO resolution_stats (resolution_id) SELECT id FROM resolutions")
+    conn.exec_driver_sql(_recompute(_COLUMNS, "1"))
+
+
+def refresh(db: Union[Session, Connection], resolution_ids: set[int]) -> None:
+    """Recompute the rows of ``resolution_ids`` from the base tables."""
+    if not resolution_ids:
+        return
+    ids = {"ids": json.dumps(sorted(resolution_ids))}
+    db.execute(
+        text(
+            "INSERT OR IGNORE INTO resolution_stats (resolution_id) "
+            "SELECT id FROM resolutions WHERE id IN (SELECT value FROM json_each(:ids))"
+        ),
+        ids,
+    )
+    db.execute(text(_recompute(_COLUMNS, "resolution_id IN (SELECT value FROM json_each(:ids))")), ids)
+
+
+@contextmanager
+def deferred(db: Union[Session, Connection]) -> Iterator[set[int]]:
+    """Skip per-row maintenance for the check-ins written in the block.
+
+    Add every resolution whose check-ins the block writes to the yielded set;
+    their rows are recomputed once on the way out. Use it inside a transaction:
+    if the block raises, the rollback also removes the pause.
+    """
+    touched: set[int] = set()
+    db.execute(text("INSERT INTO resolution_stats_paused (paused) VALUES (1)"))
+    yield touched
+    db.execute(text("DELETE FROM resolution_stats_paused"))
+    refresh(db, touched)
+
+
+def _normalize(column: str, value: Any) -> Any:
+    if column == "weekly_check_ins":
+        return json.loads(value or "{}")
+    if column == "rolling_sentiment" and value is not None:
+        return round(value, 6)
+    return value
+
+
+def check(conn: Connection) -> dict[int, dict[str, tuple[Any, Any]]]:
+    """Return ``{resolution_id: {column: (stored, expected)}}`` for every drifted row."""
+    selected = ", ".join(f"{c}, {_EXPRESSIONS[c]} AS expected_{c}" for c in _COLUMNS)
+    drift: dict[int, dict[str, tuple[Any, Any]]] = {}
+    for row in conn.execute(text(f"SELECT resolution_id, {selected} FROM resolution_stats")).mappings():
+        columns = {}
+        for column in _COLUMNS:
+            stored, expected = _normalize(column, row[column]), _normalize(column, row[f"expected_{column}"])
+            if stored != expected:
+                columns[column] = (stored, expected)
+        if columns:
+            drift[row["resolution_id"]] = columns
+    missing = conn.execute(text(
+        "SELECT id FROM resolutions WHERE id NOT IN (SELECT resolution_id FROM resolution_stats)"
+    )).scalars()
+    for resolution_id in missing:
+        drift[resolution_id] = {"row": (None, "present")}
+    return drift
+
+
+def summary_columns(today: date) -> tuple:
+    """Stats columns for list responses, with streaks and the week as of ``today``."""
+    return (
+        ResolutionStats.check_in_count,
+        case(
+            (func.date(ResolutionStats.last_check_in_at) >= (today - timedelta(days=1)).isoformat(), ResolutionStats.current_streak),
+            else_=0,
+        ).label("current_streak"),
+        ResolutionStats.longest_streak,
+        ResolutionStats.last_check_in_at,
+        func.round(ResolutionStats.rolling_sentiment, 2).label("rolling_sentiment"),
+        func.coalesce(
+            func.json_extract(ResolutionStats.weekly_check_ins, f'$."{iso_week(today)}"'), 0
+        ).label("check_ins_this_week"),
+    )
+
+
+def weekly_adherence(weekly_check_ins: dict[str, int], created_at: str, today: date) -> float:
+    """Share of ISO weeks since the resolution was created that have a check-in."""
+    created = date.fromisoformat(created_at[:10])
+    first_week = iso_week(created)
+    elapsed = ((today - timedelta(days=today.weekday())) - (created - timedelta(days=created.weekday()))).days // 7 + 1
+    active = sum(1 for week in weekly_check_ins if first_week <= week <= iso_week(today))
+    return round(min(active / max(elapsed, 1), 1.0), 2)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from ..database import DEFAULT_TENANT, _get_engine, init_db, use_tenant, validate_tenant
+
+    parser = argparse.ArgumentParser(description="Maintain the resolution_stats rollup.")
+    parser.add_argument("--tenant", type=validate_tenant, default=DEFAULT_TENANT, help="tenant database to use (default: %(default)s)")
+    parser.add_argument("command", choices=["rebuild", "check"])
+    args = parser.parse_args(argv)
+
+    with use_tenant(args.tenant):
+        init_db()
+        with _get_engine().begin() as conn:
+            if args.command == "rebuild":
+                rebuild(conn)
+            drift = check(conn)
+    for resolution_id, columns in drift.items():
+        for column, (stored, expected) in columns.items():
+            print(f"resolution {resolution_id} {column}: stored={stored} expected={expected}")
+    if drift:
+        return 1
+    print("resolution_stats is consistent")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+"""FTS5 index over check-in text, kept in sync by SQLite triggers.
+
+``check_in_search`` holds one row per check-in (``rowid`` = check-in id) with
+the note, the AI feedback and a copy of the resolution's title and
+description, so a single MATCH covers all four and ``bm25`` ranks them.
+
+Filters are indexed too: the ``scope`` column carries one token each for the
+resolution (``~r12``), the sentiment (``~spositive``) and the month
+(``~m202603``). ``~`` is a token character here but never part of a query
+word, so user input cannot reach those tokens.
+"""
+import html
+import re
+from typing import Any, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from ..pagination import decode_cursor, encode_cursor
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+# highlight() wraps matches in these private-use characters; they become the
+# tags above once the text around them has been escaped.
+_MARK_START = "\ue000"
+_MARK_END = "\ue001"
+
+# Column weights for bm25: note, ai_feedback, resolution_title, resolution_description, scope.
+RANK_WEIGHTS = (4.0, 1.0, 2.0, 1.0, 0.0)
+MAX_RANKED_CANDIDATES = 500
+MAX_MONTH_TOKENS = 36
+
+# bm25 walks the whole posting list of every query term to weigh it, so words
+# that appear in most notes are dropped unless the query has nothing else.
+STOPWORDS = frozenset(
+    "a am an and are as at be but by did do for had has have i in is it me my of on or so "
+    "that the this to was we were with".split()
+)
+
+CREATE_TABLE = """CREATE VIRTUAL TABLE IF NOT EXISTS check_in_search USING fts5(
+    note, ai_feedback, resolution_title, resolution_description, scope,
+    tokenize = "porter unicode61 remove_diacritics 2 tokenchars '~'"
+)"""
+
+
+def _scope(row: str) -> str:
+    return (
+        f"'~r' || {row}.resolution_id || coalesce(' ~s' || {row}.sentiment, '') "
+        f"|| ' ~m' || substr({row}.created_at, 1, 4) || substr({row}.created_at, 6, 2)"
+    )
+
+
+TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS trg_search_check_in_insert AFTER INSERT ON check_ins BEGIN
+        INSERT INTO check_in_search (rowid, note, ai_feedback, resolution_title, resolution_description, scope)
+        SELECT NEW.id, NEW.note, coalesce(NEW.ai_feedback, ''), r.title, r.description, {_scope("NEW")}
+        FROM resolutions r WHERE r.id = NEW.resolution_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_search_check_in_update
+    AFTER UPDATE OF note, ai_feedback, sentiment ON check_ins BEGIN
+        UPDATE check_in_search SET note = NEW.note, ai_feedback = coalesce(NEW.ai_feedback, ''), scope = {_scope("NEW")}
+        WHERE rowid = NEW.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_search_check_in_delete AFTER DELETE ON check_ins BEGIN
+        DELETE FROM check_in_search WHERE rowid = OLD.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_search_resolution_text AFTER UPDATE OF title, description ON resolutions
+    WHEN OLD.title IS NOT NEW.title OR OLD.description IS NOT NEW.description BEGIN
+        UPDATE check_in_search SET resolution_title = NEW.title, resolution_description = NEW.description
+        WHERE rowid IN (SELECT id FROM check_ins WHERE resolution_id = NEW.id);
+    END""",
+]
+
+
+def install(conn: Connection) -> None:
+    conn.exec_driver_sql(CREATE_TABLE)
+    for trigger in TRIGGERS:
+        conn.exec_driver_sql(trigger)
+
+
+def rebuild(conn: Connection) -> int:
+    conn.exec_driver_sql("DELETE FROM check_in_search")
+    result = conn.exec_driver_sql(
+        "INSERT INTO check_in_search (rowid, note, ai_feedback, resolution_title, resolution_description, scope) "
+        f"SELECT c.id, c.note, coalesce(c.ai_feedback, ''), r.title, r.description, {_scope('c')} "
+        "FROM check_ins c JOIN resolutions r ON r.id = c.resolution_id"
+    )
+    return result.rowcount
+
+
+def _months(created_from: str, created_to: str) -> Optional[list[str]]:
+    year, month = int(created_from[:4]), int(created_from[5:7])
+    end = (int(created_to[:4]), int(created_to[5:7]))
+    months = []
+    while (year, month) <= end:
+        if len(months) == MAX_MONTH_TOKENS:
+            return None
+        months.append(f"~m{year:04d}{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def match_terms(q: str) -> str:
+    """Turn free text into an FTS5 query in which every word must match.
+
+    Quoting each word keeps user input from being parsed as FTS5 syntax.
+    """
+    words = [w.lower() for w in re.findall(r"\w+", q)]
+    if not words:
+        raise HTTPException(status_code=400, detail="Search query must contain a word")
+    words = [w for w in words if w not in STOPWORDS] or words
+    return " ".join(f'"{w}"' for w in words)
+
+
+def scope_terms(
+    resolution_id: Optional[int] = None,
+    sentiment: Optional[str] = None,
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None,
+) -> list[str]:
+    """Scope tokens that narrow candidates; the exact filters still run on ``check_ins``."""
+    terms = []
+    if resolution_id is not None:
+        terms.append(f'"~r{resolution_id}"')
+    if sentiment is not None and re.fullmatch(r"\w+", sentiment):
+        terms.append(f'"~s{sentiment}"')
+    if created_from is not None and created_to is not None:
+        months = _months(created_from, created_to)
+        if months:
+            terms.append("(" + " OR ".join(f'"{m}"' for m in months) + ")")
+    return terms
+
+
+def _with_scope(terms: str, scope: list[str]) -> str:
+    return f"{terms} AND scope : ({' AND '.join(scope)})" if scope else terms
+
+
+def _rows(db: Session, clauses: list[str], order: str, params: dict[str, Any]) -> list[dict[str, Any]]:
+    weights = ", ".join(str(w) for w in RANK_WEIGHTS)
+    rows = db.execute(
+        text(
+            f"""SELECT c.id, c.resolution_id, c.note, c.sentiment, c.sentiment_score, c.ai_feedback, c.created_at,
+                   check_in_search.resolution_title,
+                   highlight(check_in_search, 0, '{_MARK_START}', '{_MARK_END}') AS note_highlight,
+                   highlight(check_in_search, 1, '{_MARK_START}', '{_MARK_END}') AS ai_feedback_highlight,
+                   rank
+            FROM check_in_search
+            JOIN check_ins c ON c.id = check_in_search.rowid
+            WHERE {" AND ".join(["check_in_search MATCH :match", f"rank MATCH 'bm25({weights})'", *clauses])}
+            ORDER BY {order}
+            LIMIT :limit"""
+        ),
+        params,
+    ).mappings().all()
+    return [dict(row) for row in rows]
+
+
+def _highlight(value: str) -> str:
+    # Only the markers become markup; the stored text is escaped like any other.
+    return html.escape(value).replace(_MARK_START, HIGHLIGHT_START).replace(_MARK_END, HIGHLIGHT_END)
+
+
+def search(
+    db: Session,
+    q: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    resolution_id: Optional[int] = None,
+    sentiment: Optional[str] = None,
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None,
+) -> tuple[list[dict[str, Any]], Optional[str]]:
+    """Page of matching check-ins: best-first among the newest, then newest-first.
+
+    bm25 scores every row it orders, so ranking is bounded to the
+    ``MAX_RANKED_CANDIDATES`` newest matches. The first query walks the index
+    newest-first, which needs no scoring, to find the rowid window holding
+    them; the ranked query then only sees that window, keyed on (rank, id).
+    Older matches follow the window newest-first, keyed on id alone, which is
+    again an index walk. The window travels in the cursor so every page sees
+    the same candidates, and a null rank in it marks the older part.
+
+    Highlights are HTML-escaped, with ``<mark>`` around the matched words.
+    """
+    terms = match_terms(q)
+    scope = scope_terms(resolution_id, sentiment, created_from, created_to)
+
+    filters = []
+    params: dict[str, Any] = {}
+    if resolution_id is not None:
+        filters.append("c.resolution_id = :resolution_id")
+        params["resolution_id"] = resolution_id
+    if sentiment is not None:
+        filters.append("c.sentiment = :sentiment")
+        params["sentiment"] = sentiment
+    if created_from is not None:
+        filters.append("c.created_at >= :created_from")
+        params["created_from"] = created_from
+    if created_to is not None:
+        filters.append("c.created_at < :created_to")
+        params["created_to"] = created_to
+
+    if cursor:
+        last_rank, last_id, floor, ceiling = decode_cursor(cursor, (int, float, type(None)), int, int, int)
+    else:
+        last_rank = last_id = None
+        floor, ceiling = db.execute(
+            text(
+                f"""SELECT min(id), max(id) FROM (
+                    SELECT c.id FROM check_in_search JOIN check_ins c ON c.id = check_in_search.rowid
+                    WHERE {" AND ".join(["check_in_search MATCH :match", *filters])}
+                    ORDER BY check_in_search.rowid DESC LIMIT :candidates
+                )"""
+            ),
+            {**params, "match": _with_scope(terms, scope), "candidates": MAX_RANKED_CANDIDATES},
+        ).one()
+        if floor is None:
+            return [], None
+
+    rows = []
+    if last_rank is not None or last_id is None:
+        # Only the selective resolution token is kept for ranking: bm25 weighs
+        # every phrase it is given, and the exact filters handle the rest
+        # cheaply inside the window.
+        clauses = ["check_in_search.rowid BETWEEN :floor AND :ceiling", *filters]
+        ranked = {
+            **params,
+            "match": _with_scope(terms, scope[:1] if resolution_id is not None else []),
+            "floor": floor,
+            "ceiling": ceiling,
+            "limit": limit + 1,
+        }
+        if last_id is not None:
+            clauses.append("(rank > :last_rank OR (rank = :last_rank AND c.id > :last_id))")
+            ranked.update(last_rank=last_rank, last_id=last_id)
+        rows = _rows(db, clauses, "rank, c.id", ranked)
+    if len(rows) <= limit:
+        # Past the window the full scope narrows the walk, as in the first query.
+        older = last_id if last_rank is None and last_id is not None else floor
+        rows += _rows(
+            db,
+            ["check_in_search.rowid < :older", *filters],
+            "check_in_search.rowid DESC",
+            {**params, "match": _with_scope(terms, scope), "older": older, "limit": limit + 1 - len(rows)},
+        )
+
+    results = []
+    for result in rows[:limit]:
+        result["note_highlight"] = _highlight(result["note_highlight"])
+        if result["ai_feedback"] is None:
+            result["ai_feedback_highlight"] = None
+        else:
+            result["ai_feedback_highlight"] = _highlight(result["ai_feedback_highlight"])
+        results.append(result)
+    next_cursor = None
+    if len(rows) > limit:
+        last = results[-1]
+        in_window = last["id"] >= floor
+        next_cursor = encode_cursor(last["rank"] if in_window else None, last["id"], floor, ceiling)
+    return results, next_cursor
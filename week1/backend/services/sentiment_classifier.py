@@ -0,0 +1,126 @@
+"""CPU-only lexicon sentiment classifier for check-in notes.
+
+Each word and two-word phrase in the lexicon carries a weight; a negation
+within the three preceding words of the same clause flips and dampens it, and
+an intensifier scales it. The label comes from the balance of positive and
+negative evidence, and the confidence grows with how much evidence there is
+and how one-sided it is. A note with no lexicon words is neutral at zero
+confidence, so callers that gate on confidence always escalate it.
+
+``classify_many`` labels a batch with one shared tokenizer and lookup tables;
+a typical note takes around ten microseconds.
+"""
+import math
+import re
+from typing import Iterable, NamedTuple
+
+POSITIVE = "positive"
+NEUTRAL = "neutral"
+NEGATIVE = "negative"
+
+LEXICON: dict[str, float] = {
+    # Positive
+    "great": 2.0, "awesome": 2.0, "amazing": 2.0, "excellent": 2.0, "fantastic": 2.0, "love": 2.0,
+    "loved": 2.0, "proud": 2.0, "crushed": 2.0, "nailed": 2.0, "thrilled": 2.0, "wonderful": 2.0,
+    "good": 1.5, "happy": 1.5, "finished": 1.5, "completed": 1.5, "achieved": 1.5, "success": 1.5,
+    "successful": 1.5, "enjoyed": 1.5, "fun": 1.5, "strong": 1.5, "motivated": 1.5, "energized": 1.5,
+    "progress": 1.2, "improved": 1.2, "improving": 1.2, "better": 1.2, "easier": 1.2, "productive": 1.2,
+    "consistent": 1.2, "streak": 1.0, "confident": 1.2, "glad": 1.2, "excited": 1.5, "best": 1.5,
+    "easy": 1.2, "nice": 1.0, "fine": 0.5, "ok": 0.3, "okay": 0.3, "managed": 0.8, "kept": 0.6,
+    # Negative
+    "terrible": -2.0, "awful": -2.0, "horrible": -2.0, "hate": -2.0, "hated": -2.0, "failed": -2.0,
+    "quit": -2.0, "miserable": -2.0, "exhausted": -1.5, "frustrated": -1.5, "frustrating": -1.5,
+    "bad": -1.5, "missed": -1.5, "skipped": -1.5, "struggled": -1.5, "struggling": -1.5, "sick": -1.5,
+    "injured": -1.5, "hurt": -1.2, "sad": -1.5, "disappointed": -1.5, "stressed": -1.5, "stuck": -1.2,
+    "worse": -1.2, "harder": -1.0, "hard": -0.8, "difficult": -1.0, "tired": -1.0, "lazy": -1.2,
+    "behind": -1.0, "slipped": -1.2, "forgot": -1.2, "unmotivated": -1.5, "overwhelmed": -1.5,
+    "pain": -1.5, "painful": -1.5, "sore": -0.6, "busy": -0.5, "late": -0.5,
+}
+
+PHRASES: dict[str, float] = {
+    "gave up": -2.0, "fell off": -1.5, "off track": -1.5, "no time": -1.2, "not enough": -1.2,
+    "back on": 1.2, "on track": 1.2, "personal best": 2.0, "new best": 2.0, "new record": 2.0, "feel better": 1.5,
+    "felt better": 1.5,
+}
+
+NEGATORS = frozenset({
+    "not", "no", "never", "nothing", "without", "don't", "dont", "didn't", "didnt", "can't", "cant",
+    "couldn't", "couldnt", "wasn't", "wasnt", "isn't", "isnt", "won't", "wont", "haven't", "havent",
+    "hasn't", "hasnt", "wouldn't", "wouldnt", "neither", "nor",
+})
+INTENSIFIERS: dict[str, float] = {
+    "very": 1.5, "really": 1.5, "so": 1.3, "super": 1.5, "extremely": 1.8, "incredibly": 1.8,
+    "totally": 1.4, "completely": 1.4, "pretty": 1.2, "quite": 1.2, "slightly": 0.6, "somewhat": 0.7,
+    "bit": 0.7,
+}
+
+NEGATION_WINDOW = 3
+# A negated word keeps about half its weight, pointing the other way ("not bad").
+NEGATION_SCALE = -0.5
+# Below this share of the evidence, the smaller side is not enough to pick a side.
+MIXED_MARGIN = 0.34
+
+_TOKEN = re.compile(r"[a-z]+(?:'[a-z]+)?|[.,;:!?]")
+_CLAUSE_BREAKS = frozenset(".,;:!?")
+
+
+class Label(NamedTuple):
+    sentiment: str
+    confidence: float
+
+
+def _score(tokens: list[str]) -> tuple[float, float]:
+    positive = negative = 0.0
+    negated_until = -1
+    previous = ""
+    count = len(tokens)
+    i = 0
+    while i < count:
+        token = tokens[i]
+        if token in _CLAUSE_BREAKS:
+            negated_until = -1
+            previous = ""
+            i += 1
+            continue
+        weight = PHRASES.get(f"{token} {tokens[i + 1]}") if i + 1 < count else None
+        step = 2
+        if weight is None:
+            if token in NEGATORS:
+                negated_until = i + NEGATION_WINDOW
+                previous = token
+                i += 1
+                continue
+            weight = LEXICON.get(token)
+            step = 1
+        if weight is not None:
+            weight *= INTENSIFIERS.get(previous, 1.0)
+            if i <= negated_until:
+                weight *= NEGATION_SCALE
+            if weight > 0:
+                positive += weight
+            else:
+                negative -= weight
+        previous = token
+        i += step
+    return positive, negative
+
+
+def _label(positive: float, negative: float) -> Label:
+    total = positive + negative
+    if not total:
+        return Label(NEUTRAL, 0.0)
+    margin = abs(positive - negative) / total
+    strength = 1.0 - math.exp(-total)
+    if margin < MIXED_MARGIN:
+        return Label(NEUTRAL, strength * (1.0 - margin) * 0.5)
+    return Label(POSITIVE if positive > negative else NEGATIVE, strength * margin)
+
+
+def classify_many(notes: Iterable[str]) -> list[Label]:
+    """Label each note with its sentiment and a confidence in [0, 1]."""
+    findall = _TOKEN.findall
+    return [_label(*_score(findall(note.lower()))) for note in notes]
+
+
+def classify(note: str) -> Label:
+    return classify_many((note,))[0]
@@ -0,0 +1,126 @@
+"""Hashed n-gram index over resolutions, used to keep AI prompts a fixed size.
+
+Each resolution's title and description become an L2-normalised vector of
+hashed unigrams and bigrams, stored as postings in ``resolution_terms``. A
+lookup is a dot product over the postings that share a term with the query.
+"""
+import json
+import math
+import re
+import zlib
+from collections import Counter
+from typing import Any, Iterable, Optional, Union
+
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from ..db_models import Resolution, ResolutionTerm
+
+TOP_K = 5
+MAX_CATEGORIES = 8
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from in into is it of on or per the this to with my me i "
+    "each every day daily week weekly month monthly year".split()
+)
+
+_SIMILAR_SQL = text("""
+    SELECT r.id, r.title, r.category, r.priority, SUM(t.weight * q.value) AS score
+    FROM json_each(:query) AS q
+    JOIN resolution_terms AS t ON t.term = CAST(q.key AS INTEGER)
+    JOIN resolutions AS r ON r.id = t.resolution_id
+    WHERE r.id != :exclude_id AND r.deleted_at IS NULL
+    GROUP BY r.id
+    ORDER BY score DESC, r.id DESC
+    LIMIT :k
+""")
+
+Executor = Union[Session, Connection]
+
+
+def _term_id(token: str) -> int:
+    return zlib.crc32(token.encode("utf-8"))
+
+
+def vectorize(*texts: str) -> dict[int, float]:
+    tokens = [t for t in _TOKEN.findall(" ".join(texts).lower()) if t not in _STOPWORDS]
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    counts = Counter(_term_id(g) for g in grams)
+    weights = {term: 1.0 + math.log(n) for term, n in counts.items()}
+    norm = math.sqrt(sum(w * w for w in weights.values()))
+    if not norm:
+        return {}
+    return {term: w / norm for term, w in weights.items()}
+
+
+def index_resolution(db: Executor, resolution_id: int, title: str, description: str) -> None:
+    db.execute(delete(ResolutionTerm).where(ResolutionTerm.resolution_id == resolution_id))
+    rows = [
+        {"term": term, "resolution_id": resolution_id, "weight": weight}
+        for term, weight in vectorize(title, description).items()
+    ]
+    if rows:
+        db.execute(insert(ResolutionTerm), rows)
+
+
+def index_new_resolutions(db: Executor, resolutions: Iterable[tuple[int, str, str]]) -> None:
+    """Index freshly inserted ``(id, title, description)`` rows with one bulk insert."""
+    rows = [
+        {"term": term, "resolution_id": resolution_id, "weight": weight}
+        for resolution_id, title, description in resolutions
+        for term, weight in vectorize(title, description).items()
+    ]
+    if rows:
+        db.execute(insert(ResolutionTerm), rows)
+
+
+def rebuild_index(db: Executor) -> int:
+    db.execute(delete(ResolutionTerm))
+    rows = db.execute(select(Resolution.id, Resolution.title, Resolution.description)).all()
+    for row in rows:
+        index_resolution(db, row.id, row.title, row.description)
+    return len(rows)
+
+
+def find_similar(
+    db: Executor,
+    title: str,
+    description: str,
+    k: int = TOP_K,
+    exclude_id: Optional[int] = None,
+) -> list[dict[str, Any]]:
+    query = vectorize(title, description)
+    if not query:
+        return []
+    rows = db.execute(
+        _SIMILAR_SQL,
+        {"query": json.dumps(query), "exclude_id": exclude_id or 0, "k": k},
+    ).all()
+    return [
+        {"title": r.title, "category": r.category, "priority": r.priority, "score": round(r.score, 3)}
+        for r in rows
+    ]
+
+
+def category_stats(db: Executor, limit: int = MAX_CATEGORIES) -> list[dict[str, Any]]:
+    rows = db.execute(text("""
+        SELECT category, COUNT(*) AS n, MIN(priority) AS min_priority, MAX(priority) AS max_priority,
+               AVG(priority) AS avg_priority
+        FROM resolutions
+        WHERE status = 'active' AND deleted_at IS NULL
+        GROUP BY category
+        ORDER BY n DESC
+        LIMIT :limit
+    """), {"limit": limit}).all()
+    return [
+        {
+            "category": r.category,
+            "count": r.n,
+            "min_priority": r.min_priority,
+            "max_priority": r.max_priority,
+            "avg_priority": round(r.avg_priority, 1) if r.avg_priority is not None else None,
+        }
+        for r in rows
+    ]
@@ -0,0 +1,322 @@
+"""NDJSON export and bulk import of resolutions, reminders and check-ins.
+
+Every line is one JSON object with a ``type`` of ``resolution``, ``reminder``
+or ``check_in`` followed by the row's columns. Exports list resolutions first,
+so an importer can remap resolution ids before it sees any child row.
+"""
+import argparse
+import json
+import logging
+import sys
+from datetime import datetime
+from typing import Any, AsyncIterator, Iterable, Iterator, Optional, Union
+
+from sqlalchemy import insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..db_models import AiJob, CheckIn, Reminder, Resolution
+from . import enrichment_service, resolution_stats
+from .batch_service import categorize_many
+from .similarity_service import index_new_resolutions
+
+logger = logging.getLogger(__name__)
+
+EXPORT_YIELD_PER = 1000
+IMPORT_CHUNK_SIZE = 5000
+
+EXPORT_TABLES = (("resolution", Resolution), ("reminder", Reminder), ("check_in", CheckIn))
+
+_REQUIRED = {
+    "resolution": ("id", "title", "description"),
+    "reminder": ("resolution_id", "next_due"),
+    "check_in": ("resolution_id", "note"),
+}
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+class ImportAborted(Exception):
+    """An import stopped part way; the chunks before the failing one stay committed."""
+
+
+def abort_message(exc: Exception, line_no: int, counts: dict[str, int]) -> str:
+    """Why an import stopped at ``line_no``, with what had already been committed."""
+    reason = exc if isinstance(exc, ImportFormatError) else f"line {line_no}: conflicting rows in chunk"
+    committed = ", ".join(f"{name}={count}" for name, count in counts.items())
+    return f"{reason} (already imported: {committed})"
+
+
+def _export_statement(model):
+    # Soft-deleted resolutions are gone as far as the user is concerned, and so are their rows.
+    live = select(Resolution.id).where(Resolution.deleted_at.is_(None))
+    statement = select(model.__table__)
+    if model is Resolution:
+        statement = statement.where(Resolution.deleted_at.is_(None))
+    else:
+        statement = statement.where(model.resolution_id.in_(live))
+    return statement.order_by(model.id).execution_options(yield_per=EXPORT_YIELD_PER)
+
+
+def _lines(kind: str, rows: Iterable[Any]) -> bytes:
+    return "".join(json.dumps({"type": kind, **row}) + "\n" for row in rows).encode()
+
+
+def export_lines(db: Session) -> Iterator[bytes]:
+    """Yield the dataset as NDJSON, one ``yield_per`` partition at a time.
+
+    All three tables are read in the same transaction, so the export is a
+    consistent snapshot even while the API keeps writing.
+    """
+    for kind, model in EXPORT_TABLES:
+        for partition in db.execute(_export_statement(model)).mappings().partitions():
+            yield _lines(kind, partition)
+
+
+async def export_lines_async(db: AsyncSession) -> AsyncIterator[bytes]:
+    for kind, model in EXPORT_TABLES:
+        result = await db.stream(_export_statement(model))
+        async for partition in result.mappings().partitions():
+            yield _lines(kind, partition)
+
+
+def parse_line(line: Union[bytes, str], line_no: int) -> Optional[dict[str, Any]]:
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        record = json.loads(line)
+    except ValueError:
+        raise ImportFormatError(f"line {line_no}: invalid JSON")
+    if not isinstance(record, dict) or record.get("type") not in _REQUIRED:
+        raise ImportFormatError(f"line {line_no}: type must be one of {sorted(_REQUIRED)}")
+    missing = [field for field in _REQUIRED[record["type"]] if record.get(field) is None]
+    if missing:
+        raise ImportFormatError(f"line {line_no}: missing {', '.join(missing)}")
+    record["_line"] = line_no
+    return record
+
+
+class Importer:
+    """Bulk-loads parsed records in chunked transactions.
+
+    Resolution ids from the source are remapped to freshly assigned ids, so an
+    export can be loaded into a database that already has data. Unless
+    ``skip_ai`` is set, resolutions without a category are categorized inline
+    and check-ins without a sentiment get a pending AI job. Resolutions with a
+    ``deleted_at`` (from exports that still carried them) are skipped along
+    with their rows.
+    """
+
+    def __init__(self, conn_factory, skip_ai: bool = False, enqueue_jobs: bool = True) -> None:
+        self._conn_factory = conn_factory
+        self.skip_ai = skip_ai
+        self.enqueue_jobs = enqueue_jobs
+        self._resolution_ids: dict[int, int] = {}
+        self._deleted: set[int] = set()
+        self.counts = {"resolutions": 0, "reminders": 0, "check_ins": 0, "ai_jobs": 0}
+
+    def load_chunk(self, records: list[dict[str, Any]]) -> None:
+        by_kind: dict[str, list[dict[str, Any]]] = {kind: [] for kind in _REQUIRED}
+        self._deleted.update(r["id"] for r in records if r["type"] == "resolution" and r.get("deleted_at"))
+        for record in records:
+            source_id = record["id"] if record["type"] == "resolution" else record["resolution_id"]
+            if source_id not in self._deleted:
+                by_kind[record["type"]].append(record)
+
+        committed = dict(self.counts)
+        try:
+            with self._conn_factory() as conn:
+                self._load_resolutions(conn, by_kind["resolution"])
+                self._load_reminders(conn, by_kind["reminder"])
+                # Stats are recomputed once per touched resolution rather than per row,
+                # which for unordered input would rescan each resolution's history.
+                with resolution_stats.deferred(conn) as touched:
+                    job_ids = self._load_check_ins(conn, by_kind["check_in"])
+                    touched.update(self._resolve(r) for r in by_kind["check_in"])
+        except Exception:
+            # Counts only ever describe committed chunks.
+            self.counts = committed
+            raise
+
+        if self.enqueue_jobs:
+            for job_id in job_ids:
+                enrichment_service.enqueue(job_id)
+
+    def _resolve(self, record: dict[str, Any]) -> int:
+        try:
+            return self._resolution_ids[record["resolution_id"]]
+        except KeyError:
+            raise ImportFormatError(
+                f"line {record['_line']}: resolution {record['resolution_id']} must appear before its rows"
+            )
+
+    def _load_resolutions(self, conn: Connection, records: list[dict[str, Any]]) -> None:
+        if not records:
+            return
+        if not self.skip_ai:
+            pending = [r for r in records if r.get("category") is None or r.get("priority") is None]
+            results = categorize_many([
+                {"title": r["title"], "description": r["description"], "existing_resolutions": []}
+                for r in pending
+            ])
+            for record, result in zip(pending, results):
+                record["category"] = record.get("category") or result["category"]
+                record["priority"] = record.get("priority") or result["priority"]
+
+        now = datetime.utcnow().isoformat()
+        rows = [
+            {
+                "title": r["title"],
+                "description": r["description"],
+                "category": r.get("category"),
+                "priority": r.get("priority"),
+                "target_date": r.get("target_date"),
+                "status": r.get("status") or "active",
+                "created_at": r.get("created_at") or now,
+                "updated_at": r.get("updated_at") or r.get("created_at") or now,
+            }
+            for r in records
+        ]
+        ids = conn.execute(insert(Resolution).returning(Resolution.id, sort_by_parameter_order=True), rows).scalars().all()
+        for record, new_id in zip(records, ids):
+            self._resolution_ids[record["id"]] = new_id
+        index_new_resolutions(conn, ((new_id, r["title"], r["description"]) for r, new_id in zip(rows, ids)))
+        self.counts["resolutions"] += len(ids)
+
+    def _load_reminders(self, conn: Connection, records: list[dict[str, Any]]) -> None:
+        if not records:
+            return
+        rows = [
+            {
+                "resolution_id": self._resolve(r),
+                "frequency": r.get("frequency") or "weekly",
+                "next_due": r["next_due"],
+                "is_active": int(r.get("is_active", 1)),
+            }
+            for r in records
+        ]
+        conn.execute(insert(Reminder), rows)
+        self.counts["reminders"] += len(rows)
+
+    def _load_check_ins(self, conn: Connection, records: list[dict[str, Any]]) -> list[int]:
+        if not records:
+            return []
+        now = datetime.utcnow().isoformat()
+        rows = [
+            {
+                "resolution_id": self._resolve(r),
+                "note": r["note"],
+                "sentiment": r.get("sentiment"),
+                "sentiment_score": r.get("sentiment_score"),
+                "ai_feedback": r.get("ai_feedback"),
+                "created_at": r.get("created_at") or now,
+            }
+            for r in records
+        ]
+        self.counts["check_ins"] += len(rows)
+        needs_ai = [row["sentiment"] is None for row in rows]
+        if self.skip_ai or not any(needs_ai):
+            conn.execute(insert(CheckIn), rows)
+            return []
+
+        ids = conn.execute(insert(CheckIn).returning(CheckIn.id, sort_by_parameter_order=True), rows).scalars().all()
+        jobs = [
+            {
+                "check_in_id": check_in_id,
+                "status": enrichment_service.JOB_PENDING,
+                "attempts": 0,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for check_in_id, pending in zip(ids, needs_ai)
+            if pending
+        ]
+        job_ids = conn.execute(insert(AiJob).returning(AiJob.id, sort_by_parameter_order=True), jobs).scalars().all()
+        self.counts["ai_jobs"] += len(job_ids)
+        return list(job_ids)
+
+
+def import_lines(
+    lines: Iterable[Union[bytes, str]],
+    skip_ai: bool = False,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    enqueue_jobs: bool = True,
+) -> dict[str, int]:
+    """Import an NDJSON stream; each chunk of ``chunk_size`` records commits on its own.
+
+    A bad line or conflicting rows raise ``ImportAborted``.
+    """
+    from ..database import _get_engine
+
+    importer = Importer(_get_engine().begin, skip_ai=skip_ai, enqueue_jobs=enqueue_jobs)
+    chunk: list[dict[str, Any]] = []
+    line_no = 0
+    try:
+        for line_no, line in enumerate(lines, start=1):
+            record = parse_line(line, line_no)
+            if record is None:
+                continue
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                importer.load_chunk(chunk)
+                chunk = []
+        if chunk:
+            importer.load_chunk(chunk)
+    except (ImportFormatError, IntegrityError) as exc:
+        raise ImportAborted(abort_message(exc, line_no, importer.counts)) from exc
+    return importer.counts
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from ..database import DEFAULT_TENANT, use_tenant, validate_tenant
+
+    parser = argparse.ArgumentParser(description="Export or import the dataset as NDJSON.")
+    parser.add_argument("--tenant", type=validate_tenant, default=DEFAULT_TENANT, help="tenant database to use (default: %(default)s)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export")
+    export_parser.add_argument("path", nargs="?", default="-", help="output file (default: stdout)")
+    import_parser = subparsers.add_parser("import")
+    import_parser.add_argument("path", nargs="?", default="-", help="input file (default: stdin)")
+    import_parser.add_argument("--skip-ai", action="store_true", help="load rows as-is without AI enrichment")
+    import_parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    with use_tenant(args.tenant):
+        return _run(args)
+
+
+def _run(args: argparse.Namespace) -> int:
+    from ..database import get_session_factory, init_db
+
+    init_db()
+    if args.command == "export":
+        out = sys.stdout.buffer if args.path == "-" else open(args.path, "wb")
+        with get_session_factory()() as db:
+            for block in export_lines(db):
+                out.write(block)
+        out.flush()
+        if out is not sys.stdout.buffer:
+            out.close()
+        return 0
+
+    source = sys.stdin.buffer if args.path == "-" else open(args.path, "rb")
+    try:
+        # Check-in AI jobs stay pending here and are picked up when the API starts.
+        counts = import_lines(source, skip_ai=args.skip_ai, chunk_size=args.chunk_size, enqueue_jobs=False)
+    except ImportAborted as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+    print(", ".join(f"{name}={count}" for name, count in counts.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""Optional single-writer path that group-commits SQLite writes.
+
+SQLite allows one writer at a time, so concurrent requests that each commit
+their own transaction queue up on the write lock and pay one fsync apiece.
+With ``ENABLED`` set, write operations are handed to one writer thread per
+tenant instead. The thread gathers whatever arrives within ``WINDOW_SECONDS``
+(up to ``MAX_BATCH`` operations), runs each in its own SAVEPOINT and commits
+them together, then resolves every caller's future. An operation that raises
+only rolls back its own savepoint.
+
+An operation is a plain function taking a sync ``Session`` (plus arguments)
+and returning a value. Through ``run`` the same function serves both paths,
+so callers do not branch on the setting.
+"""
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Optional, TypeVar
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
+
+from ..database import _instrument, current_tenant, get_session_factory, tenant_path, use_tenant
+
+logger = logging.getLogger(__name__)
+
+ENABLED = False
+WINDOW_SECONDS = 0.003
+MAX_BATCH = 256
+# A writer with nothing to do for this long exits; the next write starts a new one.
+IDLE_SECONDS = 60.0
+
+T = TypeVar("T")
+
+_writers: dict[str, "GroupCommitWriter"] = {}
+_writers_lock = threading.Lock()
+
+
+def _writer_engine(tenant: str) -> Engine:
+    # pysqlite's implicit transactions break SAVEPOINT; take over BEGIN ourselves
+    # and make it IMMEDIATE so the write lock is held for the whole batch.
+    engine = create_engine(
+        f"sqlite:///{tenant_path(tenant)}",
+        connect_args={"check_same_thread": False, "isolation_level": None},
+    )
+    _instrument(engine)
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn) -> None:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return engine
+
+
+class GroupCommitWriter:
+    def __init__(self, tenant: str, window: float = WINDOW_SECONDS, max_batch: int = MAX_BATCH) -> None:
+        self.tenant = tenant
+        self.window = window
+        self.max_batch = max_batch
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self.batches = 0
+        self.operations = 0
+
+    def submit(self, fn: Callable[[Session], T]) -> "Future[T]":
+        future: Future = Future()
+        with self._lock:
+            if self._stopping:
+                raise RuntimeError("writer is shut down")
+            self._queue.put((fn, future))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"sqlite-writer-{self.tenant}", daemon=True
+                )
+                self._thread.start()
+        return future
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        with self._lock:
+            self._stopping = True
+            thread = self._thread
+            self._queue.put(None)
+        if thread is not None:
+            thread.join(timeout)
+
+    def _next_batch(self) -> Optional[list[tuple[Callable, Future]]]:
+        try:
+            first = self._queue.get(timeout=IDLE_SECONDS)
+        except queue.Empty:
+            with self._lock:
+                if self._queue.empty():
+                    self._thread = None
+                    return None
+            first = self._queue.get()
+        if first is None:
+            return None
+
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Finish this batch; the stop marker goes back for the next round.
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self) -> None:
+        with use_tenant(self.tenant):
+            get_session_factory()  # creates and migrates the tenant's database if needed
+            engine = _writer_engine(self.tenant)
+        session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+        try:
+            while (batch := self._next_batch()) is not None:
+                with use_tenant(self.tenant):
+                    self._commit(session_factory, batch)
+        finally:
+            engine.dispose()
+
+    def _commit(self, session_factory: sessionmaker, batch: list[tuple[Callable, Future]]) -> None:
+        outcomes = []
+        session = session_factory()
+        try:
+            for fn, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    with session.begin_nested():
+                        outcomes.append((future, fn(session), None))
+                except Exception as exc:
+                    outcomes.append((future, None, exc))
+            session.commit()
+        except Exception as exc:
+            logger.exception("Group commit of %s writes failed", len(batch))
+            session.rollback()
+            for future, _, _ in outcomes:
+                future.set_exception(exc)
+            return
+        finally:
+            session.close()
+
+        self.batches += 1
+        self.operations += len(outcomes)
+        for future, value, exc in outcomes:
+            if exc is None:
+                future.set_result(value)
+            else:
+                future.set_exception(exc)
+
+
+def _writer(tenant: str) -> GroupCommitWriter:
+    with _writers_lock:
+        writer = _writers.get(tenant)
+        if writer is None:
+            writer = _writers[tenant] = GroupCommitWriter(tenant)
+        return writer
+
+
+def submit(fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+    """Queue ``fn(session, *args, **kwargs)`` on the current tenant's writer."""
+    return _writer(current_tenant()).submit(lambda session: fn(session, *args, **kwargs))
+
+
+async def run(db: AsyncSession, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a write operation and commit it.
+
+    Through the group-commit writer when ``ENABLED``; otherwise on ``db`` in
+    its own transaction, exactly as the handlers used to.
+    """
+    if ENABLED:
+        # Free the request's connection so it cannot hold a lock the writer needs.
+        await db.rollback()
+        return await asyncio.wrap_future(submit(fn, *args, **kwargs))
+    result = await db.run_sync(fn, *args, **kwargs)
+    await db.commit()
+    return result
+
+
+def shutdown(timeout: Optional[float] = 10.0) -> None:
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.stop(timeout)
+
+
+def stats() -> dict[str, dict[str, int]]:
+    with _writers_lock:
+        return {tenant: {"batches": w.batches, "operations": w.operations} for tenant, w in _writers.items()}
@@ -0,0 +1,150 @@
+"""Tenant routing for requests and maintenance of every tenant's database file.
+
+Requests pick their tenant with the ``X-Tenant-Id`` header; without it they
+use the default tenant's ``DB_PATH``. A header naming a tenant with no database
+gets a 404 unless the tenant is in ``ALLOWED_TENANTS``. ``python -m
+backend.tenants`` creates tenants and lists, migrates or vacuums their files.
+"""
+import argparse
+import sys
+from typing import Any, Optional
+
+from sqlalchemy import create_engine
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .database import (
+    TENANT_HEADER,
+    UnknownTenant,
+    list_tenants,
+    open_tenant,
+    tenant_path,
+    use_tenant,
+    validate_tenant,
+)
+from .db_models import Base
+from .migrations import get_schema_version, run_migrations
+
+_HEADER = TENANT_HEADER.lower().encode("latin-1")
+
+
+class TenantMiddleware:
+    """Runs each request in the context of the tenant named by its header."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        tenant = next((value.decode("latin-1") for name, value in scope["headers"] if name == _HEADER), None)
+        if tenant is None:
+            await self.app(scope, receive, send)
+            return
+        try:
+            validate_tenant(tenant)
+        except ValueError as exc:
+            await JSONResponse({"detail": str(exc)}, status_code=400)(scope, receive, send)
+            return
+        with use_tenant(tenant):
+            try:
+                await open_tenant(tenant)
+            except UnknownTenant as exc:
+                await JSONResponse({"detail": str(exc)}, status_code=404)(scope, receive, send)
+                return
+            await self.app(scope, receive, send)
+
+
+def _engine_for(tenant: str):
+    # A throwaway engine: maintenance should not churn the request pool.
+    return create_engine(f"sqlite:///{tenant_path(tenant)}")
+
+
+def describe(tenant: str) -> dict[str, Any]:
+    path = tenant_path(tenant)
+    engine = _engine_for(tenant)
+    try:
+        with engine.connect() as conn:
+            version = get_schema_version(conn)
+    finally:
+        engine.dispose()
+    return {"tenant": tenant, "path": str(path), "bytes": path.stat().st_size, "schema_version": version}
+
+
+def migrate(tenant: str) -> list[int]:
+    engine = _engine_for(tenant)
+    try:
+        Base.metadata.create_all(bind=engine)
+        return run_migrations(engine)
+    finally:
+        engine.dispose()
+
+
+def create(tenant: str) -> bool:
+    """Create and migrate a tenant's database; False if it already had one."""
+    path = tenant_path(tenant)
+    if path.exists():
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    migrate(tenant)
+    return True
+
+
+def vacuum(tenant: str) -> tuple[int, int]:
+    """VACUUM a tenant file and truncate its WAL; returns (bytes before, bytes after)."""
+    path = tenant_path(tenant)
+    wal = path.with_name(path.name + "-wal")
+
+    def _size() -> int:
+        return path.stat().st_size + (wal.stat().st_size if wal.exists() else 0)
+
+    before = _size()
+    engine = _engine_for(tenant)
+    try:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql("VACUUM")
+            conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        engine.dispose()
+    return before, _size()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Maintain per-tenant SQLite databases.")
+    parser.add_argument("command", choices=("create", "list", "migrate", "vacuum"))
+    parser.add_argument("tenants", nargs="*", help="tenant ids (default: every tenant with a database)")
+    args = parser.parse_args(argv)
+
+    try:
+        tenants = [validate_tenant(t) for t in args.tenants] or list_tenants()
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    if args.command == "create":
+        if not args.tenants:
+            print("create needs at least one tenant id", file=sys.stderr)
+            return 1
+        for tenant in tenants:
+            print(f"{tenant}\t{'created' if create(tenant) else 'exists'}")
+        return 0
+    missing = [t for t in tenants if not tenant_path(t).exists()]
+    if missing:
+        print(f"No database for: {', '.join(missing)}", file=sys.stderr)
+        return 1
+
+    for tenant in tenants:
+        if args.command == "list":
+            info = describe(tenant)
+            print(f"{info['tenant']}\tv{info['schema_version']}\t{info['bytes']}\t{info['path']}")
+        elif args.command == "migrate":
+            applied = migrate(tenant)
+            print(f"{tenant}\t{'applied ' + ', '.join(map(str, applied)) if applied else 'up to date'}")
+        else:
+            before, after = vacuum(tenant)
+            print(f"{tenant}\t{before} -> {after} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+import io
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+import backend.database as db_mod
+from backend.services import ai_service
+from backend.services.ai_cache import ResponseCache, cache_key
+
+
+def _bedrock_reply(text):
+    return {"body": io.BytesIO(json.dumps({"content": [{"text": text}]}).encode())}
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        db_mod.init_db()
+        self.cache = ResponseCache(max_entries=2, ttl_seconds=60, disk_max_entries=3, disk_trim_every=1)
+        self.cache.clear()
+
+    def tearDown(self):
+        self.cache.clear()
+
+    def test_key_depends_on_all_parts(self):
+        self.assertEqual(cache_key("m", "s", "u"), cache_key("m", "s", "u"))
+        self.assertNotEqual(cache_key("m", "ab", "c"), cache_key("m", "a", "bc"))
+        self.assertNotEqual(cache_key("m1", "s", "u"), cache_key("m2", "s", "u"))
+
+    def test_memory_then_disk_hit(self):
+        self.cache.put("k1", "m", '{"a": 1}')
+        self.assertEqual(self.cache.get("k1"), '{"a": 1}')
+        self.cache.clear(memory_only=True)
+        self.assertEqual(self.cache.get("k1"), '{"a": 1}')
+        self.assertIsNone(self.cache.get("missing"))
+        stats = self.cache.stats()
+        self.assertEqual(stats["memory_hits"], 1)
+        self.assertEqual(stats["disk_hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_lru_and_disk_bounds(self):
+        for i in range(5):
+            self.cache.put(f"k{i}", "m", str(i))
+        stats = self.cache.stats()
+        self.assertEqual(stats["memory_entries"], 2)
+        self.assertEqual(stats["evictions"], 3)
+        self.assertEqual(stats["disk_evictions"], 2)
+        self.cache.clear(memory_only=True)
+        self.assertIsNone(self.cache.get("k0"))
+        self.assertEqual(self.cache.get("k4"), "4")
+
+    def test_disk_trim_is_periodic(self):
+        self.cache.disk_trim_every = 4
+        for i in range(6):
+            self.cache.put(f"k{i}", "m", str(i))
+        # Trimmed back to three on the fourth write; the next two go over the bound until the eighth.
+        self.assertEqual(self.cache.stats()["disk_evictions"], 1)
+        self.cache.clear(memory_only=True)
+        self.assertIsNone(self.cache.get("k0"))
+        self.assertEqual([self.cache.get(f"k{i}") for i in range(1, 6)], ["1", "2", "3", "4", "5"])
+
+    def test_ttl_expiry(self):
+        self.cache.ttl_seconds = -1
+        self.cache.put("k1", "m", "1")
+        self.assertIsNone(self.cache.get("k1"))
+        self.assertEqual(self.cache.stats()["expirations"], 2)
+
+
+class TestInvokeCaching(unittest.TestCase):
+    def setUp(self):
+        db_mod.init_db()
+        self.original_cache = ai_service._cache
+        ai_service._cache = ResponseCache(max_entries=8, ttl_seconds=60, persist=False)
+
+    def tearDown(self):
+        ai_service._cache = self.original_cache
+
+    def test_identical_prompts_hit_cache(self):
+        client = MagicMock()
+        client.invoke_model.side_effect = lambda **kwargs: _bedrock_reply('{"category": "Health", "priority": 1}')
+        with patch.object(ai_service, "_get_client", return_value=client):
+            first = ai_service.categorize_and_prioritize("Run", "Run daily", [])
+            second = ai_service.categorize_and_prioritize("Run", "Run daily", [])
+        self.assertEqual(first, second)
+        self.assertEqual(client.invoke_model.call_count, 1)
+        self.assertEqual(ai_service.cache_stats()["memory_hits"], 1)
+
+    def test_unparseable_reply_not_cached(self):
+        client = MagicMock()
+        client.invoke_model.side_effect = lambda **kwargs: _bedrock_reply("not json")
+        with patch.object(ai_service, "_get_client", return_value=client):
+            ai_service.categorize_and_prioritize("Run", "Run daily", [])
+            ai_service.categorize_and_prioritize("Run", "Run daily", [])
+        self.assertEqual(client.invoke_model.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
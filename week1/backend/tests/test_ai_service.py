@@ -0,0 +1,88 @@
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+from backend.services import ai_service
+from backend.services.ai_cache import ResponseCache
+
+
+def _stream_events(*texts):
+    events = [{"chunk": {"bytes": json.dumps({"type": "message_start"}).encode()}}]
+    for text in texts:
+        payload = {"type": "content_block_delta", "delta": {"type": "text_delta", "text": text}}
+        events.append({"chunk": {"bytes": json.dumps(payload).encode()}})
+    return {"body": iter(events)}
+
+
+class TestJsonStringFieldStream(unittest.TestCase):
+    def test_decodes_across_chunk_boundaries(self):
+        stream = ai_service.JsonStringFieldStream("ai_feedback")
+        chunks = ['{"sentiment": "positive", "ai_fe', 'edback": "Nice \\"run', '\\u00e9\\ud83d', '\\ude00", "x": "y"}']
+        self.assertEqual("".join(stream.feed(c) for c in chunks), 'Nice "runé😀')
+        self.assertTrue(stream.finished)
+
+
+class TestStreamSentiment(unittest.TestCase):
+    def setUp(self):
+        self.original_cache = ai_service._cache
+        ai_service._cache = ResponseCache(max_entries=8, ttl_seconds=60, persist=False)
+
+    def tearDown(self):
+        ai_service._cache = self.original_cache
+
+    def _run(self):
+        return list(ai_service.stream_sentiment_and_feedback("Ran 5km", "Run", "Run daily", []))
+
+    def test_streams_feedback_then_result(self):
+        client = MagicMock()
+        client.invoke_model_with_response_stream.return_value = _stream_events(
+            '{"sentiment": "positive", "sentiment_score": 0.9, ', '"ai_feedback": "Great', ' job!"}'
+        )
+        with patch.object(ai_service, "_get_client", return_value=client):
+            events = self._run()
+            cached = self._run()
+
+        self.assertEqual([e["text"] for e in events if e["type"] == "delta"], ["Great", " job!"])
+        self.assertEqual(events[-1], {"type": "result", "result": {
+            "sentiment": "positive", "sentiment_score": 0.9, "ai_feedback": "Great job!",
+        }})
+        self.assertEqual(client.invoke_model_with_response_stream.call_count, 1)
+        self.assertEqual(cached[-1], events[-1])
+
+    def test_failure_falls_back_to_defaults(self):
+        client = MagicMock()
+        client.invoke_model_with_response_stream.side_effect = RuntimeError("throttled")
+        with patch.object(ai_service, "_get_client", return_value=client):
+            events = self._run()
+        self.assertEqual(events[0], {"type": "delta", "text": "Keep going! Every step counts."})
+        self.assertEqual(events[-1]["result"]["sentiment"], "neutral")
+        self.assertTrue(ai_service.is_fallback(events[-1]["result"]))
+
+
+class TestFallback(unittest.TestCase):
+    def setUp(self):
+        self.original_cache = ai_service._cache
+        ai_service._cache = ResponseCache(max_entries=8, ttl_seconds=60, persist=False)
+
+    def tearDown(self):
+        ai_service._cache = self.original_cache
+
+    def test_answer_equal_to_the_default_is_not_a_fallback(self):
+        client = MagicMock()
+        client.invoke_model.return_value = {"body": MagicMock(read=lambda: json.dumps({
+            "content": [{"type": "text", "text": '{"category": "Personal", "priority": 3}'}],
+        }).encode())}
+        with patch.object(ai_service, "_get_client", return_value=client):
+            answer = ai_service.categorize_and_prioritize("Journal", "Write daily", [])
+        self.assertEqual(answer, ai_service._DEFAULT_CATEGORY)
+        self.assertFalse(ai_service.is_fallback(answer))
+
+        client.invoke_model.side_effect = RuntimeError("throttled")
+        with patch.object(ai_service, "_get_client", return_value=client):
+            fallback = ai_service.categorize_and_prioritize("Paint", "Every weekend", [])
+        self.assertEqual(fallback, answer)
+        self.assertTrue(ai_service.is_fallback(fallback))
+
+
+if __name__ == "__main__":
+    unittest.main()
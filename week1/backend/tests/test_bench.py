@@ -0,0 +1,72 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from botocore.exceptions import ClientError
+
+from backend.bench import datagen, runner
+from backend.bench.fake_bedrock import FakeBedrockClient
+from backend.services import ai_service
+from backend.services.ai_cache import ResponseCache
+
+
+def _body(note):
+    system, user = ai_service._sentiment_prompt(note, "Run", "Run daily", [])
+    return ai_service._request_body(system, user)
+
+
+class TestFakeBedrock(unittest.TestCase):
+    def test_replies_are_deterministic(self):
+        client = FakeBedrockClient(latency_ms=0, seed=3)
+        first = client.invoke_model(modelId="m", body=_body("Ran 5km, felt great."))["body"].read()
+        second = client.invoke_model(modelId="m", body=_body("Ran 5km, felt great."))["body"].read()
+        self.assertEqual(first, second)
+        reply = json.loads(json.loads(first)["content"][0]["text"])
+        self.assertEqual(reply["sentiment"], "positive")
+
+    def test_failure_rate(self):
+        with self.assertRaises(ClientError):
+            FakeBedrockClient(latency_ms=0, failure_rate=1.0).invoke_model(modelId="m", body=_body("x"))
+
+    def test_drives_ai_service(self):
+        with patch.object(ai_service, "_client", FakeBedrockClient(latency_ms=0)), \
+                patch.object(ai_service, "_cache", ResponseCache(persist=False)):
+            result = ai_service.analyze_sentiment_and_feedback("Missed a day.", "Run", "Run daily", [])
+            events = list(ai_service.stream_sentiment_and_feedback("Missed two days.", "Run", "Run daily", []))
+        self.assertEqual(result["sentiment"], "negative")
+        self.assertEqual(events[-1]["result"]["sentiment"], "negative")
+        self.assertEqual(
+            "".join(e["text"] for e in events if e["type"] == "delta"), events[-1]["result"]["ai_feedback"]
+        )
+
+
+class TestRunner(unittest.TestCase):
+    def test_dataset_and_plan_are_seeded(self):
+        self.assertEqual(list(datagen.records(3, 5, seed=1)), list(datagen.records(3, 5, seed=1)))
+        types = [r["type"] for r in datagen.records(2, 3)]
+        self.assertEqual(types.count("check_in"), 6)
+        self.assertEqual(runner.plan("mixed", 8, 50, 10, seed=1), runner.plan("mixed", 8, 50, 10, seed=1))
+        self.assertNotEqual(runner.plan("mixed", 8, 50, 10, seed=1), runner.plan("mixed", 8, 50, 10, seed=2))
+
+    def test_summarize_percentiles(self):
+        samples = [("GET /a", ms / 1000, ms != 100) for ms in range(1, 101)]
+        summary = runner.summarize(samples, wall_seconds=2.0)
+        stats = summary["endpoints"]["GET /a"]
+        self.assertEqual((stats["p50_ms"], stats["p95_ms"], stats["p99_ms"]), (50.0, 95.0, 99.0))
+        self.assertEqual((stats["count"], stats["errors"], stats["throughput_rps"]), (100, 1, 50.0))
+
+    def test_compare_flags_regressions(self):
+        def _report(p95, rps):
+            stats = {"p50_ms": 10.0, "p95_ms": p95, "p99_ms": 30.0, "throughput_rps": rps}
+            return {"results": {"read": {"8": {"total": stats, "endpoints": {"GET /a": stats}}}}}
+
+        _, regressions = runner.compare(_report(20.0, 100.0), _report(21.0, 95.0), threshold=0.10)
+        self.assertEqual(regressions, 0)
+        _, regressions = runner.compare(_report(20.0, 100.0), _report(30.0, 100.0), threshold=0.10)
+        self.assertEqual(regressions, 2)
+        _, regressions = runner.compare(_report(20.0, 100.0), _report(20.0, 80.0), threshold=0.10)
+        self.assertEqual(regressions, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import time
+import unittest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+import backend.database as db_mod
+from backend.db_models import CheckIn, Reminder, Resolution
+from backend.main import app
+from backend.services.rate_limiter import TokenBucket
+
+
+def _mock_categorize(title, description, existing, category_stats=None):
+    return {"category": "Health", "priority": 1}
+
+
+def _mock_sentiment(note, resolution_title, resolution_description, past_check_ins, require_feedback=None):
+    return {"sentiment": "positive", "sentiment_score": 0.9, "ai_feedback": f"Nice: {note}"}
+
+
+class TestCheckInBatches(unittest.TestCase):
+    def setUp(self):
+        db_mod.init_db()
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        session = db_mod.get_session_factory()()
+        session.query(CheckIn).delete()
+        session.query(Reminder).delete()
+        session.query(Resolution).delete()
+        session.commit()
+        session.close()
+
+    def _create_resolution(self, title):
+        with patch("backend.routers.resolutions.categorize_and_prioritize", side_effect=_mock_categorize):
+            resp = self.client.post("/api/resolutions", json={"title": title, "description": "d"})
+        return resp.json()["id"]
+
+    def _next_due(self, rid):
+        session = db_mod.get_session_factory()()
+        next_due = session.query(Reminder.next_due).filter(Reminder.resolution_id == rid).scalar()
+        session.close()
+        return next_due
+
+    @patch("backend.services.batch_service.analyze_sentiment_and_feedback", side_effect=_mock_sentiment)
+    def test_batch_create(self, mock_ai):
+        r1 = self._create_resolution("Run")
+        r2 = self._create_resolution("Read")
+        due_before = self._next_due(r1)
+        items = [{"resolution_id": r1 if i % 2 else r2, "note": f"note {i}"} for i in range(20)]
+        items.append({"resolution_id": r1, "note": "old", "created_at": "2025-03-01T08:00:00"})
+
+        response = self.client.post("/api/check-ins:batch", json={"items": items})
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual(data["created"], 21)
+        self.assertEqual(len(set(data["check_in_ids"])), 21)
+        self.assertEqual(mock_ai.call_count, 21)
+
+        check_ins = self.client.get(f"/api/resolutions/{r1}/check-ins").json()
+        self.assertEqual(len(check_ins), 11)
+        self.assertEqual(check_ins[-1]["created_at"], "2025-03-01T08:00:00")
+        self.assertEqual(check_ins[-1]["ai_feedback"], "Nice: old")
+        self.assertGreater(self._next_due(r1), due_before)
+
+    @patch("backend.services.batch_service.analyze_sentiment_and_feedback", side_effect=_mock_sentiment)
+    def test_batch_unknown_resolution(self, mock_ai):
+        r1 = self._create_resolution("Run")
+        response = self.client.post("/api/check-ins:batch", json={"items": [
+            {"resolution_id": r1, "note": "ok"},
+            {"resolution_id": 999, "note": "missing"},
+        ]})
+        self.assertEqual(response.status_code, 404)
+        mock_ai.assert_not_called()
+        self.assertEqual(self.client.get(f"/api/resolutions/{r1}/check-ins").json(), [])
+
+    def test_batch_rejects_empty(self):
+        response = self.client.post("/api/check-ins:batch", json={"items": []})
+        self.assertEqual(response.status_code, 422)
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_throttle(self):
+        bucket = TokenBucket(rate=50.0, capacity=2.0)
+        self.assertTrue(bucket.try_acquire())
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+        start = time.monotonic()
+        bucket.acquire()
+        self.assertGreater(time.monotonic() - start, 0.005)
+
+
+if __name__ == "__main__":
+    unittest.main()
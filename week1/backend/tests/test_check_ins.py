@@ -1,20 +1,42 @@
+import asyncio
+import json
+import threading
 import unittest
 from unittest.mock import patch
+import httpx
 from fastapi.testclient import TestClient
 
 import backend.database as db_mod
-from backend.db_models import CheckIn, Reminder, Resolution
+from backend.bench.fake_bedrock import FakeBedrockClient
+from backend.db_models import AiJob, CheckIn, Reminder, Resolution
 from backend.main import app
+from backend.pagination import encode_cursor
+from backend.services import ai_service, enrichment_service
+from backend.services.ai_cache import ResponseCache
 
 
-def _mock_categorize(title, description, existing):
+def _mock_categorize(title, description, existing, category_stats=None):
     return {"category": "Health", "priority": 1}
 
 
-def _mock_sentiment(note, resolution_title, resolution_description, past_check_ins):
+def _mock_sentiment(note, resolution_title, resolution_description, past_check_ins, require_feedback=None):
     return {"sentiment": "positive", "sentiment_score": 0.9, "ai_feedback": "Great progress!"}
 
 
+def _mock_sentiment_stream(note, resolution_title, resolution_description, past_check_ins, require_feedback=None):
+    yield {"type": "delta", "text": "Great "}
+    yield {"type": "delta", "text": "progress!"}
+    yield {"type": "result", "result": _mock_sentiment(note, resolution_title, resolution_description, past_check_ins)}
+
+
+def _parse_sse(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
 class TestCheckIns(unittest.TestCase):
     def setUp(self):
         db_mod.init_db()
@@ -22,6 +44,7 @@ class TestCheckIns(unittest.TestCase):
 
     def tearDown(self):
         session = db_mod.get_session_factory()()
+        session.query(AiJob).delete()
         session.query(CheckIn).delete()
         session.query(Reminder).delete()
         session.query(Resolution).delete()
@@ -43,6 +66,18 @@ class TestCheckIns(unittest.TestCase):
         self.assertEqual(data["ai_feedback"], "Great progress!")
         self.assertAlmostEqual(data["sentiment_score"], 0.9)
 
+    def test_interactive_check_ins_get_model_feedback(self):
+        rid = self._create_resolution()
+        client = FakeBedrockClient(latency_ms=0)
+        note = {"note": "Felt great, really proud of this run"}
+        with patch.object(ai_service, "_client", client), patch.object(ai_service, "_cache", ResponseCache(persist=False)):
+            with patch.object(client, "invoke_model", wraps=client.invoke_model) as invoke, \
+                    patch.object(client, "invoke_model_with_response_stream", wraps=client.invoke_model_with_response_stream) as stream:
+                self.assertEqual(self.client.post(f"/api/resolutions/{rid}/check-ins", json=note).status_code, 201)
+                self.assertEqual(self.client.post(f"/api/resolutions/{rid}/check-ins/stream", json=note).status_code, 200)
+        # The local classifier is confident here, but a person is waiting on the feedback.
+        self.assertEqual((invoke.call_count, stream.call_count), (1, 1))
+
     @patch("backend.routers.check_ins.analyze_sentiment_and_feedback", side_effect=_mock_sentiment)
     def test_list_check_ins(self, mock_ai):
         rid = self._create_resolution()
@@ -52,10 +87,140 @@ class TestCheckIns(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.json()), 2)
 
+    @patch("backend.services.enrichment_service.analyze_sentiment_and_feedback", side_effect=_mock_sentiment)
+    def test_create_deferred_check_in(self, mock_ai):
+        rid = self._create_resolution()
+        response = self.client.post(f"/api/resolutions/{rid}/check-ins?defer=true", json={"note": "Ran 5km today"})
+        self.assertEqual(response.status_code, 202)
+        data = response.json()
+        self.assertIn(data["status"], ("pending", "running", "done"))
+        self.assertIsNotNone(data["job_id"])
+        self.assertTrue(response.headers["Location"].endswith(f"/check-ins/{data['check_in_id']}/status"))
+
+        status = self.client.get(response.headers["Location"], params={"wait": 5})
+        self.assertEqual(status.status_code, 200)
+        result = status.json()
+        self.assertEqual(result["status"], "done")
+        self.assertEqual(result["check_in"]["sentiment"], "positive")
+        self.assertEqual(result["check_in"]["ai_feedback"], "Great progress!")
+
+    @patch("backend.services.enrichment_service._retry_later")
+    @patch("backend.services.enrichment_service.analyze_sentiment_and_feedback")
+    def test_deferred_check_in_fails_after_fallbacks(self, mock_ai, mock_retry):
+        mock_ai.return_value = ai_service.Fallback(ai_service._DEFAULT_SENTIMENT)
+        rid = self._create_resolution()
+        with patch("backend.services.enrichment_service.enqueue"):
+            created = self.client.post(f"/api/resolutions/{rid}/check-ins?defer=true", json={"note": "Ran 5km"}).json()
+        location = f"/api/resolutions/{rid}/check-ins/{created['check_in_id']}/status"
+
+        statuses = []
+        for _ in range(enrichment_service.MAX_ATTEMPTS):
+            enrichment_service._run_job(created["job_id"])
+            statuses.append(self.client.get(location).json()["status"])
+        self.assertEqual(statuses, ["pending"] * (enrichment_service.MAX_ATTEMPTS - 1) + ["failed"])
+        self.assertEqual([c.args for c in mock_retry.call_args_list], [(created["job_id"], 1), (created["job_id"], 2)])
+
+        check_in = self.client.get(location).json()["check_in"]
+        self.assertEqual((check_in["sentiment"], check_in["sentiment_score"], check_in["ai_feedback"]), (None, None, None))
+
+    @patch("backend.routers.check_ins.analyze_sentiment_and_feedback", side_effect=_mock_sentiment)
+    def test_check_in_status_without_job(self, mock_ai):
+        rid = self._create_resolution()
+        created = self.client.post(f"/api/resolutions/{rid}/check-ins", json={"note": "Ran 5km today"}).json()
+        response = self.client.get(f"/api/resolutions/{rid}/check-ins/{created['id']}/status")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "done")
+        self.assertIsNone(response.json()["job_id"])
+
+    @patch("backend.routers.check_ins.analyze_sentiment_and_feedback", side_effect=_mock_sentiment)
+    def test_list_check_ins_pagination(self, mock_ai):
+        rid = self._create_resolution()
+        for i in range(5):
+            self.client.post(f"/api/resolutions/{rid}/check-ins", json={"note": f"Day {i}"})
+
+        notes, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            response = self.client.get(f"/api/resolutions/{rid}/check-ins", params=params)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.json()), 2)
+            notes.extend(c["note"] for c in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        self.assertEqual(notes, [f"Day {i}" for i in reversed(range(5))])
+
+    def test_list_check_ins_invalid_cursor(self):
+        rid = self._create_resolution()
+        response = self.client.get(f"/api/resolutions/{rid}/check-ins", params={"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 400)
+        for values in ([["x"], 1], ["x", {"id": 1}], [None, 1]):
+            response = self.client.get(f"/api/resolutions/{rid}/check-ins", params={"cursor": encode_cursor(*values)})
+            self.assertEqual(response.status_code, 400, values)
+
+    @patch("backend.routers.check_ins.stream_sentiment_and_feedback", side_effect=_mock_sentiment_stream)
+    def test_create_check_in_stream(self, mock_ai):
+        rid = self._create_resolution()
+        response = self.client.post(f"/api/resolutions/{rid}/check-ins/stream", json={"note": "Ran 5km today"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+
+        events = _parse_sse(response.text)
+        self.assertEqual(events[:2], [("feedback", {"text": "Great "}), ("feedback", {"text": "progress!"})])
+        name, check_in = events[-1]
+        self.assertEqual(name, "check_in")
+        self.assertEqual(check_in["sentiment"], "positive")
+
+        stored = self.client.get(f"/api/resolutions/{rid}/check-ins").json()
+        self.assertEqual([c["id"] for c in stored], [check_in["id"]])
+
+    def test_create_check_in_stream_not_found(self):
+        response = self.client.post("/api/resolutions/999/check-ins/stream", json={"note": "test"})
+        self.assertEqual(response.status_code, 404)
+
     def test_check_in_resolution_not_found(self):
         response = self.client.post("/api/resolutions/999/check-ins", json={"note": "test"})
         self.assertEqual(response.status_code, 404)
 
 
+class TestCheckInConcurrency(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        db_mod.init_db()
+
+    def tearDown(self):
+        session = db_mod.get_session_factory()()
+        session.query(CheckIn).delete()
+        session.query(Reminder).delete()
+        session.query(Resolution).delete()
+        session.commit()
+        session.close()
+
+    async def test_slow_ai_calls_do_not_block_reads(self):
+        release = threading.Event()
+
+        def _slow_sentiment(**kwargs):
+            release.wait(timeout=5)
+            return _mock_sentiment(**kwargs)
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            with patch("backend.routers.resolutions.categorize_and_prioritize", side_effect=_mock_categorize):
+                rid = (await client.post("/api/resolutions", json={"title": "Run", "description": "d"})).json()["id"]
+
+            with patch("backend.routers.check_ins.analyze_sentiment_and_feedback", side_effect=_slow_sentiment):
+                pending = [
+                    asyncio.create_task(client.post(f"/api/resolutions/{rid}/check-ins", json={"note": f"n{i}"}))
+                    for i in range(50)
+                ]
+                await asyncio.sleep(0.1)
+                summary = await asyncio.wait_for(client.get("/api/dashboard/summary"), timeout=2)
+                self.assertEqual(summary.status_code, 200)
+                self.assertFalse(any(task.done() for task in pending))
+
+                release.set()
+                responses = await asyncio.gather(*pending)
+        self.assertTrue(all(r.status_code == 201 for r in responses))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+from unittest.mock import patch
+
+from botocore.config import Config
+
+from backend.bench.fake_bedrock import FakeBedrockClient
+from backend.services import ai_service
+from backend.services.ai_cache import ResponseCache
+from backend.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingClient(FakeBedrockClient):
+    def __init__(self, **kwargs):
+        super().__init__(latency_ms=0, **kwargs)
+        self.calls = 0
+
+    def invoke_model(self, **kwargs):
+        self.calls += 1
+        return super().invoke_model(**kwargs)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.transitions = []
+        self.breaker = CircuitBreaker(3, 10.0, on_transition=self.transitions.append, clock=self.clock)
+
+    def _fail(self):
+        with self.assertRaises(ValueError):
+            with self.breaker.guard():
+                raise ValueError("boom")
+
+    def test_opens_after_consecutive_failures(self):
+        self._fail()
+        self._fail()
+        with self.breaker.guard():
+            pass  # a success resets the count
+        self._fail()
+        self._fail()
+        self.assertEqual(self.breaker.state, CLOSED)
+        self._fail()
+        self.assertEqual(self.breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError):
+            with self.breaker.guard():
+                self.fail("call should not run while open")
+        self.assertEqual(self.transitions, [OPEN])
+
+    def test_half_open_allows_a_single_probe(self):
+        for _ in range(3):
+            self._fail()
+        self.clock.now = 10.0
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+
+        self.clock.now = 20.0
+        with self.breaker.guard():
+            pass
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.transitions, [OPEN, HALF_OPEN, OPEN, HALF_OPEN, CLOSED])
+
+    def test_abandoned_probe_is_released(self):
+        for _ in range(3):
+            self._fail()
+        self.clock.now = 10.0
+
+        def _stream():
+            with self.breaker.guard():
+                yield 1
+                yield 2
+
+        stream = _stream()
+        next(stream)
+        stream.close()
+        self.assertEqual(self.breaker.stats(), {"state": HALF_OPEN, "consecutive_failures": 3})
+        self.assertTrue(self.breaker.allow())
+
+
+class TestBedrockFallback(unittest.TestCase):
+    def test_open_circuit_serves_defaults_without_calling_bedrock(self):
+        breaker = CircuitBreaker(2, 30.0)
+        client = CountingClient(failure_rate=1.0)
+        with patch.object(ai_service, "_breaker", breaker), \
+                patch.object(ai_service, "_client", client), \
+                patch.object(ai_service, "_cache", ResponseCache(persist=False)), \
+                patch.object(ai_service.logger, "exception"):
+            for i in range(4):
+                result = ai_service.analyze_sentiment_and_feedback(f"note {i}", "Run", "Run daily", [])
+                self.assertEqual(result, ai_service._DEFAULT_SENTIMENT)
+            events = list(ai_service.stream_sentiment_and_feedback("note", "Run", "Run daily", []))
+        self.assertEqual(client.calls, 2)
+        self.assertEqual(breaker.state, OPEN)
+        self.assertEqual(events[-1]["result"], ai_service._DEFAULT_SENTIMENT)
+
+    def test_client_config(self):
+        with patch.object(ai_service, "_client", None), patch("boto3.client") as factory:
+            ai_service._get_client()
+        config = factory.call_args.kwargs["config"]
+        self.assertIsInstance(config, Config)
+        self.assertEqual(config.read_timeout, ai_service.READ_TIMEOUT_SECONDS)
+        self.assertEqual(config.retries, {"mode": "adaptive", "total_max_attempts": ai_service.MAX_ATTEMPTS})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,15 +3,17 @@ from unittest.mock import patch
 from fastapi.testclient import TestClient
 
 import backend.database as db_mod
+from backend import http_cache
 from backend.db_models import CheckIn, Reminder, Resolution
 from backend.main import app
+from backend.services import dashboard_stats
 
 
-def _mock_categorize(title, description, existing):
+def _mock_categorize(title, description, existing, category_stats=None):
     return {"category": "Health", "priority": 1}
 
 
-def _mock_sentiment(note, resolution_title, resolution_description, past_check_ins):
+def _mock_sentiment(note, resolution_title, resolution_description, past_check_ins, require_feedback=None):
     return {"sentiment": "positive", "sentiment_score": 0.8, "ai_feedback": "Nice!"}
 
 
@@ -52,6 +54,116 @@ class TestDashboard(unittest.TestCase):
         self.assertAlmostEqual(data["average_sentiment_score"], 0.8)
         self.assertEqual(data["sentiment_breakdown"]["positive"], 1)
 
+    @patch("backend.routers.check_ins.analyze_sentiment_and_feedback", side_effect=_mock_sentiment)
+    @patch("backend.routers.resolutions.categorize_and_prioritize", side_effect=_mock_categorize)
+    def test_rollup_tracks_writes(self, mock_cat, mock_sent):
+        r1 = self.client.post("/api/resolutions", json={"title": "R1", "description": "d1"}).json()["id"]
+        r2 = self.client.post("/api/resolutions", json={"title": "R2", "description": "d2"}).json()["id"]
+        self.client.post(f"/api/resolutions/{r1}/check-ins", json={"note": "one"})
+        self.client.post(f"/api/resolutions/{r2}/check-ins", json={"note": "two"})
+        self.client.put(f"/api/resolutions/{r1}", json={"status": "completed"})
+        self.client.delete(f"/api/resolutions/{r2}")
+
+        data = self.client.get("/api/dashboard/summary").json()
+        self.assertEqual(data["total_resolutions"], 1)
+        self.assertEqual(data["active_resolutions"], 0)
+        self.assertEqual(data["completed_resolutions"], 1)
+        self.assertEqual(data["total_check_ins"], 1)
+        self.assertEqual(data["sentiment_breakdown"], {"positive": 1})
+
+        with db_mod._get_engine().begin() as conn:
+            self.assertEqual(dashboard_stats.check(conn), {})
+
+    def test_rebuild_repairs_drift(self):
+        with db_mod._get_engine().begin() as conn:
+            conn.exec_driver_sql("UPDATE dashboard_stats SET total_check_ins = 42, sentiment_histogram = '{\"x\": 1}'")
+            self.assertEqual(set(dashboard_stats.check(conn)), {"total_check_ins", "sentiment_histogram"})
+            dashboard_stats.rebuild(conn)
+            self.assertEqual(dashboard_stats.check(conn), {})
+
+
+class TestSentimentAnalytics(unittest.TestCase):
+    def setUp(self):
+        db_mod.init_db()
+        http_cache._cache.clear()
+        self.client = TestClient(app)
+        session = db_mod.get_session_factory()()
+        ids = []
+        for title, category in (("Run", "Health"), ("Read", "Learning")):
+            resolution = Resolution(
+                title=title, description="d", category=category, status="active", created_at="x", updated_at="x"
+            )
+            session.add(resolution)
+            session.flush()
+            ids.append(resolution.id)
+        self.run_id, self.read_id = ids
+        # Sunday 5 Jan, Monday 6 Jan (twice), Friday 31 Jan, Saturday 1 Feb, and one without a sentiment yet.
+        for rid, at, sentiment, score in (
+            (self.run_id, "2025-01-05T23:59:59", "positive", 0.9),
+            (self.run_id, "2025-01-06T00:00:00", "negative", 0.2),
+            (self.read_id, "2025-01-06T12:30:00.250000", "positive", 0.7),
+            (self.read_id, "2025-01-31T08:00:00", "neutral", 0.5),
+            (self.run_id, "2025-02-01T08:00:00", "positive", 0.8),
+            (self.run_id, "2025-02-01T09:00:00", None, None),
+        ):
+            session.add(CheckIn(resolution_id=rid, note="n", sentiment=sentiment, sentiment_score=score, created_at=at))
+        session.commit()
+        session.close()
+
+    def tearDown(self):
+        session = db_mod.get_session_factory()()
+        session.query(CheckIn).delete()
+        session.query(Resolution).delete()
+        session.commit()
+        session.close()
+
+    def _series(self, **params):
+        response = self.client.get("/api/dashboard/sentiment", params=params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_buckets_by_day_week_and_month(self):
+        days = self._series(bucket="day")
+        self.assertEqual([(b["bucket"], b["check_ins"]) for b in days], [
+            ("2025-01-05", 1), ("2025-01-06", 2), ("2025-01-31", 1), ("2025-02-01", 2),
+        ])
+        self.assertEqual(days[1], {
+            "bucket": "2025-01-06", "check_ins": 2, "positive": 1, "neutral": 0, "negative": 1,
+            "average_sentiment_score": 0.45,
+        })
+        # Unscored check-ins count but do not move the average.
+        self.assertEqual((days[3]["positive"], days[3]["average_sentiment_score"]), (1, 0.8))
+
+        weeks = self._series(bucket="week")
+        self.assertEqual([(b["bucket"], b["check_ins"]) for b in weeks], [
+            ("2024-12-30", 1), ("2025-01-06", 2), ("2025-01-27", 3),
+        ])
+        months = self._series(bucket="month")
+        self.assertEqual([(b["bucket"], b["check_ins"]) for b in months], [("2025-01-01", 4), ("2025-02-01", 2)])
+
+        clipped = self._series(bucket="month", date_from="2025-01-06", date_to="2025-01-31")
+        self.assertEqual([(b["bucket"], b["check_ins"]) for b in clipped], [("2025-01-01", 3)])
+
+    def test_filters_and_groups(self):
+        run = self._series(bucket="month", resolution_id=self.run_id)
+        self.assertEqual([b["check_ins"] for b in run], [2, 2])
+        health = self._series(bucket="month", category="Health", date_to="2025-01-31")
+        self.assertEqual([b["check_ins"] for b in health], [2])
+
+        by_category = self._series(bucket="month", group_by="category")
+        self.assertEqual([(b["bucket"], b["category"], b["check_ins"]) for b in by_category], [
+            ("2025-01-01", "Health", 2), ("2025-01-01", "Learning", 2), ("2025-02-01", "Health", 2),
+        ])
+        by_resolution = self._series(bucket="week", group_by="resolution", date_from="2025-01-06")
+        self.assertEqual([(b["resolution_id"], b["check_ins"]) for b in by_resolution], [
+            (self.run_id, 1), (self.read_id, 1), (self.run_id, 2), (self.read_id, 1),
+        ])
+
+        reversed_range = {"date_from": "2025-02-01", "date_to": "2025-01-01"}
+        self.assertEqual(self.client.get("/api/dashboard/sentiment", params=reversed_range).status_code, 400)
+        self.assertEqual(self.client.get("/api/dashboard/sentiment", params={"bucket": "year"}).status_code, 422)
+        self.assertEqual(self._series(date_from="2030-01-01"), [])
+
 
 if __name__ == "__main__":
     unittest.main()
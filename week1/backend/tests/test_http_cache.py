@@ -0,0 +1,103 @@
+import unittest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+import backend.database as db_mod
+from backend import http_cache
+from backend.db_models import CheckIn, DataVersion, Reminder, Resolution, ResolutionTerm
+from backend.main import app
+from backend.routers import resolutions as resolutions_router
+from backend.services.data_versions import DATABASE_ID_SCOPE, GLOBAL_SCOPE
+
+
+def _mock_categorize(title, description, existing, category_stats=None):
+    return {"category": "Health", "priority": 1}
+
+
+def _mock_sentiment(note, resolution_title, resolution_description, past_check_ins, require_feedback=None):
+    return {"sentiment": "positive", "sentiment_score": 0.8, "ai_feedback": "Nice."}
+
+
+class TestHttpCache(unittest.TestCase):
+    def setUp(self):
+        db_mod.init_db()
+        http_cache._cache.clear()
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        session = db_mod.get_session_factory()()
+        session.query(CheckIn).delete()
+        session.query(Reminder).delete()
+        session.query(ResolutionTerm).delete()
+        session.query(Resolution).delete()
+        session.commit()
+        session.close()
+
+    def _version(self, scope):
+        session = db_mod.get_session_factory()()
+        try:
+            return session.get(DataVersion, scope).version
+        finally:
+            session.close()
+
+    @patch("backend.routers.resolutions.categorize_and_prioritize", side_effect=_mock_categorize)
+    def _create(self, title, mock_cat):
+        return self.client.post("/api/resolutions", json={"title": title, "description": "d"}).json()["id"]
+
+    def test_not_modified_skips_the_queries(self):
+        self._create("Run")
+        first = self.client.get("/api/resolutions")
+        etag = first.headers["ETag"]
+        self.assertEqual(first.headers["Cache-Control"], "no-cache")
+
+        with patch.object(resolutions_router, "_list_resolutions") as build:
+            revalidated = self.client.get("/api/resolutions", headers={"If-None-Match": f'W/{etag}, "other"'})
+            cached = self.client.get("/api/resolutions")
+        build.assert_not_called()
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.content, b"")
+        self.assertEqual(revalidated.headers["ETag"], etag)
+        self.assertEqual(cached.json(), first.json())
+        self.assertEqual(http_cache.cache_stats()["hits"], 1)
+
+    @patch("backend.routers.check_ins.analyze_sentiment_and_feedback", side_effect=_mock_sentiment)
+    def test_writes_bump_global_and_resolution_versions(self, mock_sent):
+        run_id = self._create("Run")
+        read_id = self._create("Read")
+        paths = ["/api/resolutions", f"/api/resolutions/{run_id}", f"/api/resolutions/{read_id}", "/api/dashboard/summary"]
+        etags = {path: self.client.get(path).headers["ETag"] for path in paths}
+
+        self.client.post(f"/api/resolutions/{run_id}/check-ins", json={"note": "Ran 5k"})
+
+        for path, etag in etags.items():
+            response = self.client.get(path, headers={"If-None-Match": etag})
+            self.assertEqual(response.status_code, 304 if path.endswith(f"/{read_id}") else 200, path)
+        detail = self.client.get(f"/api/resolutions/{run_id}").json()
+        self.assertEqual([c["note"] for c in detail["check_ins"]], ["Ran 5k"])
+
+    def test_versions_move_with_the_transaction(self):
+        before = self._version(GLOBAL_SCOPE)
+        session = db_mod.get_session_factory()()
+        try:
+            session.add(Resolution(title="t", description="d", status="active", created_at="x", updated_at="x"))
+            session.flush()
+            session.rollback()
+        finally:
+            session.close()
+        self.assertEqual(self._version(GLOBAL_SCOPE), before)
+
+        rid = self._create("Run")
+        self.assertEqual(self._version(GLOBAL_SCOPE), before + 2)  # the resolution and its reminder
+        self.client.delete(f"/api/resolutions/{rid}")
+        self.assertGreater(self._version(rid), 2)
+        self.assertGreater(self._version(DATABASE_ID_SCOPE), 0)
+
+    def test_etag_matching(self):
+        self.assertTrue(http_cache.etag_matches('"a", W/"b"', '"b"'))
+        self.assertTrue(http_cache.etag_matches("*", '"b"'))
+        self.assertFalse(http_cache.etag_matches('"a"', '"b"'))
+        self.assertFalse(http_cache.etag_matches(None, '"b"'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+import backend.database as db_mod
+from backend.bench.fake_bedrock import FakeBedrockClient
+from backend.main import app
+from backend.metrics import REGISTRY
+from backend.services import ai_service
+from backend.services.ai_cache import ResponseCache
+
+
+def _value(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        db_mod.init_db()
+        self.client = TestClient(app)
+
+    def test_http_and_sql_metrics(self):
+        route = {"method": "GET", "route": "/api/resolutions/{resolution_id}"}
+        requests = _value("http_request_duration_seconds_count", status="404", **route)
+        statements = _value("http_request_db_statements_sum", **route)
+        selects = _value("db_statements_total", operation="SELECT")
+
+        self.assertEqual(self.client.get("/api/resolutions/999999").status_code, 404)
+        self.client.get("/not-a-route")
+
+        self.assertEqual(_value("http_request_duration_seconds_count", status="404", **route), requests + 1)
+        self.assertGreater(_value("http_request_db_statements_sum", **route), statements)
+        self.assertGreater(_value("db_statements_total", operation="SELECT"), selects)
+        self.assertEqual(_value("http_requests_in_flight", method="GET"), 0)
+        self.assertGreater(
+            _value("http_request_duration_seconds_count", method="GET", route="unmatched", status="404"), 0
+        )
+
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('http_request_duration_seconds_bucket{le="0.005",method="GET"', response.text)
+
+    def test_bedrock_metrics(self):
+        cache = ResponseCache(persist=False)
+        calls = _value("bedrock_request_duration_seconds_count", api="invoke_model")
+        streams = _value("bedrock_request_duration_seconds_count", api="invoke_model_with_response_stream")
+        tokens = _value("bedrock_tokens_total", direction="output")
+        errors = _value("bedrock_errors_total", api="invoke_model", error="ThrottlingException")
+        fallbacks = _value("ai_fallbacks_total", task="sentiment")
+
+        with patch.object(ai_service, "_cache", cache), \
+                patch.object(ai_service, "_client", FakeBedrockClient(latency_ms=0)):
+            ai_service.analyze_sentiment_and_feedback("Ran 5km", "Run", "Run daily", [])
+            list(ai_service.stream_sentiment_and_feedback("Ran 6km", "Run", "Run daily", []))
+        with patch.object(ai_service, "_cache", cache), \
+                patch.object(ai_service, "_client", FakeBedrockClient(latency_ms=0, failure_rate=1.0)), \
+                patch.object(ai_service.logger, "exception"):
+            ai_service.analyze_sentiment_and_feedback("Ran 7km", "Run", "Run daily", [])
+
+        self.assertEqual(_value("bedrock_request_duration_seconds_count", api="invoke_model"), calls + 2)
+        self.assertEqual(
+            _value("bedrock_request_duration_seconds_count", api="invoke_model_with_response_stream"), streams + 1
+        )
+        self.assertGreater(_value("bedrock_tokens_total", direction="output"), tokens)
+        self.assertEqual(_value("bedrock_errors_total", api="invoke_model", error="ThrottlingException"), errors + 1)
+        self.assertEqual(_value("ai_fallbacks_total", task="sentiment"), fallbacks + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
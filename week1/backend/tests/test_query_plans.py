@@ -0,0 +1,114 @@
+import re
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, inspect
+
+import backend.database as db_mod
+from backend.db_models import Base, CheckIn, Reminder, Resolution
+from backend.main import app
+from backend.migrations import SCHEMA_VERSION, get_schema_version, run_migrations
+
+FULL_SCAN = re.compile(r"^SCAN \w+$")
+
+
+def _mock_categorize(title, description, existing, category_stats=None):
+    return {"category": "Health", "priority": 1}
+
+
+def _mock_sentiment(note, resolution_title, resolution_description, past_check_ins, require_feedback=None):
+    return {"sentiment": "positive", "sentiment_score": 0.9, "ai_feedback": "Great progress!"}
+
+
+class TestQueryPlans(unittest.TestCase):
+    def setUp(self):
+        db_mod.init_db()
+        self.client = TestClient(app)
+        self.statements = []
+        self.engines = [db_mod._get_engine(), db_mod._get_async_engine().sync_engine]
+
+        def _capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT") and not executemany:
+                self.statements.append((statement, parameters))
+
+        self._capture = _capture
+        for engine in self.engines:
+            event.listen(engine, "before_cursor_execute", _capture)
+
+    def tearDown(self):
+        for engine in self.engines:
+            event.remove(engine, "before_cursor_execute", self._capture)
+        session = db_mod.get_session_factory()()
+        session.query(CheckIn).delete()
+        session.query(Reminder).delete()
+        session.query(Resolution).delete()
+        session.commit()
+        session.close()
+
+    def _assert_indexed(self):
+        self.assertTrue(self.statements)
+        session = db_mod.get_session_factory()()
+        try:
+            raw = session.connection().connection.dbapi_connection
+            for statement, parameters in self.statements:
+                plan = [row[3] for row in raw.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+                for detail in plan:
+                    self.assertIsNone(FULL_SCAN.match(detail), f"full scan in {statement!r}: {plan}")
+                    self.assertNotIn("TEMP B-TREE", detail, f"sort without index in {statement!r}: {plan}")
+        finally:
+            session.close()
+
+    @patch("backend.routers.check_ins.analyze_sentiment_and_feedback", side_effect=_mock_sentiment)
+    @patch("backend.routers.resolutions.categorize_and_prioritize", side_effect=_mock_categorize)
+    def test_router_queries_use_indexes(self, mock_cat, mock_sent):
+        rid = self.client.post("/api/resolutions", json={"title": "Run", "description": "d"}).json()["id"]
+        self.client.post("/api/resolutions", json={"title": "Read", "description": "d"})
+        self.client.post(f"/api/resolutions/{rid}/check-ins", json={"note": "Ran"})
+        self.client.post(f"/api/resolutions/{rid}/check-ins", json={"note": "Ran again"})
+        self.statements.clear()
+
+        page = self.client.get("/api/resolutions", params={"limit": 1})
+        self.client.get("/api/resolutions", params={"limit": 1, "cursor": page.headers["X-Next-Cursor"]})
+        page = self.client.get(f"/api/resolutions/{rid}/check-ins", params={"limit": 1})
+        self.client.get(f"/api/resolutions/{rid}/check-ins", params={"limit": 1, "cursor": page.headers["X-Next-Cursor"]})
+        self.client.get(f"/api/resolutions/{rid}")
+        self.client.get("/api/reminders/due")
+        self.client.get("/api/dashboard/summary")
+        self._assert_indexed()
+
+
+class TestMigrations(unittest.TestCase):
+    def test_migrates_legacy_database(self):
+        with tempfile.NamedTemporaryFile(suffix=".db") as tmp:
+            conn = sqlite3.connect(tmp.name)
+            conn.executescript(
+                "CREATE TABLE resolutions (id INTEGER PRIMARY KEY, title TEXT, description TEXT, category TEXT,"
+                " priority INTEGER, target_date TEXT, status TEXT, created_at TEXT, updated_at TEXT);"
+                "CREATE TABLE check_ins (id INTEGER PRIMARY KEY, resolution_id INTEGER, note TEXT, sentiment TEXT,"
+                " sentiment_score REAL, ai_feedback TEXT, created_at TEXT);"
+                "CREATE TABLE reminders (id INTEGER PRIMARY KEY, resolution_id INTEGER, frequency TEXT,"
+                " next_due TEXT, is_active INTEGER);"
+            )
+            conn.close()
+
+            engine = create_engine(f"sqlite:///{tmp.name}")
+            try:
+                Base.metadata.create_all(bind=engine)
+                self.assertEqual(run_migrations(engine)[-1], SCHEMA_VERSION)
+                self.assertEqual(run_migrations(engine), [])
+                with engine.connect() as conn:
+                    self.assertEqual(get_schema_version(conn), SCHEMA_VERSION)
+
+                inspector = inspect(engine)
+                for table in Base.metadata.sorted_tables:
+                    existing = {ix["name"] for ix in inspector.get_indexes(table.name)}
+                    for index in table.indexes:
+                        self.assertIn(index.name, existing)
+            finally:
+                engine.dispose()
+
+
+if __name__ == "__main__":
+    unittest.main()
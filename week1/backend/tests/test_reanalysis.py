@@ -0,0 +1,149 @@
+import json
+import unittest
+from unittest.mock import patch
+
+import backend.database as db_mod
+from backend.bench.fake_bedrock import FakeBedrockClient
+from backend.db_models import CheckIn, ReanalysisRun, Reminder, Resolution
+from backend.services import ai_service, reanalysis_service, similarity_service
+from backend.services.ai_cache import ResponseCache
+from backend.services.rate_limiter import TokenBucket
+
+
+def _relabel(items, concurrency, limiter, **kwargs):
+    return [
+        {"sentiment": "negative", "sentiment_score": 0.9, "ai_feedback": f"Context {len(i['past_check_ins'])}"}
+        for i in items
+    ]
+
+
+def _recategorize(items, concurrency, limiter, **kwargs):
+    return [{"category": "Learning", "priority": 2} for _ in items]
+
+
+class ModelClient(FakeBedrockClient):
+    def __init__(self):
+        super().__init__(latency_ms=0)
+        self.calls = 0
+
+    def invoke_model(self, **kwargs):
+        self.calls += 1
+        return super().invoke_model(**kwargs)
+
+    @staticmethod
+    def _reply(request, rng):
+        return json.dumps({"sentiment": "neutral", "sentiment_score": 0.8, "ai_feedback": "From the model"})
+
+
+class TestReanalysis(unittest.TestCase):
+    def setUp(self):
+        db_mod.init_db()
+        session = db_mod.get_session_factory()()
+        for title in ("Run", "Read"):
+            resolution = Resolution(title=title, description="d", status="active", created_at="x", updated_at="x")
+            session.add(resolution)
+            session.flush()
+            similarity_service.index_resolution(session, resolution.id, title, resolution.description)
+            for day in range(4):
+                session.add(CheckIn(
+                    resolution_id=resolution.id, note=f"{title} {day}", sentiment="positive",
+                    sentiment_score=0.5, ai_feedback="old", created_at=f"2025-01-0{day + 1}T08:00:00",
+                ))
+        session.commit()
+        session.close()
+
+    def tearDown(self):
+        session = db_mod.get_session_factory()()
+        session.query(ReanalysisRun).delete()
+        session.query(CheckIn).delete()
+        session.query(Reminder).delete()
+        session.query(Resolution).delete()
+        session.commit()
+        session.close()
+
+    def _check_ins(self):
+        session = db_mod.get_session_factory()()
+        try:
+            return session.query(CheckIn.note, CheckIn.sentiment, CheckIn.ai_feedback).order_by(CheckIn.id).all()
+        finally:
+            session.close()
+
+    def _resume(self, run_id, **kwargs):
+        return reanalysis_service.resume(
+            run_id, chunk_size=3, limiter=TokenBucket(rate=1000.0, capacity=1000.0), **kwargs
+        )
+
+    @patch("backend.services.reanalysis_service.categorize_many", side_effect=_recategorize)
+    @patch("backend.services.reanalysis_service.analyze_many", side_effect=_relabel)
+    def test_reanalyzes_everything_with_history_context(self, mock_analyze, mock_categorize):
+        progress = []
+        run_id = reanalysis_service.start_run(categorize=True)
+        result = self._resume(run_id, on_progress=progress.append)
+
+        self.assertEqual(result["status"], reanalysis_service.RUN_COMPLETED)
+        self.assertEqual((result["total"], result["processed"], result["changed"], result["failed"]), (10, 10, 10, 0))
+        # Each resolution's first note has no history; later ones see up to five earlier notes.
+        self.assertEqual([c.ai_feedback for c in self._check_ins()], [f"Context {n}" for n in (0, 1, 2, 3)] * 2)
+        self.assertEqual({c.sentiment for c in self._check_ins()}, {"negative"})
+        self.assertEqual(progress[-1].processed, 10)
+        self.assertEqual(mock_categorize.call_count, 1)
+        # Resolutions get the context the create endpoint gives them, without themselves.
+        items = mock_categorize.call_args.args[0]
+        self.assertEqual([i["category_stats"][0]["count"] for i in items], [2, 2])
+        self.assertEqual([[s["title"] for s in i["existing_resolutions"]] for i in items], [["Read"], ["Run"]])
+
+    def test_resumes_from_checkpoint_after_a_crash(self):
+        calls = []
+
+        def _crash_on_second_chunk(items, concurrency, limiter, **kwargs):
+            calls.append([i["note"] for i in items])
+            if len(calls) == 2:
+                raise RuntimeError("killed")
+            return _relabel(items, concurrency, limiter)
+
+        run_id = reanalysis_service.start_run()
+        with patch.object(reanalysis_service, "analyze_many", side_effect=_crash_on_second_chunk):
+            with self.assertRaises(RuntimeError):
+                self._resume(run_id)
+            self.assertEqual(reanalysis_service.start_run(), run_id)
+            result = self._resume(run_id)
+
+        self.assertEqual(result["status"], reanalysis_service.RUN_COMPLETED)
+        self.assertEqual(calls[1], calls[2])
+        self.assertEqual(sum(len(c) for c in calls[2:]), 5)
+        self.assertEqual({c.sentiment for c in self._check_ins()}, {"negative"})
+
+    def test_fallbacks_keep_old_values_and_open_circuit_interrupts(self):
+        def _fallback(items, concurrency, limiter, **kwargs):
+            return [ai_service.Fallback(ai_service._DEFAULT_SENTIMENT) for _ in items]
+
+        run_id = reanalysis_service.start_run()
+        with patch.object(reanalysis_service, "analyze_many", side_effect=_fallback):
+            result = self._resume(run_id)
+            self.assertEqual((result["failed"], result["changed"]), (8, 0))
+            self.assertEqual({c.ai_feedback for c in self._check_ins()}, {"old"})
+
+            run_id = reanalysis_service.start_run(restart=True)
+            with patch.object(ai_service, "breaker_stats", return_value={"state": "open"}):
+                result = self._resume(run_id)
+        self.assertEqual((result["status"], result["processed"]), (reanalysis_service.RUN_INTERRUPTED, 0))
+        self.assertEqual(reanalysis_service.start_run(), run_id)
+
+    def test_confident_notes_still_get_model_feedback(self):
+        session = db_mod.get_session_factory()()
+        session.query(CheckIn).update({CheckIn.note: "Felt great, really proud of this"})
+        session.commit()
+        session.close()
+        client = ModelClient()
+
+        run_id = reanalysis_service.start_run()
+        with patch.object(ai_service, "_client", client), patch.object(ai_service, "_cache", ResponseCache(persist=False)):
+            result = self._resume(run_id)
+
+        # The local classifier is sure about every note, but a re-run still asks the model.
+        self.assertEqual(result["status"], reanalysis_service.RUN_COMPLETED)
+        self.assertEqual((client.calls, result["changed"]), (8, 8))
+        self.assertEqual({c.ai_feedback for c in self._check_ins()}, {"From the model"})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+import httpx
+
+import backend.database as db_mod
+from backend.db_models import CheckIn, Reminder, Resolution
+from backend.main import app
+from backend.services import reminder_scheduler
+from backend.services.reminder_scheduler import EVENT_CLEARED, EVENT_DUE, ReminderSchedule, _Entry
+
+
+def _mock_categorize(title, description, existing, category_stats=None):
+    return {"category": "Health", "priority": 1}
+
+
+def _mock_sentiment(note, resolution_title, resolution_description, past_check_ins, require_feedback=None):
+    return {"sentiment": "positive", "sentiment_score": 0.9, "ai_feedback": "Great progress!"}
+
+
+class TestReminderSchedule(unittest.TestCase):
+    def test_advance_moves_due_entries_in_order(self):
+        schedule = ReminderSchedule()
+        schedule.upsert(_Entry(1, "Run", "weekly", "2026-01-03"), "2026-01-01")
+        schedule.upsert(_Entry(2, "Read", "daily", "2026-01-02"), "2026-01-01")
+        self.assertEqual(schedule.due(), [])
+
+        events = schedule.advance("2026-01-02")
+        self.assertEqual([(name, e.resolution_id) for name, e in events], [(EVENT_DUE, 2)])
+        events = schedule.advance("2026-01-03")
+        self.assertEqual([(name, e.resolution_id) for name, e in events], [(EVENT_DUE, 1)])
+        self.assertEqual([e.resolution_id for e in schedule.due()], [2, 1])
+
+    def test_superseded_heap_items_are_skipped(self):
+        schedule = ReminderSchedule()
+        schedule.upsert(_Entry(1, "Run", "weekly", "2026-01-02"), "2026-01-01")
+        schedule.upsert(_Entry(1, "Run", "weekly", "2026-01-09"), "2026-01-01")
+        self.assertEqual(schedule.advance("2026-01-05"), [])
+
+        events = schedule.upsert(_Entry(2, "Read", "daily", "2026-01-01"), "2026-01-05")
+        self.assertEqual([name for name, _ in events], [EVENT_DUE])
+        events = schedule.reschedule(2, "daily", "2026-01-06", "2026-01-05")
+        self.assertEqual([name for name, _ in events], [EVENT_CLEARED])
+        self.assertEqual(schedule.reschedule(3, "daily", "2026-01-06", "2026-01-05"), [])
+        self.assertEqual(schedule.due(), [])
+
+
+class TestReminderScheduler(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        db_mod.init_db()
+
+    def tearDown(self):
+        reminder_scheduler.unload()
+        session = db_mod.get_session_factory()()
+        session.query(CheckIn).delete()
+        session.query(Reminder).delete()
+        session.query(Resolution).delete()
+        session.commit()
+        session.close()
+
+    def _make_overdue(self, rid):
+        session = db_mod.get_session_factory()()
+        reminder = session.query(Reminder).filter(Reminder.resolution_id == rid).first()
+        reminder.next_due = "2020-01-01"
+        session.commit()
+        session.close()
+
+    async def test_due_set_is_served_and_updated_in_memory(self):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            with patch("backend.routers.resolutions.categorize_and_prioritize", side_effect=_mock_categorize):
+                rid = (await client.post("/api/resolutions", json={"title": "Run", "description": "d"})).json()["id"]
+                other = (await client.post("/api/resolutions", json={"title": "Read", "description": "d"})).json()["id"]
+            self._make_overdue(rid)
+            self._make_overdue(other)
+            self.assertEqual(reminder_scheduler.load(), 2)
+            queue = reminder_scheduler.subscribe()
+
+            with patch("backend.services.reminder_scheduler.get_session_factory") as no_db:
+                due = (await client.get("/api/reminders/due")).json()
+                no_db.assert_not_called()
+            self.assertEqual([r["resolution_id"] for r in due], [rid, other])
+
+            with patch("backend.routers.check_ins.analyze_sentiment_and_feedback", side_effect=_mock_sentiment):
+                await client.post(f"/api/resolutions/{rid}/check-ins", json={"note": "Ran 5km"})
+            await client.put(f"/api/resolutions/{other}", json={"status": "completed"})
+
+            events = [await asyncio.wait_for(queue.get(), timeout=1) for _ in range(2)]
+            reminder_scheduler.unsubscribe(queue)
+
+            self.assertEqual([(e["event"], e["data"]["resolution_id"]) for e in events], [
+                (EVENT_CLEARED, rid), (EVENT_CLEARED, other),
+            ])
+            self.assertEqual((await client.get("/api/reminders/due")).json(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
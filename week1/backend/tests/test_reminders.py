@@ -7,7 +7,7 @@ from backend.db_models import CheckIn, Reminder, Resolution
 from backend.main import app
 
 
-def _mock_categorize(title, description, existing):
+def _mock_categorize(title, description, existing, category_stats=None):
     return {"category": "Health", "priority": 1}
 
 
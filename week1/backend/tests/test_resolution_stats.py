@@ -0,0 +1,150 @@
+import unittest
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import backend.database as db_mod
+from backend import http_cache
+from backend.db_models import CheckIn, Reminder, Resolution, ResolutionTerm
+from backend.main import app
+from backend.services import resolution_stats
+
+
+def _mock_categorize(title, description, existing, category_stats=None):
+    return {"category": "Health", "priority": 1}
+
+
+def _mock_sentiment(note, resolution_title, resolution_description, past_check_ins, require_feedback=None):
+    return {"sentiment": "positive", "sentiment_score": 0.8, "ai_feedback": "Nice."}
+
+
+def _at(day: date) -> str:
+    return datetime.combine(day, datetime.min.time()).replace(hour=8).isoformat()
+
+
+class TestResolutionStats(unittest.TestCase):
+    def setUp(self):
+        db_mod.init_db()
+        http_cache._cache.clear()
+        self.client = TestClient(app)
+        self.today = datetime.utcnow().date()
+
+    def tearDown(self):
+        session = db_mod.get_session_factory()()
+        session.query(CheckIn).delete()
+        session.query(Reminder).delete()
+        session.query(ResolutionTerm).delete()
+        session.query(Resolution).delete()
+        session.commit()
+        session.close()
+
+    @patch("backend.routers.resolutions.categorize_and_prioritize", side_effect=_mock_categorize)
+    def _create(self, title, mock_cat):
+        return self.client.post("/api/resolutions", json={"title": title, "description": "d"}).json()["id"]
+
+    @patch("backend.services.batch_service.analyze_sentiment_and_feedback", side_effect=_mock_sentiment)
+    def _backfill(self, rid, days, mock_ai):
+        items = [{"resolution_id": rid, "note": f"note {d}", "created_at": _at(self.today - timedelta(days=d))} for d in days]
+        self.assertEqual(self.client.post("/api/check-ins:batch", json={"items": items}).status_code, 201)
+
+    def _check(self):
+        with db_mod._get_engine().begin() as conn:
+            return resolution_stats.check(conn)
+
+    @patch("backend.routers.check_ins.analyze_sentiment_and_feedback", side_effect=_mock_sentiment)
+    def test_streaks_weeks_and_rolling_sentiment(self, mock_sent):
+        rid = self._create("Meditate")
+        empty = self.client.get(f"/api/resolutions/{rid}/stats").json()
+        self.assertEqual((empty["check_in_count"], empty["current_streak"], empty["weekly_check_ins"]), (0, 0, {}))
+
+        # Two days ago, four and five days ago (back-dated out of order), then today.
+        self._backfill(rid, [2, 5, 4])
+        self.client.post(f"/api/resolutions/{rid}/check-ins", json={"note": "Sat for 15 minutes"})
+        stats = self.client.get(f"/api/resolutions/{rid}/stats").json()
+        self.assertEqual(stats["check_in_count"], 4)
+        self.assertEqual(stats["current_streak"], 1)
+        self.assertEqual(stats["longest_streak"], 2)
+        self.assertEqual(stats["rolling_sentiment"], 0.8)
+        self.assertEqual(sum(stats["weekly_check_ins"].values()), 4)
+        self.assertEqual(stats["check_ins_this_week"], stats["weekly_check_ins"][resolution_stats.iso_week(self.today)])
+        self.assertEqual(stats["weekly_adherence"], 1.0)
+
+        self._backfill(rid, [1])
+        self.assertEqual(self.client.get(f"/api/resolutions/{rid}/stats").json()["current_streak"], 3)
+
+        session = db_mod.get_session_factory()()
+        session.query(CheckIn).filter(CheckIn.note == "note 1").delete()
+        session.commit()
+        session.close()
+        self.assertEqual(self._check(), {})
+        self.assertEqual(self.client.delete(f"/api/resolutions/{rid}").status_code, 204)
+        self.assertEqual(self.client.get(f"/api/resolutions/{rid}/stats").status_code, 404)
+        self.assertEqual(self._check(), {})
+
+    def test_lapsed_streak_reads_as_zero(self):
+        rid = self._create("Read")
+        self._backfill(rid, [4, 3])
+        stats = self.client.get(f"/api/resolutions/{rid}/stats").json()
+        self.assertEqual((stats["current_streak"], stats["longest_streak"]), (0, 2))
+
+    def test_list_includes_stats_in_one_query(self):
+        ids = [self._create(f"Goal {i}") for i in range(5)]
+        self._backfill(ids[0], [0, 1])
+        selects = []
+
+        def _capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                selects.append(statement)
+
+        engine = db_mod._get_async_engine().sync_engine
+        event.listen(engine, "before_cursor_execute", _capture)
+        try:
+            plain = self.client.get("/api/resolutions").json()
+            plain_selects = len(selects)
+            with_stats = self.client.get("/api/resolutions?include_stats=true").json()
+        finally:
+            event.remove(engine, "before_cursor_execute", _capture)
+
+        self.assertEqual(len(selects), 2 * plain_selects)
+        self.assertNotIn("stats", plain[0])
+        by_id = {item["id"]: item["stats"] for item in with_stats}
+        self.assertEqual((by_id[ids[0]]["check_in_count"], by_id[ids[0]]["current_streak"]), (2, 2))
+        self.assertEqual(by_id[ids[1]]["check_in_count"], 0)
+
+    def test_rebuild_matches_triggers(self):
+        rid = self._create("Run")
+        self._backfill(rid, [9, 8, 6, 0])
+        with db_mod._get_engine().begin() as conn:
+            before = conn.exec_driver_sql("SELECT * FROM resolution_stats WHERE resolution_id = ?", (rid,)).one()
+            conn.exec_driver_sql("UPDATE resolution_stats SET check_in_count = 0, longest_streak = 0")
+            resolution_stats.rebuild(conn)
+            after = conn.exec_driver_sql("SELECT * FROM resolution_stats WHERE resolution_id = ?", (rid,)).one()
+        self.assertEqual(after[:5], before[:5])
+        self.assertEqual(after.longest_streak, 2)
+        self.assertEqual(self._check(), {})
+
+    def test_deferred_recomputes_once_on_exit(self):
+        rid = self._create("Swim")
+        self._backfill(rid, [0])
+
+        def _count(conn):
+            return conn.exec_driver_sql("SELECT check_in_count FROM resolution_stats WHERE resolution_id = ?", (rid,)).scalar()
+
+        with db_mod._get_engine().begin() as conn:
+            with resolution_stats.deferred(conn) as touched:
+                for day in (3, 1, 2):
+                    conn.execute(CheckIn.__table__.insert().values(
+                        resolution_id=rid, note="n", created_at=_at(self.today - timedelta(days=day))
+                    ))
+                touched.add(rid)
+                self.assertEqual(_count(conn), 1)
+            self.assertEqual(_count(conn), 4)
+            self.assertIsNone(conn.exec_driver_sql("SELECT * FROM resolution_stats_paused").first())
+        stats = self.client.get(f"/api/resolutions/{rid}/stats").json()
+        self.assertEqual((stats["current_streak"], stats["longest_streak"]), (4, 4))
+        self.assertEqual(self._check(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,16 @@
 import unittest
 from unittest.mock import patch
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 
 import backend.database as db_mod
-from backend.db_models import CheckIn, Reminder, Resolution
+from backend.db_models import CheckIn, Reminder, Resolution, ResolutionStats
 from backend.main import app
+from backend.pagination import encode_cursor
+from backend.services import dashboard_stats, deletion_service, resolution_stats
 
 
-def _mock_categorize(title, description, existing):
+def _mock_categorize(title, description, existing, category_stats=None):
     return {"category": "Learning", "priority": 2}
 
 
@@ -57,6 +60,41 @@ class TestResolutions(unittest.TestCase):
         self.assertIn("check_ins", data)
         self.assertIn("reminder", data)
 
+    @patch("backend.routers.resolutions.categorize_and_prioritize", side_effect=_mock_categorize)
+    def test_list_resolutions_pagination(self, mock_ai):
+        for i in range(5):
+            self.client.post("/api/resolutions", json={"title": f"Res {i}", "description": "d"})
+
+        titles, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            response = self.client.get("/api/resolutions", params=params)
+            titles.extend(r["title"] for r in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        self.assertEqual(titles, [f"Res {i}" for i in reversed(range(5))])
+
+    def test_list_resolutions_rejects_tampered_cursor(self):
+        for values in ([{"a": 1}, "x", 1], [1, [1], 1], [1, "x", "1"], [True, "x", 1], [1, "x"]):
+            response = self.client.get("/api/resolutions", params={"cursor": encode_cursor(*values)})
+            self.assertEqual(response.status_code, 400, values)
+        self.assertEqual(self.client.get("/api/resolutions", params={"cursor": encode_cursor(None, "x", 1)}).status_code, 200)
+
+    @patch("backend.routers.check_ins.analyze_sentiment_and_feedback")
+    @patch("backend.routers.resolutions.categorize_and_prioritize", side_effect=_mock_categorize)
+    def test_get_resolution_detail_embeds_newest_page(self, mock_ai, mock_sentiment):
+        mock_sentiment.return_value = {"sentiment": "neutral", "sentiment_score": 0.5, "ai_feedback": "ok"}
+        rid = self.client.post("/api/resolutions", json={"title": "Detail", "description": "d"}).json()["id"]
+        for i in range(3):
+            self.client.post(f"/api/resolutions/{rid}/check-ins", json={"note": f"Day {i}"})
+
+        data = self.client.get(f"/api/resolutions/{rid}", params={"check_ins_limit": 2}).json()
+        self.assertEqual([c["note"] for c in data["check_ins"]], ["Day 2", "Day 1"])
+        older = self.client.get(f"/api/resolutions/{rid}/check-ins", params={"cursor": data["check_ins_next_cursor"]})
+        self.assertEqual([c["note"] for c in older.json()], ["Day 0"])
+        self.assertNotIn("X-Next-Cursor", older.headers)
+
     def test_get_resolution_not_found(self):
         response = self.client.get("/api/resolutions/999")
         self.assertEqual(response.status_code, 404)
@@ -78,6 +116,76 @@ class TestResolutions(unittest.TestCase):
         response = self.client.get(f"/api/resolutions/{rid}")
         self.assertEqual(response.status_code, 404)
 
+    def _add_check_ins(self, rid, count):
+        session = db_mod.get_session_factory()()
+        for i in range(count):
+            session.add(CheckIn(resolution_id=rid, note=f"n{i}", sentiment="positive", sentiment_score=0.5,
+                                created_at=f"2025-01-01T08:00:{i % 60:02d}"))
+        session.commit()
+        session.close()
+
+    def _count(self, model, rid):
+        session = db_mod.get_session_factory()()
+        try:
+            return session.query(model).filter(model.resolution_id == rid).count()
+        finally:
+            session.close()
+
+    @patch("backend.routers.resolutions.categorize_and_prioritize", side_effect=_mock_categorize)
+    def test_delete_cascades_in_the_database(self, mock_ai):
+        rid = self.client.post("/api/resolutions", json={"title": "Del", "description": "d"}).json()["id"]
+        self._add_check_ins(rid, 50)
+        statements = []
+
+        def _capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = db_mod._get_async_engine().sync_engine
+        event.listen(engine, "before_cursor_execute", _capture)
+        try:
+            self.assertEqual(self.client.delete(f"/api/resolutions/{rid}").status_code, 204)
+        finally:
+            event.remove(engine, "before_cursor_execute", _capture)
+
+        # One statement; the children are never loaded.
+        self.assertEqual([s.split()[0] for s in statements], ["DELETE"])
+        for model in (CheckIn, Reminder, ResolutionStats):
+            self.assertEqual(self._count(model, rid), 0)
+        with db_mod._get_engine().begin() as conn:
+            self.assertEqual(dashboard_stats.check(conn), {})
+            self.assertEqual(resolution_stats.check(conn), {})
+        self.assertEqual(self.client.delete(f"/api/resolutions/{rid}").status_code, 404)
+
+    @patch("backend.routers.resolutions.categorize_and_prioritize", side_effect=_mock_categorize)
+    def test_batch_and_soft_delete(self, mock_ai):
+        r1, r2, r3 = (
+            self.client.post("/api/resolutions", json={"title": f"R{i}", "description": "d"}).json()["id"]
+            for i in range(3)
+        )
+        self._add_check_ins(r1, 20)
+
+        with patch.object(deletion_service, "schedule_purge") as mock_purge:
+            response = self.client.post("/api/resolutions:batch-delete", json={"ids": [r1, r2, 999999], "soft": True})
+        self.assertEqual(response.json(), {"deleted": [r1, r2], "not_found": [999999]})
+        mock_purge.assert_called_once()
+
+        # Hidden right away, still stored until the purge runs.
+        self.assertEqual([r["id"] for r in self.client.get("/api/resolutions").json()], [r3])
+        self.assertEqual(self.client.get(f"/api/resolutions/{r1}").status_code, 404)
+        self.assertEqual(self.client.get(f"/api/resolutions/{r1}/check-ins").status_code, 404)
+        self.assertEqual(self.client.put(f"/api/resolutions/{r1}", json={"title": "x"}).status_code, 404)
+        self.assertEqual(self.client.delete(f"/api/resolutions/{r1}").status_code, 404)
+        self.assertEqual(self._count(CheckIn, r1), 20)
+
+        self.assertEqual(deletion_service.purge(), 2)
+        self.assertEqual(self._count(CheckIn, r1), 0)
+        with db_mod._get_engine().begin() as conn:
+            self.assertEqual(dashboard_stats.check(conn), {})
+
+        response = self.client.post("/api/resolutions:batch-delete", json={"ids": [r3]})
+        self.assertEqual(response.json(), {"deleted": [r3], "not_found": []})
+        self.assertEqual(self.client.get("/api/resolutions").json(), [])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,156 @@
+import unittest
+from datetime import date, timedelta
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+import backend.database as db_mod
+from backend.db_models import CheckIn, Reminder, Resolution
+from backend.main import app
+from backend.pagination import encode_cursor
+from backend.services import search_service
+
+
+def _mock_categorize(title, description, existing, category_stats=None):
+    return {"category": "Health", "priority": 1}
+
+
+def _mock_sentiment(note, resolution_title, resolution_description, past_check_ins, require_feedback=None):
+    if "pain" in note:
+        return {"sentiment": "negative", "sentiment_score": 0.2, "ai_feedback": "Rest that knee."}
+    return {"sentiment": "positive", "sentiment_score": 0.9, "ai_feedback": "Great pacing!"}
+
+
+class TestSearch(unittest.TestCase):
+    def setUp(self):
+        db_mod.init_db()
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        session = db_mod.get_session_factory()()
+        session.query(CheckIn).delete()
+        session.query(Reminder).delete()
+        session.query(Resolution).delete()
+        session.commit()
+        session.close()
+
+    def _create_resolution(self, title, description="d"):
+        with patch("backend.routers.resolutions.categorize_and_prioritize", side_effect=_mock_categorize):
+            resp = self.client.post("/api/resolutions", json={"title": title, "description": description})
+        return resp.json()["id"]
+
+    def _check_in(self, rid, note):
+        with patch("backend.routers.check_ins.analyze_sentiment_and_feedback", side_effect=_mock_sentiment):
+            return self.client.post(f"/api/resolutions/{rid}/check-ins", json={"note": note}).json()["id"]
+
+    def test_ranked_highlighted_results(self):
+        run = self._create_resolution("Run a marathon")
+        read = self._create_resolution("Read books")
+        self._check_in(run, "Long run, knee pain at the end")
+        self._check_in(run, "Easy run")
+        self._check_in(read, "Read about running form")
+
+        response = self.client.get("/api/search", params={"q": "the knee"})
+        self.assertEqual(response.status_code, 200)
+        [hit] = response.json()
+        self.assertEqual(hit["resolution_title"], "Run a marathon")
+        self.assertEqual(hit["note_highlight"], "Long run, <mark>knee</mark> pain at the end")
+        self.assertEqual(hit["ai_feedback_highlight"], "Rest that <mark>knee</mark>.")
+
+        hits = self.client.get("/api/search", params={"q": "running"}).json()
+        self.assertEqual(len(hits), 3)
+        hits = self.client.get("/api/search", params={"q": "run", "resolution_id": read}).json()
+        self.assertEqual([h["note"] for h in hits], ["Read about running form"])
+
+    def test_filters(self):
+        rid = self._create_resolution("Run a marathon")
+        self._check_in(rid, "Run with knee pain")
+        self._check_in(rid, "Great run")
+
+        hits = self.client.get("/api/search", params={"q": "run", "sentiment": "negative"}).json()
+        self.assertEqual([h["note"] for h in hits], ["Run with knee pain"])
+
+        today = date.today()
+        hits = self.client.get("/api/search", params={"q": "run", "date_from": today.isoformat()}).json()
+        self.assertEqual(len(hits), 2)
+        hits = self.client.get("/api/search", params={
+            "q": "run", "date_from": (today - timedelta(days=30)).isoformat(),
+            "date_to": (today - timedelta(days=1)).isoformat(),
+        }).json()
+        self.assertEqual(hits, [])
+        self.assertEqual(self.client.get("/api/search", params={"q": "run", "date_to": "soon"}).status_code, 400)
+
+    def test_pagination(self):
+        rid = self._create_resolution("Meditate")
+        for i in range(5):
+            self._check_in(rid, f"Meditated {i} times " + "calm " * i)
+
+        seen = []
+        cursor = None
+        while True:
+            params = {"q": "calm", "limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = self.client.get("/api/search", params=params)
+            seen.extend(h["id"] for h in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        self.assertEqual(len(seen), 4)
+        self.assertEqual(len(set(seen)), 4)
+
+    def test_pagination_continues_past_ranked_window(self):
+        rid = self._create_resolution("Meditate")
+        ids = [self._check_in(rid, f"Calm session {i} " + "calm " * (i % 3)) for i in range(7)]
+
+        seen, cursor = [], None
+        with patch.object(search_service, "MAX_RANKED_CANDIDATES", 3):
+            while True:
+                params = {"q": "calm", "limit": 2, **({"cursor": cursor} if cursor else {})}
+                response = self.client.get("/api/search", params=params)
+                seen.extend(h["id"] for h in response.json())
+                cursor = response.headers.get("X-Next-Cursor")
+                if not cursor:
+                    break
+        # The three newest are ranked; the older four follow newest-first.
+        self.assertEqual(sorted(seen[:3]), ids[4:])
+        self.assertEqual(seen[3:], ids[3::-1])
+
+    def test_highlights_are_escaped(self):
+        rid = self._create_resolution("Run")
+        self._check_in(rid, "<script>alert(1)</script> run & rest")
+        [hit] = self.client.get("/api/search", params={"q": "run"}).json()
+        self.assertEqual(
+            hit["note_highlight"], "&lt;script&gt;alert(1)&lt;/script&gt; <mark>run</mark> &amp; rest"
+        )
+
+    def test_index_follows_writes(self):
+        rid = self._create_resolution("Learn Korean")
+        check_in_id = self._check_in(rid, "Vocabulary drills")
+        self.assertEqual(len(self.client.get("/api/search", params={"q": "korean"}).json()), 1)
+
+        self.client.put(f"/api/resolutions/{rid}", json={"title": "Learn Japanese"})
+        self.assertEqual(self.client.get("/api/search", params={"q": "korean"}).json(), [])
+        self.assertEqual(self.client.get("/api/search", params={"q": "japanese"}).json()[0]["id"], check_in_id)
+
+        self.client.delete(f"/api/resolutions/{rid}")
+        self.assertEqual(self.client.get("/api/search", params={"q": "vocabulary"}).json(), [])
+
+    def test_query_syntax_is_escaped(self):
+        rid = self._create_resolution("Run")
+        self._check_in(rid, "Ran NEAR the river")
+        self.assertEqual(len(self.client.get("/api/search", params={"q": 'river" OR NEAR(*'}).json()), 1)
+        self.assertEqual(self.client.get("/api/search", params={"q": "~r1"}).json(), [])
+        self.assertEqual(self.client.get("/api/search", params={"q": "!!!"}).status_code, 400)
+        tampered = encode_cursor({"rank": 1}, 1, 1, 1)
+        self.assertEqual(self.client.get("/api/search", params={"q": "river", "cursor": tampered}).status_code, 400)
+
+    def test_rebuild_matches_triggers(self):
+        rid = self._create_resolution("Save money")
+        self._check_in(rid, "Skipped coffee")
+        with db_mod._get_engine().begin() as conn:
+            self.assertEqual(search_service.rebuild(conn), 1)
+        self.assertEqual(len(self.client.get("/api/search", params={"q": "coffee"}).json()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
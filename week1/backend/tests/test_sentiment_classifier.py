@@ -0,0 +1,89 @@
+import unittest
+from unittest.mock import patch
+
+from backend.bench.fake_bedrock import FakeBedrockClient
+from backend.services import ai_service, batch_service
+from backend.services.ai_cache import ResponseCache
+from backend.services.rate_limiter import TokenBucket
+from backend.services.sentiment_classifier import NEGATIVE, NEUTRAL, POSITIVE, classify, classify_many
+
+
+class CountingClient(FakeBedrockClient):
+    def __init__(self):
+        super().__init__(latency_ms=0)
+        self.notes = []
+
+    def invoke_model(self, **kwargs):
+        self.notes.append(kwargs["body"])
+        return super().invoke_model(**kwargs)
+
+
+class TestClassifier(unittest.TestCase):
+    def test_labels_and_confidence(self):
+        labels = classify_many([
+            "Really proud, new personal best",
+            "Gave up halfway, felt terrible",
+            "It was good but I was exhausted",
+            "Ran 5km",
+        ])
+        self.assertEqual([label.sentiment for label in labels], [POSITIVE, NEGATIVE, NEUTRAL, NEUTRAL])
+        self.assertGreater(labels[0].confidence, 0.9)
+        self.assertLess(labels[2].confidence, 0.5)
+        self.assertEqual(labels[3].confidence, 0.0)
+
+    def test_negation_stays_in_its_clause(self):
+        self.assertEqual(classify("not bad at all").sentiment, POSITIVE)
+        self.assertEqual(classify("I didn't stop, great run").sentiment, POSITIVE)
+
+
+class TestTieredSentiment(unittest.TestCase):
+    def setUp(self):
+        self.client = CountingClient()
+        self.patches = [
+            patch.object(ai_service, "_client", self.client),
+            patch.object(ai_service, "_cache", ResponseCache(persist=False)),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+
+    def _analyze(self, note, **kwargs):
+        return ai_service.analyze_sentiment_and_feedback(note, "Run", "Run daily", [], **kwargs)
+
+    def test_escalates_only_when_uncertain_or_feedback_required(self):
+        before = ai_service.sentiment_stats()
+        local = self._analyze("Felt great, really proud of this run")
+        self.assertEqual(self.client.notes, [])
+        self.assertEqual(local["sentiment"], POSITIVE)
+        self.assertGreaterEqual(local["sentiment_score"], ai_service.LOCAL_SENTIMENT_THRESHOLD)
+        self.assertIn(local["ai_feedback"], ai_service._LOCAL_FEEDBACK[POSITIVE])
+
+        self._analyze("Ran 5km")
+        self._analyze("Felt great, really proud of this run", require_feedback=True)
+        with patch.object(ai_service, "LOCAL_SENTIMENT_THRESHOLD", 1.1):
+            self._analyze("Felt awful, skipped the gym")
+        self.assertEqual(len(self.client.notes), 3)
+
+        after = ai_service.sentiment_stats()
+        decisions = {k: after["decisions"][k] - before["decisions"][k] for k in after["decisions"]}
+        self.assertEqual(decisions, {
+            ai_service.LOCAL: 1, ai_service.LOW_CONFIDENCE: 2, ai_service.FEEDBACK_REQUIRED: 1, ai_service.SHADOW: 0,
+        })
+        self.assertEqual(after["compared"] - before["compared"], 3)
+
+    def test_batch_sends_only_uncertain_notes_to_bedrock(self):
+        items = [
+            {"note": note, "resolution_title": "Run", "resolution_description": "d", "past_check_ins": []}
+            for note in ("Crushed it, great session", "note 1", "Skipped again, so frustrated", "note 2")
+        ]
+        results = batch_service.analyze_many(items, limiter=TokenBucket(rate=1000.0, capacity=1000.0))
+        self.assertEqual(len(self.client.notes), 2)
+        self.assertEqual([r["sentiment"] for r in results][::2], [POSITIVE, NEGATIVE])
+        self.assertTrue(all(r["ai_feedback"] for r in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
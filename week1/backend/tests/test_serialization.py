@@ -0,0 +1,96 @@
+import json
+import unittest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+import backend.database as db_mod
+from backend import serialization
+from backend.bench import serialization as bench
+from backend.db_models import CheckIn, Reminder, Resolution, ResolutionTerm
+from backend.main import app
+from backend.models import (
+    CheckInResponse,
+    DueReminder,
+    ReminderResponse,
+    ResolutionDetail,
+    ResolutionResponse,
+)
+
+
+def _mock_categorize(title, description, existing, category_stats=None):
+    return {"category": "Health", "priority": 1}
+
+
+def _mock_sentiment(note, resolution_title, resolution_description, past_check_ins, require_feedback=None):
+    return {"sentiment": "positive", "sentiment_score": 0.8, "ai_feedback": "Nice."}
+
+
+class TestSerialization(unittest.TestCase):
+    def setUp(self):
+        db_mod.init_db()
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        session = db_mod.get_session_factory()()
+        session.query(CheckIn).delete()
+        session.query(Reminder).delete()
+        session.query(ResolutionTerm).delete()
+        session.query(Resolution).delete()
+        session.commit()
+        session.close()
+
+    def test_columns_match_response_models(self):
+        # The fast path skips response_model validation, so drift must fail here.
+        for keys, model in (
+            (serialization.RESOLUTION_KEYS, ResolutionResponse),
+            (serialization.CHECK_IN_KEYS, CheckInResponse),
+            (serialization.REMINDER_KEYS, ReminderResponse),
+            (serialization.DUE_REMINDER_KEYS, DueReminder),
+        ):
+            self.assertEqual(keys, tuple(model.model_fields))
+
+    @patch("backend.routers.check_ins.analyze_sentiment_and_feedback", side_effect=_mock_sentiment)
+    @patch("backend.routers.resolutions.categorize_and_prioritize", side_effect=_mock_categorize)
+    def test_read_endpoints_match_their_models(self, mock_cat, mock_sent):
+        rid = self.client.post("/api/resolutions", json={"title": "Run", "description": "Run daily"}).json()["id"]
+        self.client.post(f"/api/resolutions/{rid}/check-ins", json={"note": "Ran 5k"})
+        self.client.put(f"/api/resolutions/{rid}/reminder", json={"frequency": "daily", "is_active": True})
+
+        for path, model in (
+            ("/api/resolutions", list[ResolutionResponse]),
+            (f"/api/resolutions/{rid}", ResolutionDetail),
+            (f"/api/resolutions/{rid}/check-ins", list[CheckInResponse]),
+            ("/api/reminders/due", list[DueReminder]),
+        ):
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.headers["content-type"], "application/json")
+            body = response.json()
+            validated = TypeAdapter(model).dump_python(TypeAdapter(model).validate_python(body), mode="json")
+            self.assertEqual(body, validated, path)
+
+        detail = self.client.get(f"/api/resolutions/{rid}").json()
+        self.assertIs(detail["reminder"]["is_active"], True)
+        self.assertEqual(detail["check_ins"][0]["sentiment_score"], 0.8)
+        self.assertIsNone(detail["check_ins_next_cursor"])
+
+    @patch("backend.routers.check_ins.analyze_sentiment_and_feedback", side_effect=_mock_sentiment)
+    @patch("backend.routers.resolutions.categorize_and_prioritize", side_effect=_mock_categorize)
+    def test_benchmark_paths_agree(self, mock_cat, mock_sent):
+        for title in ("Run", "Read"):
+            rid = self.client.post("/api/resolutions", json={"title": title, "description": "d"}).json()["id"]
+            self.client.post(f"/api/resolutions/{rid}/check-ins", json={"note": f"{title} today"})
+
+        session = db_mod.get_session_factory()()
+        try:
+            for table in bench.TABLES:
+                legacy = json.loads(bench.legacy(session, table, 10))
+                self.assertEqual(len(legacy), 2)
+                self.assertEqual(legacy, json.loads(bench.fast(session, table, 10)))
+        finally:
+            session.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+import backend.database as db_mod
+from backend.db_models import CheckIn, Reminder, Resolution, ResolutionTerm
+from backend.main import app
+from backend.services import similarity_service
+
+
+def _mock_categorize(title, description, existing, category_stats=None):
+    return {"category": "Health", "priority": 2}
+
+
+class TestSimilarity(unittest.TestCase):
+    def setUp(self):
+        db_mod.init_db()
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        session = db_mod.get_session_factory()()
+        session.query(CheckIn).delete()
+        session.query(Reminder).delete()
+        session.query(Resolution).delete()
+        session.commit()
+        session.close()
+
+    def _create(self, title, description):
+        with patch("backend.routers.resolutions.categorize_and_prioritize", side_effect=_mock_categorize) as mock_ai:
+            resp = self.client.post("/api/resolutions", json={"title": title, "description": description})
+        return resp.json()["id"], mock_ai
+
+    def test_vectorize_is_normalized(self):
+        vector = similarity_service.vectorize("Run a half marathon", "Train for the race")
+        self.assertAlmostEqual(sum(w * w for w in vector.values()), 1.0)
+        self.assertEqual(similarity_service.vectorize("the and of"), {})
+
+    def test_prompt_context_is_bounded_and_relevant(self):
+        self._create("Run a half marathon", "Train to run 21 km")
+        self._create("Read 12 books", "Finish one novel per month")
+        for i in range(8):
+            self._create(f"Save money {i}", "Build an emergency fund")
+
+        _, mock_ai = self._create("Run a marathon", "Run 42 km in the spring")
+        title, description, similar, stats = mock_ai.call_args.args
+        self.assertLessEqual(len(similar), similarity_service.TOP_K)
+        self.assertEqual(similar[0]["title"], "Run a half marathon")
+        self.assertEqual(stats, [{
+            "category": "Health", "count": 10, "min_priority": 2, "max_priority": 2, "avg_priority": 2.0,
+        }])
+
+    def test_soft_deleted_resolutions_are_left_out(self):
+        rid, _ = self._create("Learn Korean", "Hold a conversation")
+        session = db_mod.get_session_factory()()
+        try:
+            session.get(Resolution, rid).deleted_at = "2026-01-01T00:00:00"
+            session.commit()
+            self.assertEqual(similarity_service.find_similar(session, "Korean", "conversation"), [])
+            self.assertEqual(similarity_service.category_stats(session), [])
+        finally:
+            session.close()
+
+    def test_index_follows_updates_and_deletes(self):
+        rid, _ = self._create("Learn Korean", "Hold a conversation")
+        self.client.put(f"/api/resolutions/{rid}", json={"title": "Learn guitar", "description": "Play three songs"})
+
+        session = db_mod.get_session_factory()()
+        try:
+            self.assertEqual(similarity_service.find_similar(session, "Korean", "conversation"), [])
+            self.assertEqual(similarity_service.find_similar(session, "guitar", "songs")[0]["title"], "Learn guitar")
+        finally:
+            session.close()
+
+        self.client.delete(f"/api/resolutions/{rid}")
+        session = db_mod.get_session_factory()()
+        try:
+            self.assertEqual(session.query(ResolutionTerm).filter(ResolutionTerm.resolution_id == rid).count(), 0)
+        finally:
+            session.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import backend.database as db_mod
+from backend.bench.runner import PACKAGE_ROOT
+from backend.bench.startup import parse_importtime
+from backend.services import ai_service
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _json
+import time:       900 |       1020 |   json
+import time:      2000 |       3020 | backend.main
+"""
+
+
+class TestStartup(unittest.TestCase):
+    def test_app_import_does_not_load_boto3(self):
+        result = subprocess.run(
+            [sys.executable, "-c", "import sys, backend.main; print('boto3' in sys.modules, 'botocore' in sys.modules)"],
+            cwd=PACKAGE_ROOT, capture_output=True, text=True, check=True,
+        )
+        self.assertEqual(result.stdout.split(), ["False", "False"])
+
+    def test_warm_up_builds_the_client(self):
+        with patch.object(ai_service, "_client", None), patch("boto3.client") as factory:
+            ai_service.warm_up().result(timeout=30)
+            self.assertIs(ai_service._client, factory.return_value)
+
+    def test_current_schema_skips_create_all(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = db_mod._create_engine(Path(tmp) / "startup.db")
+            try:
+                self.assertTrue(db_mod._migrate(engine))
+                with patch.object(db_mod.Base.metadata, "create_all") as create_all:
+                    self.assertFalse(db_mod._migrate(engine))
+                create_all.assert_not_called()
+            finally:
+                engine.dispose()
+
+    def test_parse_importtime(self):
+        self.assertEqual(
+            parse_importtime(IMPORTTIME),
+            [("_json", 120, 120, 2), ("json", 900, 1020, 1), ("backend.main", 2000, 3020, 0)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
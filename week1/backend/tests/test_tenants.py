@@ -0,0 +1,157 @@
+import io
+import shutil
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+import backend.database as db_mod
+from backend import tenants
+from backend.db_models import CheckIn, Reminder, Resolution
+from backend.main import app
+from backend.migrations import MIGRATIONS
+from backend.services import dashboard_stats, resolution_stats
+
+
+def _mock_categorize(title, description, existing, category_stats=None):
+    return {"category": "Health", "priority": 1}
+
+
+class TestTenants(unittest.TestCase):
+    def setUp(self):
+        db_mod.init_db()
+        self.dir = tempfile.mkdtemp()
+        db_mod.TENANTS_DIR = Path(self.dir)
+        allowed = patch.object(db_mod, "ALLOWED_TENANTS", frozenset({"alice", "bob", "a", "b", "c", "slow", "fast"}))
+        allowed.start()
+        self.addCleanup(allowed.stop)
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        for database in db_mod._tenants.close_all():
+            database.dispose()
+        db_mod.TENANTS_DIR = None
+        shutil.rmtree(self.dir)
+        session = db_mod.get_session_factory()()
+        session.query(CheckIn).delete()
+        session.query(Reminder).delete()
+        session.query(Resolution).delete()
+        session.commit()
+        session.close()
+
+    def _create(self, title, tenant=None):
+        headers = {db_mod.TENANT_HEADER: tenant} if tenant else {}
+        with patch("backend.routers.resolutions.categorize_and_prioritize", side_effect=_mock_categorize):
+            response = self.client.post("/api/resolutions", json={"title": title, "description": "d"}, headers=headers)
+        self.assertEqual(response.status_code, 201)
+        return response.json()["id"]
+
+    def _titles(self, tenant=None):
+        headers = {db_mod.TENANT_HEADER: tenant} if tenant else {}
+        return [r["title"] for r in self.client.get("/api/resolutions", headers=headers).json()]
+
+    def test_tenants_are_isolated(self):
+        self._create("Default goal")
+        self._create("Alice goal", "alice")
+        alice_id = self._create("Alice second goal", "alice")
+        self._create("Bob goal", "bob")
+
+        self.assertEqual(self._titles(), ["Default goal"])
+        self.assertEqual(sorted(self._titles("alice")), ["Alice goal", "Alice second goal"])
+        self.assertEqual(self._titles("bob"), ["Bob goal"])
+        self.assertEqual(self._titles("default"), ["Default goal"])
+        self.assertTrue((Path(self.dir) / "alice.db").exists())
+
+        headers = {db_mod.TENANT_HEADER: "bob"}
+        self.assertEqual(self.client.get(f"/api/resolutions/{alice_id}", headers=headers).status_code, 404)
+        response = self.client.get("/api/resolutions", headers={db_mod.TENANT_HEADER: "../etc"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_unknown_tenants_are_not_created_by_requests(self):
+        headers = {db_mod.TENANT_HEADER: "mallory"}
+        response = self.client.get("/api/resolutions", headers=headers)
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {"detail": "Unknown tenant: 'mallory'"})
+        self.assertFalse((Path(self.dir) / "mallory.db").exists())
+        self.assertFalse(db_mod._tenants.is_open("mallory"))
+
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.assertEqual(tenants.main(["create", "mallory"]), 0)
+            self.assertEqual(tenants.main(["create", "mallory"]), 0)
+        self.assertEqual(out.getvalue().splitlines(), ["mallory\tcreated", "mallory\texists"])
+        self.assertEqual(self._titles("mallory"), [])
+        self._create("M goal", "mallory")
+        self.assertEqual(self._titles("mallory"), ["M goal"])
+
+    def test_engine_pool_is_lru_bounded(self):
+        opened = []
+        hook = lambda: opened.append(db_mod.current_tenant())
+        with patch.object(db_mod._tenants, "max_open", 2), patch.object(db_mod, "tenant_open_hooks", [hook]):
+            self._create("A", "a")
+            self._create("B", "b")
+            self._create("C", "c")
+            self.assertEqual(db_mod._tenants.open_tenants(), ["b", "c"])
+            self.assertEqual(self._titles("a"), ["A"])
+            self.assertEqual(db_mod._tenants.open_tenants(), ["c", "a"])
+        self.assertEqual(opened, ["a", "b", "c"])
+
+    def test_slow_first_open_does_not_block_other_tenants(self):
+        started, release = threading.Event(), threading.Event()
+        migrate = db_mod._migrate
+
+        def _slow_migrate(engine):
+            if engine.url.database.endswith("slow.db"):
+                started.set()
+                release.wait(5)
+            return migrate(engine)
+
+        with patch.object(db_mod, "_migrate", side_effect=_slow_migrate):
+            opener = threading.Thread(target=db_mod._tenants.get, args=("slow",))
+            opener.start()
+            self.assertTrue(started.wait(5))
+            # The pool lock is free while "slow" migrates, so requests for other tenants go through.
+            self._create("Fast goal", "fast")
+            self.assertEqual(self._titles("fast"), ["Fast goal"])
+            self.assertFalse(db_mod._tenants.is_open("slow"))
+            release.set()
+            opener.join(5)
+        self.assertEqual(self._titles("slow"), [])
+        self.assertEqual(sorted(db_mod._tenants.open_tenants()), ["fast", "slow"])
+
+    def test_maintenance_commands(self):
+        self._create("A", "alice")
+        self._create("B", "bob")
+        self.assertEqual(db_mod.list_tenants()[1:], ["alice", "bob"])
+
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.assertEqual(tenants.main(["list", "alice"]), 0)
+            self.assertEqual(tenants.main(["migrate"]), 0)
+            self.assertEqual(tenants.main(["vacuum", "bob"]), 0)
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith(f"alice\tv{MIGRATIONS[-1][0]}\t"))
+        self.assertIn("bob\tup to date", lines)
+        self.assertTrue(lines[-1].startswith("bob\t"))
+        with patch("sys.stderr", io.StringIO()):
+            self.assertEqual(tenants.main(["vacuum", "nobody"]), 1)
+
+    def test_rollup_commands_take_a_tenant(self):
+        self._create("A", "alice")
+        with db_mod.use_tenant("alice"), db_mod._get_engine().begin() as conn:
+            conn.exec_driver_sql("UPDATE dashboard_stats SET total_resolutions = 5")
+            conn.exec_driver_sql("UPDATE resolution_stats SET check_in_count = 5")
+
+        with redirect_stdout(io.StringIO()):
+            for rollup in (dashboard_stats, resolution_stats):
+                self.assertEqual(rollup.main(["check"]), 0)
+                self.assertEqual(rollup.main(["--tenant", "alice", "check"]), 1)
+                self.assertEqual(rollup.main(["--tenant", "alice", "rebuild"]), 0)
+                self.assertEqual(rollup.main(["--tenant", "alice", "check"]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+import backend.database as db_mod
+from backend.db_models import AiJob, CheckIn, Reminder, Resolution, ResolutionTerm
+from backend.main import app
+from backend.services import transfer_service
+
+
+def _mock_categorize(title, description, existing_resolutions, category_stats=None):
+    return {"category": "Health", "priority": 1}
+
+
+def _mock_sentiment(note, resolution_title, resolution_description, past_check_ins, require_feedback=None):
+    return {"sentiment": "positive", "sentiment_score": 0.9, "ai_feedback": "Great progress!"}
+
+
+def _ndjson(records):
+    return "".join(json.dumps(r) + "\n" for r in records)
+
+
+def _strip_ids(lines):
+    records = []
+    for line in lines:
+        record = json.loads(line)
+        record.pop("id", None)
+        record.pop("resolution_id", None)
+        records.append(record)
+    return records
+
+
+class TestTransfer(unittest.TestCase):
+    def setUp(self):
+        db_mod.init_db()
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        session = db_mod.get_session_factory()()
+        session.query(AiJob).delete()
+        session.query(CheckIn).delete()
+        session.query(Reminder).delete()
+        session.query(Resolution).delete()
+        session.commit()
+        session.close()
+
+    def _create_data(self):
+        with patch("backend.routers.resolutions.categorize_and_prioritize", side_effect=_mock_categorize):
+            rid = self.client.post("/api/resolutions", json={"title": "Run", "description": "Run daily"}).json()["id"]
+        with patch("backend.routers.check_ins.analyze_sentiment_and_feedback", side_effect=_mock_sentiment):
+            for note in ("Ran 5km", "Ran 10km"):
+                self.client.post(f"/api/resolutions/{rid}/check-ins", json={"note": note})
+        return rid
+
+    def test_export_import_round_trip(self):
+        self._create_data()
+        exported = self.client.get("/api/export")
+        self.assertEqual(exported.status_code, 200)
+        self.assertTrue(exported.headers["content-type"].startswith("application/x-ndjson"))
+        lines = exported.text.splitlines()
+        self.assertEqual([json.loads(line)["type"] for line in lines], ["resolution", "reminder", "check_in", "check_in"])
+
+        self.tearDown()
+        with patch("backend.routers.transfer.IMPORT_CHUNK_SIZE", 2):
+            response = self.client.post("/api/import?skip_ai=true", content=exported.content)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"resolutions": 1, "reminders": 1, "check_ins": 2, "ai_jobs": 0})
+
+        reexported = self.client.get("/api/export").text.splitlines()
+        self.assertEqual(_strip_ids(reexported), _strip_ids(lines))
+        session = db_mod.get_session_factory()()
+        try:
+            self.assertGreater(session.query(ResolutionTerm).count(), 0)
+        finally:
+            session.close()
+
+    def test_soft_deleted_resolutions_are_not_exported_or_imported(self):
+        rid = self._create_data()
+        session = db_mod.get_session_factory()()
+        session.get(Resolution, rid).deleted_at = "2026-01-01T00:00:00"
+        session.commit()
+        session.close()
+        self.assertEqual(self.client.get("/api/export").text, "")
+
+        body = _ndjson([
+            {"type": "resolution", "id": 1, "title": "Gone", "description": "d", "deleted_at": "2026-01-01T00:00:00"},
+            {"type": "check_in", "resolution_id": 1, "note": "n"},
+            {"type": "resolution", "id": 2, "title": "Kept", "description": "d", "category": "Health", "priority": 1},
+            {"type": "check_in", "resolution_id": 2, "note": "n", "sentiment": "positive"},
+        ])
+        response = self.client.post("/api/import?skip_ai=true", content=body)
+        self.assertEqual(response.json(), {"resolutions": 1, "reminders": 0, "check_ins": 1, "ai_jobs": 0})
+
+    def test_import_queues_ai_for_rows_missing_it(self):
+        body = _ndjson([
+            {"type": "resolution", "id": 7, "title": "Read", "description": "Read books"},
+            {"type": "check_in", "resolution_id": 7, "note": "Finished a book"},
+            {"type": "check_in", "resolution_id": 7, "note": "Started another", "sentiment": "neutral"},
+        ])
+        with patch("backend.services.transfer_service.categorize_many", return_value=[_mock_categorize("", "", [])]), \
+                patch("backend.services.enrichment_service.enqueue") as enqueue:
+            response = self.client.post("/api/import", content=body)
+        self.assertEqual(response.json(), {"resolutions": 1, "reminders": 0, "check_ins": 2, "ai_jobs": 1})
+        self.assertEqual(enqueue.call_count, 1)
+
+        resolution = self.client.get("/api/resolutions").json()[0]
+        self.assertEqual((resolution["category"], resolution["priority"]), ("Health", 1))
+
+    def test_import_rejects_bad_lines(self):
+        response = self.client.post("/api/import", content="not json\n")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("line 1", response.json()["detail"])
+
+        orphan = _ndjson([{"type": "check_in", "resolution_id": 3, "note": "n"}])
+        response = self.client.post("/api/import?skip_ai=true", content=orphan)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("must appear before", response.json()["detail"])
+
+    def test_cli_round_trip(self):
+        self._create_data()
+        fd, path = tempfile.mkstemp(suffix=".ndjson")
+        os.close(fd)
+        try:
+            self.assertEqual(transfer_service.main(["export", path]), 0)
+            self.tearDown()
+            with patch("builtins.print"):
+                self.assertEqual(transfer_service.main(["import", path, "--skip-ai", "--chunk-size", "1"]), 0)
+        finally:
+            os.remove(path)
+        self.assertEqual(len(self.client.get("/api/resolutions").json()), 1)
+
+    def test_cli_import_reports_conflicts(self):
+        lines = _ndjson([
+            {"type": "resolution", "id": 1, "title": "Run", "description": "d", "category": "Health", "priority": 1},
+            {"type": "reminder", "resolution_id": 1, "next_due": "2026-01-01"},
+            {"type": "reminder", "resolution_id": 1, "next_due": "2026-01-02"},
+        ])
+        fd, path = tempfile.mkstemp(suffix=".ndjson")
+        with os.fdopen(fd, "w") as f:
+            f.write(lines)
+        err = io.StringIO()
+        try:
+            with redirect_stderr(err):
+                self.assertEqual(transfer_service.main(["import", path, "--skip-ai", "--chunk-size", "2"]), 1)
+        finally:
+            os.remove(path)
+        self.assertEqual(
+            err.getvalue().strip(),
+            "line 3: conflicting rows in chunk (already imported: resolutions=1, reminders=1, check_ins=0, ai_jobs=0)",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import threading
+import unittest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+import backend.database as db_mod
+from backend.db_models import CheckIn, Reminder, Resolution, ResolutionTerm
+from backend.main import app
+from backend.services import write_queue
+
+
+def _mock_categorize(title, description, existing, category_stats=None):
+    return {"category": "Health", "priority": 1}
+
+
+def _mock_sentiment(note, resolution_title, resolution_description, past_check_ins, require_feedback=None):
+    return {"sentiment": "positive", "sentiment_score": 0.8, "ai_feedback": "Nice."}
+
+
+def _add_resolution(session, title):
+    resolution = Resolution(
+        title=title, description="", status="active", created_at="2026-01-01", updated_at="2026-01-01"
+    )
+    session.add(resolution)
+    session.flush()
+    return resolution.id
+
+
+def _fail(session):
+    _add_resolution(session, "doomed")
+    raise ValueError("boom")
+
+
+class TestGroupCommitWriter(unittest.TestCase):
+    def setUp(self):
+        db_mod.init_db()
+
+    def tearDown(self):
+        write_queue.shutdown()
+        session = db_mod.get_session_factory()()
+        session.query(CheckIn).delete()
+        session.query(Reminder).delete()
+        session.query(ResolutionTerm).delete()
+        session.query(Resolution).delete()
+        session.commit()
+        session.close()
+
+    def _titles(self):
+        session = db_mod.get_session_factory()()
+        try:
+            return sorted(r.title for r in session.query(Resolution))
+        finally:
+            session.close()
+
+    def test_concurrent_writes_share_commits(self):
+        writer = write_queue.GroupCommitWriter(db_mod.DEFAULT_TENANT, window=0.05)
+        gate = threading.Event()
+        # Hold the writer on the first operation so the rest pile up behind it.
+        first = writer.submit(lambda session: gate.wait() and _add_resolution(session, "first"))
+        futures = [writer.submit(lambda session, i=i: _add_resolution(session, f"r{i}")) for i in range(20)]
+        gate.set()
+        ids = [f.result(timeout=5) for f in [first] + futures]
+        writer.stop(5)
+
+        self.assertEqual(len(set(ids)), 21)
+        self.assertEqual(writer.operations, 21)
+        self.assertLessEqual(writer.batches, 2)
+        self.assertEqual(len(self._titles()), 21)
+
+    def test_failed_operation_only_rolls_back_itself(self):
+        writer = write_queue.GroupCommitWriter(db_mod.DEFAULT_TENANT, window=0.05)
+        ok = writer.submit(lambda session: _add_resolution(session, "kept"))
+        bad = writer.submit(_fail)
+        also_ok = writer.submit(lambda session: _add_resolution(session, "also kept"))
+
+        self.assertIsInstance(ok.result(timeout=5), int)
+        with self.assertRaises(ValueError):
+            bad.result(timeout=5)
+        self.assertIsInstance(also_ok.result(timeout=5), int)
+        writer.stop(5)
+        self.assertEqual(self._titles(), ["also kept", "kept"])
+
+    def test_endpoints_use_the_writer_when_enabled(self):
+        client = TestClient(app)
+        with patch.object(write_queue, "ENABLED", True), \
+                patch("backend.routers.resolutions.categorize_and_prioritize", side_effect=_mock_categorize), \
+                patch("backend.routers.check_ins.analyze_sentiment_and_feedback", side_effect=_mock_sentiment):
+            created = client.post("/api/resolutions", json={"title": "Run", "description": "Run daily"})
+            self.assertEqual(created.status_code, 201)
+            rid = created.json()["id"]
+
+            check_in = client.post(f"/api/resolutions/{rid}/check-ins", json={"note": "Ran 5k"})
+            self.assertEqual(check_in.status_code, 201)
+            self.assertEqual(check_in.json()["sentiment"], "positive")
+
+            reminder = client.put(f"/api/resolutions/{rid}/reminder", json={"frequency": "daily", "is_active": True})
+            self.assertEqual(reminder.status_code, 200)
+            self.assertEqual(reminder.json()["frequency"], "daily")
+            missing = client.put("/api/resolutions/999999/reminder", json={"frequency": "daily", "is_active": True})
+            self.assertEqual(missing.status_code, 404)
+
+            updated = client.put(f"/api/resolutions/{rid}", json={"title": "Run far"})
+            self.assertEqual(updated.status_code, 200)
+            self.assertEqual(updated.json()["title"], "Run far")
+            missing = client.put("/api/resolutions/999999", json={"title": "x"})
+            self.assertEqual(missing.status_code, 404)
+
+        self.assertEqual(write_queue.stats()[db_mod.DEFAULT_TENANT]["operations"], 6)
+        detail = client.get(f"/api/resolutions/{rid}").json()
+        self.assertEqual(len(detail["check_ins"]), 1)
+        self.assertEqual(detail["reminder"]["frequency"], "daily")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,8 +9,12 @@ import type {
   ReminderResponse,
   DueReminder,
   DashboardSummary,
+  Page,
 } from "./types"
 
+// The largest page the API serves.
+const PAGE_LIMIT = 200
+
 async function request<T>(url: string, options?: RequestInit): Promise<T> {
   const res = await fetch(url, {
     headers: { "Content-Type": "application/json" },
@@ -24,8 +28,31 @@ async function request<T>(url: string, options?: RequestInit): Promise<T> {
   return res.json() as Promise<T>
 }
 
+async function requestPage<T>(url: string): Promise<Page<T>> {
+  const res = await fetch(url, { headers: { "Content-Type": "application/json" } })
+  if (!res.ok) {
+    const body = await res.text().catch(() => "")
+    throw new Error(`${res.status}: ${body}`)
+  }
+  const items = (await res.json()) as T[]
+  return { items, nextCursor: res.headers.get("X-Next-Cursor") }
+}
+
+// List endpoints return one page at a time; follow the cursor until it runs out.
+async function requestAll<T>(url: string): Promise<T[]> {
+  const items: T[] = []
+  let cursor: string | null = null
+  do {
+    const params = new URLSearchParams({ limit: String(PAGE_LIMIT), ...(cursor ? { cursor } : {}) })
+    const page: Page<T> = await requestPage<T>(`${url}?${params}`)
+    items.push(...page.items)
+    cursor = page.nextCursor
+  } while (cursor)
+  return items
+}
+
 export async function listResolutions(): Promise<ResolutionResponse[]> {
-  return request<ResolutionResponse[]>("/api/resolutions")
+  return requestAll<ResolutionResponse>("/api/resolutions")
 }
 
 export async function createResolution(data: ResolutionCreate): Promise<ResolutionResponse> {
@@ -51,7 +78,12 @@ export async function deleteResolution(id: number): Promise<void> {
 }
 
 export async function listCheckIns(resolutionId: number): Promise<CheckInResponse[]> {
-  return request<CheckInResponse[]>(`/api/resolutions/${resolutionId}/check-ins`)
+  return requestAll<CheckInResponse>(`/api/resolutions/${resolutionId}/check-ins`)
+}
+
+export async function listCheckInsPage(resolutionId: number, cursor: string): Promise<Page<CheckInResponse>> {
+  const params = new URLSearchParams({ cursor })
+  return requestPage<CheckInResponse>(`/api/resolutions/${resolutionId}/check-ins?${params}`)
 }
 
 export async function createCheckIn(resolutionId: number, data: CheckInCreate): Promise<CheckInResponse> {
@@ -61,6 +93,41 @@ export async function createCheckIn(resolutionId: number, data: CheckInCreate):
   })
 }
 
+export async function createCheckInStream(
+  resolutionId: number,
+  data: CheckInCreate,
+  onFeedback: (text: string) => void,
+): Promise<CheckInResponse> {
+  const res = await fetch(`/api/resolutions/${resolutionId}/check-ins/stream`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(data),
+  })
+  if (!res.ok || !res.body) {
+    const body = await res.text().catch(() => "")
+    throw new Error(`${res.status}: ${body}`)
+  }
+
+  const reader = res.body.pipeThrough(new TextDecoderStream()).getReader()
+  let buffer = ""
+  for (;;) {
+    const { value, done } = await reader.read()
+    if (done) break
+    buffer += value
+    let end: number
+    while ((end = buffer.indexOf("\n\n")) !== -1) {
+      const block = buffer.slice(0, end)
+      buffer = buffer.slice(end + 2)
+      const event = block.match(/^event: (.*)$/m)?.[1]
+      const data = block.match(/^data: (.*)$/m)?.[1]
+      if (!event || data === undefined) continue
+      if (event === "feedback") onFeedback(JSON.parse(data).text)
+      if (event === "check_in") return JSON.parse(data) as CheckInResponse
+    }
+  }
+  throw new Error("Check-in stream ended before the check-in was saved")
+}
+
 export async function getDueReminders(): Promise<DueReminder[]> {
   return request<DueReminder[]>("/api/reminders/due")
 }
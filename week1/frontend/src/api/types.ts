@@ -39,6 +39,7 @@ export interface CheckInResponse {
 
 export interface ResolutionDetail extends ResolutionResponse {
   check_ins: CheckInResponse[]
+  check_ins_next_cursor: string | null
   reminder: ReminderResponse | null
 }
 
@@ -72,3 +73,8 @@ export interface DashboardSummary {
   overdue_reminders: number
   sentiment_breakdown: Record<string, number>
 }
+
+export interface Page<T> {
+  items: T[]
+  nextCursor: string | null
+}
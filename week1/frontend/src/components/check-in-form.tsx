@@ -2,7 +2,7 @@ import { useState } from "react"
 import { Button } from "@/components/ui/button"
 import { Textarea } from "@/components/ui/textarea"
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
-import { createCheckIn } from "@/api/client"
+import { createCheckInStream } from "@/api/client"
 import type { CheckInResponse } from "@/api/types"
 
 interface CheckInFormProps {
@@ -14,6 +14,7 @@ export function CheckInForm({ resolutionId, onCreated }: CheckInFormProps) {
   const [note, setNote] = useState("")
   const [submitting, setSubmitting] = useState(false)
   const [error, setError] = useState("")
+  const [feedback, setFeedback] = useState("")
 
   async function handleSubmit(e: React.FormEvent) {
     e.preventDefault()
@@ -21,14 +22,18 @@ export function CheckInForm({ resolutionId, onCreated }: CheckInFormProps) {
 
     setSubmitting(true)
     setError("")
+    setFeedback("")
     try {
-      const checkIn = await createCheckIn(resolutionId, { note: note.trim() })
+      const checkIn = await createCheckInStream(resolutionId, { note: note.trim() }, (text) =>
+        setFeedback((prev) => prev + text),
+      )
       setNote("")
       onCreated(checkIn)
     } catch {
       setError("Failed to submit check-in. Please try again.")
     } finally {
       setSubmitting(false)
+      setFeedback("")
     }
   }
 
@@ -46,6 +51,7 @@ export function CheckInForm({ resolutionId, onCreated }: CheckInFormProps) {
             rows={3}
             required
           />
+          {submitting && feedback && <p className="text-sm text-muted-foreground">{feedback}</p>}
           {error && <p className="text-sm text-destructive">{error}</p>}
           <Button type="submit" disabled={submitting}>
             {submitting ? "Analyzing..." : "Submit Check-in"}
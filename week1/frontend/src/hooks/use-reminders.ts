@@ -2,7 +2,11 @@ import { useState, useEffect, useCallback } from "react"
 import type { DueReminder } from "@/api/types"
 import { getDueReminders } from "@/api/client"
 
-const POLL_INTERVAL = 5 * 60 * 1000
+const EVENTS_URL = "/api/reminders/events"
+
+function byNextDue(a: DueReminder, b: DueReminder) {
+  return a.next_due.localeCompare(b.next_due) || a.resolution_id - b.resolution_id
+}
 
 export function useReminders() {
   const [reminders, setReminders] = useState<DueReminder[]>([])
@@ -12,15 +16,29 @@ export function useReminders() {
       const data = await getDueReminders()
       setReminders(data)
     } catch {
-      // silently ignore polling errors
+      // silently ignore refresh errors
     }
   }, [])
 
   useEffect(() => {
-    refresh()
-    const id = setInterval(refresh, POLL_INTERVAL)
-    return () => clearInterval(id)
-  }, [refresh])
+    // The server pushes a snapshot on connect (and on every reconnect), then
+    // "due" / "cleared" changes as they happen.
+    const source = new EventSource(EVENTS_URL)
+    source.addEventListener("snapshot", (e) => {
+      setReminders(JSON.parse((e as MessageEvent).data))
+    })
+    source.addEventListener("due", (e) => {
+      const reminder: DueReminder = JSON.parse((e as MessageEvent).data)
+      setReminders((prev) =>
+        [...prev.filter((r) => r.resolution_id !== reminder.resolution_id), reminder].sort(byNextDue),
+      )
+    })
+    source.addEventListener("cleared", (e) => {
+      const { resolution_id } = JSON.parse((e as MessageEvent).data)
+      setReminders((prev) => prev.filter((r) => r.resolution_id !== resolution_id))
+    })
+    return () => source.close()
+  }, [])
 
   return { reminders, refresh }
 }
@@ -10,7 +10,7 @@ import { CheckInTimeline } from "@/components/check-in-timeline"
 import { ReminderSettings } from "@/components/reminder-settings"
 import { ConfirmDialog } from "@/components/confirm-dialog"
 import type { ResolutionDetail as ResolutionDetailType, CheckInResponse, ReminderResponse } from "@/api/types"
-import { getResolution, deleteResolution, updateResolution } from "@/api/client"
+import { getResolution, deleteResolution, updateResolution, listCheckInsPage } from "@/api/client"
 
 function statusVariant(status: string) {
   switch (status) {
@@ -30,6 +30,7 @@ export function ResolutionDetail() {
   const [loading, setLoading] = useState(true)
   const [deleteOpen, setDeleteOpen] = useState(false)
   const [deleting, setDeleting] = useState(false)
+  const [loadingOlder, setLoadingOlder] = useState(false)
 
   useEffect(() => {
     if (!id) return
@@ -48,6 +49,23 @@ export function ResolutionDetail() {
     })
   }
 
+  async function handleLoadOlder() {
+    if (!resolution?.check_ins_next_cursor) return
+    setLoadingOlder(true)
+    try {
+      const page = await listCheckInsPage(resolution.id, resolution.check_ins_next_cursor)
+      setResolution({
+        ...resolution,
+        check_ins: [...resolution.check_ins, ...page.items],
+        check_ins_next_cursor: page.nextCursor,
+      })
+    } catch {
+      // ignore
+    } finally {
+      setLoadingOlder(false)
+    }
+  }
+
   function handleReminderUpdated(reminder: ReminderResponse) {
     if (!resolution) return
     setResolution({ ...resolution, reminder })
@@ -156,6 +174,12 @@ export function ResolutionDetail() {
 
       <CheckInTimeline checkIns={resolution.check_ins} />
 
+      {resolution.check_ins_next_cursor && (
+        <Button variant="outline" size="sm" onClick={handleLoadOlder} disabled={loadingOlder}>
+          {loadingOlder ? "Loading..." : "Load older check-ins"}
+        </Button>
+      )}
+
       <ConfirmDialog
         open={deleteOpen}
         onOpenChange={setDeleteOpen}